@@ -0,0 +1,719 @@
+#!/usr/bin/env python3
+"""
+ASGI entry point
+Serves the upstream-bound endpoints (/api/aurelius and /api/justify) from an
+event loop with non-blocking clients, so slow generations don't tie up a
+worker thread each. They still go through the Flask app's request hooks
+(startup, CORS). Every other route is the unchanged Flask app from
+server.py, run on a thread pool.
+
+Run with:
+    uvicorn asgi:app --host 0.0.0.0 --port 5001
+"""
+
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from werkzeug.datastructures import Headers
+from werkzeug.exceptions import ClientDisconnected, RequestEntityTooLarge
+
+# Importing server also puts backend/ on sys.path for the utils imports below
+from server import app as flask_app, AURELIUS_STREAM, UPSTREAM_COALESCE, UPSTREAM_COALESCE_TIMEOUT
+from utils.upstream import HF_CONNECT_TIMEOUT, HF_READ_TIMEOUT, HF_POOL_SIZE, JUSTIFY_MODEL, build_justify_messages, sse_event
+from utils.aurelius_cache import aurelius_cache, aurelius_cache_key, aurelius_request_hash
+from utils.single_flight import AsyncSingleFlight, SingleFlightTimeout
+from utils.auth import check_admin_token
+from utils.justify_cache import justify_cache, justify_cache_key, load_stored_justification, save_justification
+from utils.justify_batch import (
+    JUSTIFY_BATCH_CONCURRENCY, parse_batch_pairs, group_pairs, parse_score, summarize_batch, ndjson_line
+)
+
+# Bounded concurrency per upstream; extra requests queue on the event loop
+HF_MAX_CONCURRENCY = int(os.environ.get('HF_MAX_CONCURRENCY', 64))
+OPENAI_MAX_CONCURRENCY = int(os.environ.get('OPENAI_MAX_CONCURRENCY', 16))
+# Threads running the Flask (WSGI) routes
+WSGI_THREADS = int(os.environ.get('WSGI_THREADS', 16))
+
+_wsgi_executor = ThreadPoolExecutor(max_workers=WSGI_THREADS, thread_name_prefix='wsgi')
+
+
+def declared_too_large(scope):
+    """True if the Content-Length header is over the app's MAX_CONTENT_LENGTH"""
+    limit = flask_app.config['MAX_CONTENT_LENGTH']
+    if limit is None:
+        return False
+    for name, value in scope.get('headers', []):
+        if name == b'content-length':
+            return value.isdigit() and int(value) > limit
+    return False
+
+
+class ReceiveStream(io.RawIOBase):
+    """
+    wsgi.input for a request running on a WSGI thread: body messages are
+    received from the event loop as the app reads them, so an app that
+    rejects the request (e.g. a 413) doesn't wait for the whole body.
+    Raises RequestEntityTooLarge past limit bytes.
+    """
+
+    def __init__(self, receive, loop, limit=None):
+        self.receive = receive
+        self.loop = loop
+        self.limit = limit
+        self.received = 0
+        self.pending = b''
+        self.more_body = True
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self.pending and self.more_body:
+            message = asyncio.run_coroutine_threadsafe(self.receive(), self.loop).result()
+            if message['type'] == 'http.disconnect':
+                raise ClientDisconnected()
+            self.pending = message.get('body', b'')
+            self.more_body = message.get('more_body', False)
+            self.received += len(self.pending)
+            if self.limit is not None and self.received > self.limit:
+                raise RequestEntityTooLarge()
+
+        n = min(len(buffer), len(self.pending))
+        buffer[:n] = self.pending[:n]
+        self.pending = self.pending[n:]
+        return n
+
+
+def build_environ(scope, body):
+    """WSGI environ for an ASGI HTTP scope; body is a file-like object"""
+    script_name = scope.get('root_path', '').encode('utf-8').decode('latin-1')
+    path_info = scope['path'].encode('utf-8').decode('latin-1')
+    if path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': script_name,
+        'PATH_INFO': path_info,
+        'QUERY_STRING': scope['query_string'].decode('ascii'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        # The body stream ends with the request, so werkzeug can read
+        # chunked bodies too (and apply MAX_CONTENT_LENGTH to them)
+        'wsgi.input_terminated': True,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1')
+        if name in ('content-length', 'content-type'):
+            key = name.upper().replace('-', '_')
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin-1')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class ThreadedWsgiToAsgi:
+    """
+    Serve a WSGI app over ASGI, each request on the WSGI thread pool so
+    Flask requests run concurrently (asgiref's WsgiToAsgi runs them all on
+    one shared thread)
+    """
+
+    def __init__(self, wsgi_application):
+        self.wsgi_application = wsgi_application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            raise ValueError(f"WSGI apps only serve HTTP, not {scope['type']}")
+
+        if declared_too_large(scope):
+            await send_json(send, 413, {'error': 'Request body too large'})
+            return
+
+        loop = asyncio.get_running_loop()
+        body = io.BufferedReader(ReceiveStream(receive, loop, flask_app.config['MAX_CONTENT_LENGTH']))
+
+        def send_from_thread(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        await loop.run_in_executor(_wsgi_executor, self.run_wsgi_app, scope, body, send_from_thread)
+
+    def run_wsgi_app(self, scope, body, send):
+        """Call the WSGI app on this (pool) thread, relaying its response through send"""
+        response = {'start': None, 'sent': False}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and response['sent']:
+                raise exc_info[1].with_traceback(exc_info[2])
+            response['start'] = {
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+            }
+
+        def send_start():
+            if not response['sent']:
+                send(response['start'])
+                response['sent'] = True
+
+        result = self.wsgi_application(build_environ(scope, body), start_response)
+        try:
+            for chunk in result:
+                send_start()
+                if chunk:
+                    send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            send_start()
+            send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+
+flask_asgi = ThreadedWsgiToAsgi(flask_app)
+
+
+async def run_blocking(fn, *args):
+    """Run a blocking call (e.g. a database query) on the WSGI thread pool"""
+    return await asyncio.get_running_loop().run_in_executor(_wsgi_executor, fn, *args)
+
+# Created on startup, inside the server's event loop
+_upstream = {
+    'hf_client': None,
+    'hf_slots': None,
+    'openai_client': None,
+    'openai_slots': None
+}
+
+aurelius_flight = AsyncSingleFlight(wait_timeout=UPSTREAM_COALESCE_TIMEOUT)
+justify_flight = AsyncSingleFlight(wait_timeout=UPSTREAM_COALESCE_TIMEOUT)
+
+
+def get_hf_upstream():
+    """Get the pooled async Hugging Face client and its concurrency limit"""
+    if _upstream['hf_client'] is None:
+        _upstream['hf_client'] = httpx.AsyncClient(
+            timeout=httpx.Timeout(HF_READ_TIMEOUT, connect=HF_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=HF_MAX_CONCURRENCY, max_keepalive_connections=HF_POOL_SIZE)
+        )
+        _upstream['hf_slots'] = asyncio.Semaphore(HF_MAX_CONCURRENCY)
+    return _upstream['hf_client'], _upstream['hf_slots']
+
+
+def get_openai_upstream():
+    """Get the async OpenAI client and its concurrency limit (raises without an API key)"""
+    if _upstream['openai_client'] is None:
+        # Imported on first use; the openai package is slow to import
+        from openai import AsyncOpenAI
+
+        _upstream['openai_client'] = AsyncOpenAI()
+        _upstream['openai_slots'] = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+    return _upstream['openai_client'], _upstream['openai_slots']
+
+
+async def close_upstream():
+    if _upstream['hf_client'] is not None:
+        await _upstream['hf_client'].aclose()
+        _upstream['hf_client'] = None
+    if _upstream['openai_client'] is not None:
+        await _upstream['openai_client'].close()
+        _upstream['openai_client'] = None
+
+
+async def send_response(send, status, body, content_type='application/json', headers=None):
+    """Send a complete response"""
+    await send_response_start(send, status, content_type, headers, content_length=len(body))
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_response_start(send, status, content_type, headers=None, content_length=None):
+    raw_headers = [(b'content-type', content_type.encode('latin-1'))]
+    if content_length is not None:
+        raw_headers.append((b'content-length', str(content_length).encode('latin-1')))
+    for name, value in (headers or {}).items():
+        raw_headers.append((name.lower().encode('latin-1'), value.encode('latin-1')))
+    await send({'type': 'http.response.start', 'status': status, 'headers': raw_headers})
+
+
+async def send_json(send, status, payload):
+    await send_response(send, status, json.dumps(payload).encode('utf-8'))
+
+
+async def send_aurelius_result(send, status_code, content, content_type, headers=None):
+    """Same response shapes as server.aurelius_upstream_response"""
+    if status_code != 200:
+        await send_json(send, status_code, {
+            'error': f"Upstream API Error: {status_code}",
+            'details': content.decode('utf-8', errors='replace')
+        })
+        return
+    await send_response(send, 200, content, content_type, headers)
+
+
+async def aurelius_chat(body, send):
+    api_url = os.environ.get("HF_API_URL")
+    api_token = os.environ.get("HF_API_TOKEN")
+
+    if not api_url or not api_token:
+        await send_json(send, 500, {'error': 'Server misconfigured: Missing HF_API_URL or HF_API_TOKEN'})
+        return
+
+    cache_key = aurelius_cache_key(body)
+    if cache_key:
+        cached = aurelius_cache.get(cache_key)
+        if cached is not None:
+            await send_response(send, 200, cached[0], cached[1], {'X-Cache': 'HIT'})
+            return
+
+    flight_key = None
+    future = None
+    if UPSTREAM_COALESCE:
+        flight_key = aurelius_request_hash(body)
+        future, is_leader = aurelius_flight.begin(flight_key)
+        if not is_leader:
+            try:
+                result = await aurelius_flight.wait(future)
+            except (SingleFlightTimeout, httpx.TimeoutException):
+                await send_json(send, 504, {'error': 'Upstream API timed out'})
+                return
+            except Exception as e:
+                await send_json(send, 500, {'error': str(e)})
+                return
+            await send_aurelius_result(send, *result)
+            return
+
+    def settle(result=None, error=None):
+        if future is not None:
+            aurelius_flight.finish(flight_key, future, result=result, error=error)
+
+    hf_client, hf_slots = get_hf_upstream()
+    headers = {
+        "Authorization": f"Bearer {api_token}",
+        "Content-Type": "application/json"
+    }
+    extra_headers = {'X-Cache': 'MISS'} if cache_key else None
+    started = False
+
+    try:
+        async with hf_slots:
+            async with hf_client.stream('POST', api_url, content=body, headers=headers) as response:
+                if response.status_code != 200:
+                    content = await response.aread()
+                    settle(result=(response.status_code, content, None))
+                    await send_aurelius_result(send, response.status_code, content, None)
+                    return
+
+                content_type = response.headers.get('Content-Type', 'application/json')
+                chunks = []
+
+                if AURELIUS_STREAM:
+                    await send_response_start(send, 200, content_type, extra_headers)
+                    started = True
+
+                async for chunk in response.aiter_bytes():
+                    chunks.append(chunk)
+                    if AURELIUS_STREAM and chunk:
+                        await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+
+                content = b''.join(chunks)
+                if AURELIUS_STREAM:
+                    await send({'type': 'http.response.body', 'body': b''})
+                else:
+                    await send_response(send, 200, content, content_type, extra_headers)
+
+        if cache_key:
+            aurelius_cache.set(cache_key, (content, content_type))
+        settle(result=(200, content, content_type))
+
+    except asyncio.CancelledError:
+        # Browser went away: the upstream request is dropped with us
+        settle(error=ConnectionError('Upstream response was interrupted'))
+        raise
+
+    except httpx.TimeoutException as e:
+        settle(error=e)
+        print(f"Timeout in aurelius_chat: {e}")
+        if not started:
+            await send_json(send, 504, {'error': 'Upstream API timed out'})
+
+    except Exception as e:
+        settle(error=e)
+        print(f"Error in aurelius_chat: {e}")
+        if not started:
+            await send_json(send, 500, {'error': str(e)})
+
+
+async def get_cached_justification(cache_key):
+    """
+    Memory hits are answered on the loop; the database lookup (like the
+    store below) is blocking, so it runs on the WSGI threads
+    """
+    justification = justify_cache.get(cache_key)
+    if justification is None:
+        justification = await run_blocking(load_stored_justification, cache_key)
+    return justification
+
+
+async def evaluate_justification(user_prompt, model_response, cache_key):
+    """Ask OpenAI for a report and cache it; concurrent identical pairs share one call"""
+    async def evaluate():
+        openai_client, openai_slots = get_openai_upstream()
+        async with openai_slots:
+            response = await openai_client.chat.completions.create(
+                model=JUSTIFY_MODEL,
+                messages=build_justify_messages(user_prompt, model_response)
+            )
+        justification = response.choices[0].message.content
+        if justification:
+            await run_blocking(save_justification, cache_key, justification)
+        return justification
+
+    if UPSTREAM_COALESCE:
+        return await justify_flight.do(cache_key, evaluate)
+    return await evaluate()
+
+
+async def justify_response(body, send):
+    try:
+        data = json.loads(body or b'null')
+        if not isinstance(data, dict):
+            raise ValueError('Request body must be a JSON object')
+    except ValueError as e:
+        await send_json(send, 400, {'error': str(e)})
+        return
+
+    user_prompt = data.get('user_prompt', '')
+    model_response = data.get('model_response', '')
+
+    if not user_prompt or not model_response:
+        await send_json(send, 400, {'error': 'Missing user_prompt or model_response'})
+        return
+
+    cache_key = justify_cache_key(user_prompt, model_response)
+    justification = await get_cached_justification(cache_key)
+    if justification is not None:
+        await send_response(send, 200, json.dumps({'justification': justification}).encode('utf-8'),
+                            headers={'X-Cache': 'HIT'})
+        return
+
+    try:
+        justification = await evaluate_justification(user_prompt, model_response, cache_key)
+    except SingleFlightTimeout as e:
+        await send_json(send, 504, {'error': str(e)})
+        return
+    except Exception as e:
+        print(f"Error in justify_response: {e}")
+        await send_json(send, 500, {'error': str(e)})
+        return
+
+    await send_response(send, 200, json.dumps({'justification': justification}).encode('utf-8'),
+                        headers={'X-Cache': 'MISS'})
+
+
+async def justify_stream(body, send):
+    """SSE variant of justify_response; same events as server.justify_stream"""
+    try:
+        data = json.loads(body or b'null')
+        if not isinstance(data, dict):
+            raise ValueError('Request body must be a JSON object')
+    except ValueError as e:
+        await send_json(send, 400, {'error': str(e)})
+        return
+
+    user_prompt = data.get('user_prompt', '')
+    model_response = data.get('model_response', '')
+
+    if not user_prompt or not model_response:
+        await send_json(send, 400, {'error': 'Missing user_prompt or model_response'})
+        return
+
+    sse_headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+    async def send_event(payload, event=None, more_body=True):
+        await send({
+            'type': 'http.response.body',
+            'body': sse_event(payload, event).encode('utf-8'),
+            'more_body': more_body
+        })
+
+    cache_key = justify_cache_key(user_prompt, model_response)
+    justification = await get_cached_justification(cache_key)
+    if justification is not None:
+        await send_response_start(send, 200, 'text/event-stream', dict(sse_headers, **{'X-Cache': 'HIT'}))
+        await send_event({'delta': justification})
+        await send_event({'done': True}, more_body=False)
+        return
+
+    future = None
+    if UPSTREAM_COALESCE:
+        future, is_leader = justify_flight.begin(cache_key)
+        if not is_leader:
+            # The same report is already being generated: replay it once done
+            await send_response_start(send, 200, 'text/event-stream', dict(sse_headers, **{'X-Cache': 'COALESCED'}))
+            try:
+                report = await justify_flight.wait(future)
+            except Exception as e:
+                print(f"Error in justify_stream: {e}")
+                await send_event({'error': str(e)}, event='error', more_body=False)
+                return
+            if report:
+                await send_event({'delta': report})
+            await send_event({'done': True}, more_body=False)
+            return
+
+    def settle(result=None, error=None):
+        if future is not None:
+            justify_flight.finish(cache_key, future, result=result, error=error)
+
+    try:
+        openai_client, openai_slots = get_openai_upstream()
+    except Exception as e:
+        settle(error=e)
+        print(f"Error in justify_stream: {e}")
+        await send_json(send, 500, {'error': str(e)})
+        return
+
+    try:
+        async with openai_slots:
+            try:
+                completion = await openai_client.chat.completions.create(
+                    model=JUSTIFY_MODEL,
+                    messages=build_justify_messages(user_prompt, model_response),
+                    stream=True
+                )
+            except Exception as e:
+                settle(error=e)
+                print(f"Error in justify_stream: {e}")
+                await send_json(send, 500, {'error': str(e)})
+                return
+
+            await send_response_start(send, 200, 'text/event-stream', dict(sse_headers, **{'X-Cache': 'MISS'}))
+            parts = []
+            try:
+                async for chunk in completion:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        await send_event({'delta': delta})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                settle(error=e)
+                print(f"Error in justify_stream: {e}")
+                await send_event({'error': str(e)}, event='error', more_body=False)
+                return
+            finally:
+                # Also runs on disconnect, which cancels this handler
+                await completion.close()
+
+        justification = ''.join(parts)
+        settle(result=justification)
+        if justification:
+            await run_blocking(save_justification, cache_key, justification)
+        await send_event({'done': True}, more_body=False)
+
+    except asyncio.CancelledError:
+        # Browser went away mid-report: coalesced requests get an error
+        settle(error=ConnectionError('Justification stream was interrupted'))
+        raise
+
+
+async def justify_batch(body, send):
+    """Async counterpart of server.justify_batch (same NDJSON lines)"""
+    try:
+        pairs = parse_batch_pairs(json.loads(body or b'null'))
+    except ValueError as e:
+        await send_json(send, 400, {'error': str(e)})
+        return
+
+    groups = group_pairs(pairs)
+    batch_slots = asyncio.Semaphore(JUSTIFY_BATCH_CONCURRENCY)
+    started = time.perf_counter()
+
+    async def run_pair(cache_key, user_prompt, model_response, indices):
+        async with batch_slots:
+            pair_started = time.perf_counter()
+            try:
+                justification = await get_cached_justification(cache_key)
+                cached = justification is not None
+                if not cached:
+                    justification = await evaluate_justification(user_prompt, model_response, cache_key)
+                result = {
+                    'justification': justification,
+                    'score': parse_score(justification),
+                    'cached': cached,
+                    'latency_ms': round((time.perf_counter() - pair_started) * 1000, 1)
+                }
+            except Exception as e:
+                print(f"Error in justify_batch: {e}")
+                result = {'error': str(e)}
+        return result, indices
+
+    tasks = [
+        asyncio.ensure_future(run_pair(cache_key, user_prompt, model_response, indices))
+        for cache_key, (user_prompt, model_response, indices) in groups.items()
+    ]
+
+    await send_response_start(send, 200, 'application/x-ndjson', {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    finished = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result, indices = await next_done
+            lines = []
+            for index in indices:
+                line = dict(index=index, **result)
+                finished.append(line)
+                lines.append(ndjson_line(line))
+            await send({'type': 'http.response.body', 'body': ''.join(lines).encode('utf-8'), 'more_body': True})
+    finally:
+        # Disconnect cancels this handler; take the pending pairs with it
+        for task in tasks:
+            task.cancel()
+
+    summary = summarize_batch(finished, len(groups), (time.perf_counter() - started) * 1000)
+    await send({'type': 'http.response.body', 'body': ndjson_line(summary).encode('utf-8')})
+
+
+ASYNC_ROUTES = {
+    ('POST', '/api/aurelius'): aurelius_chat,
+    ('POST', '/api/justify'): justify_response,
+    ('POST', '/api/justify/stream'): justify_stream,
+    ('POST', '/api/justify/batch'): justify_batch
+}
+
+# Async routes that need the admin token, like their Flask versions
+ADMIN_ROUTES = {('POST', '/api/justify/batch')}
+
+
+async def read_body(receive):
+    """The whole request body, or None if the client went away; raises RequestEntityTooLarge"""
+    limit = flask_app.config['MAX_CONTENT_LENGTH']
+    chunks = []
+    received = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunks.append(message.get('body', b''))
+        received += len(chunks[-1])
+        if limit is not None and received > limit:
+            raise RequestEntityTooLarge()
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def run_until_disconnect(receive, coroutine):
+    """Run a handler, cancelling it (and its upstream call) if the client disconnects"""
+    handler = asyncio.ensure_future(coroutine)
+
+    async def wait_for_disconnect():
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+
+    watcher = asyncio.ensure_future(wait_for_disconnect())
+    done, _ = await asyncio.wait({handler, watcher}, return_when=asyncio.FIRST_COMPLETED)
+
+    if handler in done:
+        watcher.cancel()
+        handler.result()
+        return
+
+    handler.cancel()
+    try:
+        await handler
+    except asyncio.CancelledError:
+        pass
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            get_hf_upstream()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await close_upstream()
+            _wsgi_executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+def run_flask_hooks(scope):
+    """
+    Run the Flask app's before_request and after_request hooks (startup,
+    flask-cors) for a request served by an async route. Returns
+    (handled, headers): handled is True if a before_request hook answered
+    the request itself; headers are the ones the hooks added.
+    """
+    with flask_app.request_context(build_environ(scope, io.BytesIO())):
+        early = flask_app.preprocess_request()
+        response = flask_app.make_response(early) if early is not None else flask_app.response_class()
+        response = flask_app.process_response(response)
+    headers = [
+        (name.lower().encode('latin-1'), value.encode('latin-1'))
+        for name, value in response.headers.items()
+        if name.lower() not in ('content-type', 'content-length')
+    ]
+    return early is not None, headers
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+
+    if scope['type'] == 'http':
+        handler = ASYNC_ROUTES.get((scope['method'], scope['path']))
+        if handler is not None:
+            # Same hooks and CORS headers as the Flask version of the route
+            handled, hook_headers = await run_blocking(run_flask_hooks, scope)
+            if handled:
+                await flask_asgi(scope, receive, send)
+                return
+
+            async def send_with_hook_headers(message):
+                if message['type'] == 'http.response.start':
+                    message = dict(message, headers=message['headers'] + hook_headers)
+                await send(message)
+
+            if (scope['method'], scope['path']) in ADMIN_ROUTES:
+                failure = check_admin_token(Headers([
+                    (name.decode('latin-1'), value.decode('latin-1')) for name, value in scope.get('headers', [])
+                ]))
+                if failure:
+                    error, status = failure
+                    await send_json(send_with_hook_headers, status, {'error': error})
+                    return
+            if declared_too_large(scope):
+                await send_json(send_with_hook_headers, 413, {'error': 'Request body too large'})
+                return
+            try:
+                body = await read_body(receive)
+            except RequestEntityTooLarge:
+                await send_json(send_with_hook_headers, 413, {'error': 'Request body too large'})
+                return
+            if body is not None:
+                await run_until_disconnect(receive, handler(body, send_with_hook_headers))
+            return
+
+    await flask_asgi(scope, receive, send)
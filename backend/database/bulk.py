@@ -0,0 +1,325 @@
+"""
+Bulk export/import of site content with COPY
+Each table is streamed out with COPY ... TO STDOUT, and imported by
+COPYing into a temporary staging table that is then merged into the real
+one in a single statement, so moving a whole site costs a few round trips
+instead of one per row.
+
+Rows are matched on their natural key (slug for episodes and projects),
+never on id, so an export can be loaded into any database.
+"""
+
+import csv
+import io
+
+# Exported tables, in import order. Columns are everything but id; key
+# columns identify a row across databases. touch is set to the current
+# time whenever an upsert changes a row, so list ETags (built from
+# max(updated_at)) move even if the source carries an older timestamp.
+BULK_TABLES = {
+    'podcasts': {
+        'table': 'podcast_episodes',
+        'key': ('slug',),
+        'columns': ('title', 'description', 'youtube_url', 'slug', 'notes', 'order_index', 'published',
+                    'created_at', 'updated_at'),
+        'unique': True,
+        'touch': 'updated_at'
+    },
+    'projects': {
+        'table': 'projects',
+        'key': ('slug',),
+        'columns': ('type', 'company', 'role', 'period', 'description', 'details', 'tags', 'slug',
+                    'contact_email', 'contact_subject', 'order_index', 'published', 'created_at', 'updated_at'),
+        'unique': True,
+        'touch': 'updated_at'
+    },
+    # Metadata only; the files themselves live in uploads/
+    'images': {
+        'table': 'images',
+        'key': ('filename', 'original_name', 'uploaded_at'),
+        'columns': ('filename', 'original_name', 'url', 'alt_text', 'uploaded_at', 'content_hash', 'size'),
+        'unique': False,
+        'touch': None
+    },
+    'content_blocks': {
+        'table': 'content_blocks',
+        'key': ('page', 'section'),
+        'columns': ('page', 'section', 'content', 'updated_at'),
+        'unique': True,
+        'touch': 'updated_at'
+    }
+}
+
+# One JSON document per line through COPY's CSV mode: JSON never contains
+# these control characters or a raw newline, so nothing is ever quoted or
+# escaped (text mode would double every backslash)
+JSON_LINES_OPTIONS = "(FORMAT csv, DELIMITER E'\\x02', QUOTE E'\\x01')"
+
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+def parse_tables(value):
+    """?tables=a,b as a list in import order (all of them if not given); raises ValueError"""
+    if not value:
+        return list(BULK_TABLES)
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = requested - set(BULK_TABLES)
+    if unknown:
+        raise ValueError(f"Unknown tables: {', '.join(sorted(unknown))} (allowed: {', '.join(BULK_TABLES)})")
+    return [name for name in BULK_TABLES if name in requested]
+
+
+def _select(name):
+    spec = BULK_TABLES[name]
+    return f"SELECT {', '.join(spec['columns'])} FROM {spec['table']} ORDER BY id"
+
+
+def export_ndjson(cur, name):
+    """Yield a table as NDJSON chunks, one {"table": name, "row": {...}} per line"""
+    with cur.copy(f'''
+        COPY (SELECT json_build_object('table', '{name}', 'row', row_to_json(r)) FROM ({_select(name)}) AS r)
+        TO STDOUT WITH {JSON_LINES_OPTIONS}
+    ''') as copy:
+        for data in copy:
+            yield bytes(data)
+
+
+def export_csv(cur, name):
+    """Yield a table as CSV chunks, with a header row"""
+    with cur.copy(f'COPY ({_select(name)}) TO STDOUT WITH (FORMAT csv, HEADER)') as copy:
+        for data in copy:
+            yield bytes(data)
+
+
+def _copy_stream(cur, statement, stream):
+    with cur.copy(statement) as copy:
+        for chunk in iter(lambda: stream.read(COPY_CHUNK_SIZE), b''):
+            copy.write(chunk)
+
+
+def create_staging(cur, name, columns):
+    """Empty temp table with the given columns of a bulk table, dropped on commit"""
+    staging = f'staging_{name}'
+    cur.execute(f'DROP TABLE IF EXISTS {staging}')
+    cur.execute(f'''
+        CREATE TEMP TABLE {staging} ON COMMIT DROP AS
+        SELECT {', '.join(columns)} FROM {BULK_TABLES[name]['table']} WITH NO DATA
+    ''')
+    return staging
+
+
+def _check_columns(name, columns):
+    spec = BULK_TABLES[name]
+    unknown = set(columns) - set(spec['columns'])
+    if unknown:
+        raise ValueError(f"{name}: unknown columns {', '.join(sorted(unknown))} (allowed: {', '.join(spec['columns'])})")
+    missing = [column for column in spec['key'] if column not in columns]
+    if missing:
+        raise ValueError(f"{name}: missing key columns {', '.join(missing)}")
+    # Keep the table's column order whatever order they came in
+    return tuple(column for column in spec['columns'] if column in columns)
+
+
+def stage_csv(cur, name, stream):
+    """COPY a CSV upload (header row first) into a staging table; returns (staging, columns)"""
+    header = next(csv.reader(io.StringIO(stream.readline().decode('utf-8-sig'))), None)
+    if not header:
+        raise ValueError('CSV is empty')
+    columns = [column.strip() for column in header]
+    if len(set(columns)) != len(columns):
+        raise ValueError('CSV header repeats a column')
+    ordered = _check_columns(name, columns)
+
+    staging = create_staging(cur, name, ordered)
+    _copy_stream(cur, f"COPY {staging} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", stream)
+    return staging, ordered
+
+
+def stage_ndjson(cur, stream):
+    """
+    COPY an NDJSON upload into one staging table per bulk table it mentions;
+    returns {name: (staging, columns)} in import order
+    """
+    cur.execute('DROP TABLE IF EXISTS import_lines')
+    cur.execute('CREATE TEMP TABLE import_lines (doc jsonb) ON COMMIT DROP')
+    _copy_stream(cur, f'COPY import_lines (doc) FROM STDIN WITH {JSON_LINES_OPTIONS}', stream)
+    cur.execute('DELETE FROM import_lines WHERE doc IS NULL')  # blank lines
+
+    cur.execute('''
+        SELECT COUNT(*) FROM import_lines
+        WHERE jsonb_typeof(doc) <> 'object' OR jsonb_typeof(doc->'table') <> 'string'
+           OR jsonb_typeof(doc->'row') <> 'object'
+    ''')
+    if cur.fetchone()[0]:
+        raise ValueError('Every line must be {"table": ..., "row": {...}}')
+
+    cur.execute('SELECT DISTINCT doc->>\'table\' FROM import_lines')
+    present = {row[0] for row in cur.fetchall()}
+    unknown = present - set(BULK_TABLES)
+    if unknown:
+        raise ValueError(f"Unknown tables: {', '.join(sorted(unknown))} (allowed: {', '.join(BULK_TABLES)})")
+
+    staged = {}
+    for name in BULK_TABLES:
+        if name not in present:
+            continue
+        cur.execute('''
+            SELECT DISTINCT jsonb_object_keys(doc->'row') FROM import_lines WHERE doc->>'table' = %s
+        ''', (name,))
+        columns = _check_columns(name, [row[0] for row in cur.fetchall()])
+
+        staging = create_staging(cur, name, columns)
+        cur.execute(f'''
+            INSERT INTO {staging} ({', '.join(columns)})
+            SELECT {', '.join('r.' + column for column in columns)}
+            FROM import_lines, jsonb_populate_record(NULL::{staging}, doc->'row') AS r
+            WHERE doc->>'table' = %s
+        ''', (name,))
+        staged[name] = (staging, columns)
+
+    return staged
+
+
+def _check_keys(cur, name, staging):
+    key = ', '.join(BULK_TABLES[name]['key'])
+    cur.execute(f'SELECT COUNT(*) FROM {staging} WHERE NOT (({key}) IS NOT NULL)')
+    if cur.fetchone()[0]:
+        raise ValueError(f'{name}: every row needs {key}')
+    cur.execute(f'SELECT {key} FROM {staging} GROUP BY {key} HAVING COUNT(*) > 1 LIMIT 5')
+    duplicates = cur.fetchall()
+    if duplicates:
+        raise ValueError(f'{name}: repeated {key}: {", ".join(str(row) for row in duplicates)}')
+
+
+def _values(name, columns):
+    """
+    Columns an upsert compares and overwrites: everything but the key and
+    the touch column (which it bumps instead of copying, so a re-import
+    of older timestamps is still a no-op)
+    """
+    spec = BULK_TABLES[name]
+    return [column for column in columns if column not in spec['key'] and column != spec['touch']]
+
+
+def _changed(values, new):
+    """SQL that's true when the existing row t differs from new on one of values"""
+    if not values:
+        return 'FALSE'
+    return f"({', '.join('t.' + c for c in values)}) IS DISTINCT FROM ({', '.join(new + '.' + c for c in values)})"
+
+
+def upsert_sql(name, source, columns, update=True):
+    """
+    INSERT ... SELECT ... ON CONFLICT for a table with a unique key, from
+    source (a staging table or a set-returning function). Rows that
+    already match are left alone; with update=False existing rows are
+    never touched. RETURNING is true for each inserted row, false for
+    each updated one.
+    """
+    spec = BULK_TABLES[name]
+    key = spec['key']
+    values = _values(name, columns)
+    column_list = ', '.join(columns)
+
+    if update and values:
+        assignments = [f'{c} = EXCLUDED.{c}' for c in values]
+        if spec['touch']:
+            assignments.append(f"{spec['touch']} = CURRENT_TIMESTAMP")
+        on_conflict = f"UPDATE SET {', '.join(assignments)} WHERE {_changed(values, 'EXCLUDED')}"
+    else:
+        on_conflict = 'NOTHING'
+    # xmax is 0 for a freshly inserted row and set for an updated one
+    return f'''
+        INSERT INTO {spec['table']} AS t ({column_list})
+        SELECT {column_list} FROM {source}
+        ON CONFLICT ({', '.join(key)}) DO {on_conflict}
+        RETURNING (t.xmax = 0)
+    '''
+
+
+def diff_sql(name, source, columns):
+    """
+    SELECT of (key values..., is_new, changed columns) for every row in
+    source that an upsert would insert or change
+    """
+    spec = BULK_TABLES[name]
+    key = spec['key']
+    values = _values(name, columns)
+    changed_columns = ', '.join(f"CASE WHEN t.{c} IS DISTINCT FROM s.{c} THEN '{c}' END" for c in values)
+    return f'''
+        SELECT {', '.join('s.' + c for c in key)}, t.{key[0]} IS NULL,
+               {f"array_remove(ARRAY[{changed_columns}], NULL)" if values else "ARRAY[]::text[]"}
+        FROM {source} AS s
+        LEFT JOIN {spec['table']} AS t ON {' AND '.join(f't.{c} = s.{c}' for c in key)}
+        WHERE t.{key[0]} IS NULL OR {_changed(values, 's')}
+    '''
+
+
+def merge_staging(cur, name, staging, columns):
+    """
+    Upsert a staging table into its bulk table on the natural key. Rows
+    that already match are left alone, so re-importing the same data
+    writes nothing; changed rows get a fresh updated_at whatever the
+    import says, so HTTP validators move. Returns {'inserted', 'updated',
+    'unchanged'} counts.
+    """
+    spec = BULK_TABLES[name]
+    table, key = spec['table'], spec['key']
+    _check_keys(cur, name, staging)
+
+    cur.execute(f'SELECT COUNT(*) FROM {staging}')
+    staged = cur.fetchone()[0]
+
+    if spec['unique']:
+        cur.execute(upsert_sql(name, staging, columns))
+        results = [row[0] for row in cur.fetchall()]
+        inserted, updated = results.count(True), results.count(False)
+    else:
+        column_list = ', '.join(columns)
+        values = _values(name, columns)
+        match = ' AND '.join(f't.{c} = s.{c}' for c in key)
+        updated = 0
+        if values:
+            assignments = [f'{c} = s.{c}' for c in values]
+            if spec['touch']:
+                assignments.append(f"{spec['touch']} = CURRENT_TIMESTAMP")
+            cur.execute(f'''
+                UPDATE {table} AS t SET {', '.join(assignments)}
+                FROM {staging} AS s
+                WHERE {match} AND {_changed(values, 's')}
+            ''')
+            updated = cur.rowcount
+        cur.execute(f'''
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM {staging} AS s
+            WHERE NOT EXISTS (SELECT 1 FROM {table} AS t WHERE {match})
+        ''')
+        inserted = cur.rowcount
+
+    return {'inserted': inserted, 'updated': updated, 'unchanged': max(staged - inserted - updated, 0)}
+
+
+def import_stream(cur, fmt, stream, table=None):
+    """
+    Import an NDJSON or CSV (one table, named by table) upload in the
+    current transaction; returns {name: counts} for each table imported.
+    Raises ValueError for malformed input.
+    """
+    # psycopg is loaded by now; imported here to keep it off the startup path
+    import psycopg
+
+    try:
+        if fmt == 'csv':
+            if table not in BULK_TABLES:
+                raise ValueError(f"CSV imports need ?table= (one of: {', '.join(BULK_TABLES)})")
+            staged = {table: stage_csv(cur, table, stream)}
+        elif fmt == 'ndjson':
+            staged = stage_ndjson(cur, stream)
+        else:
+            raise ValueError("format must be 'ndjson' or 'csv'")
+
+        return {name: merge_staging(cur, name, staging, columns) for name, (staging, columns) in staged.items()}
+
+    except (csv.Error, psycopg.DataError, psycopg.IntegrityError) as e:
+        # Bad JSON, CSV or values (e.g. a missing required column)
+        raise ValueError(str(e).strip())
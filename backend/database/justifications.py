@@ -0,0 +1,69 @@
+"""
+Stored Stoic Validator (/api/justify) reports
+Keyed by a hash of everything that determines the report, so a repeat
+evaluation is a primary-key lookup instead of an OpenAI call.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.pool import get_db_connection
+
+
+def init_justifications_table(cur):
+    """Create the justification store"""
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS justifications (
+            request_hash TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            justification TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def select_justification(request_hash):
+    """Get a stored report, or None (raises on error)"""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                'SELECT justification FROM justifications WHERE request_hash = %s',
+                (request_hash,)
+            )
+            row = cur.fetchone()
+            return row[0] if row else None
+
+
+def insert_justification(request_hash, model, justification):
+    """Store a report; an existing row for the same hash is kept (raises on error)"""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute('''
+                INSERT INTO justifications (request_hash, model, justification)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (request_hash) DO NOTHING
+            ''', (request_hash, model, justification))
+            conn.commit()
+
+
+def delete_justifications(model=None):
+    """Delete stored reports (all, or one model's) and return how many went"""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            if model:
+                cur.execute('DELETE FROM justifications WHERE model = %s', (model,))
+            else:
+                cur.execute('DELETE FROM justifications')
+            deleted = cur.rowcount
+            conn.commit()
+            return deleted
+
+
+def count_justifications():
+    """Number of stored reports (raises on error)"""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute('SELECT COUNT(*) FROM justifications')
+            return cur.fetchone()[0]
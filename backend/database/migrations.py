@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations
+Each migration runs once, in its own transaction, and is recorded in
+schema_version. On boot the runner reads the current version with a
+single query and runs no DDL at all when nothing is pending.
+
+Add a migration by appending a (version, description, function) entry
+to MIGRATIONS; never edit one that has shipped.
+
+Run by hand with:
+    python backend/database/migrations.py [--status]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.pool import get_db_connection
+from database.visitors import init_visitor_shards
+from database.justifications import init_justifications_table
+
+# Arbitrary key for pg_advisory_xact_lock, so workers booting together
+# don't run the same migration twice
+MIGRATION_LOCK_ID = 7316500
+
+
+def _baseline(cur):
+    """Everything init_database() used to create; IF NOT EXISTS so it adopts existing databases"""
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS podcast_episodes (
+            id SERIAL PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL,
+            youtube_url TEXT NOT NULL,
+            slug TEXT UNIQUE NOT NULL,
+            notes TEXT,
+            order_index INTEGER NOT NULL DEFAULT 0,
+            published BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Internships and projects
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS projects (
+            id SERIAL PRIMARY KEY,
+            type TEXT NOT NULL,
+            company TEXT NOT NULL,
+            role TEXT NOT NULL,
+            period TEXT NOT NULL,
+            description TEXT NOT NULL,
+            details TEXT NOT NULL,
+            tags TEXT[],
+            slug TEXT UNIQUE NOT NULL,
+            contact_email TEXT,
+            contact_subject TEXT,
+            order_index INTEGER NOT NULL DEFAULT 0,
+            published BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS images (
+            id SERIAL PRIMARY KEY,
+            filename TEXT NOT NULL,
+            original_name TEXT NOT NULL,
+            url TEXT NOT NULL,
+            alt_text TEXT,
+            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Content-addressed uploads: rows with the same hash share one blob
+    cur.execute('ALTER TABLE images ADD COLUMN IF NOT EXISTS content_hash TEXT')
+    cur.execute('ALTER TABLE images ADD COLUMN IF NOT EXISTS size BIGINT')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_images_content_hash ON images (content_hash)')
+
+    # Resized WebP/AVIF copies of each uploaded file
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS image_derivatives (
+            source TEXT NOT NULL,
+            format TEXT NOT NULL,
+            width INTEGER NOT NULL,
+            height INTEGER NOT NULL,
+            size BIGINT NOT NULL,
+            filename TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source, format, width)
+        )
+    ''')
+
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS content_blocks (
+            id SERIAL PRIMARY KEY,
+            page TEXT NOT NULL,
+            section TEXT NOT NULL,
+            content TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(page, section)
+        )
+    ''')
+
+    # Legacy single-row visitor count, kept as the shard migration source
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS visitor_count (
+            id INTEGER PRIMARY KEY DEFAULT 1,
+            count INTEGER NOT NULL DEFAULT 0,
+            CONSTRAINT single_row CHECK (id = 1)
+        )
+    ''')
+    cur.execute('''
+        INSERT INTO visitor_count (id, count)
+        VALUES (1, 0)
+        ON CONFLICT (id) DO NOTHING
+    ''')
+
+    # Sharded visitor counter (migrates the single-row count above)
+    init_visitor_shards(cur)
+
+    # Stored /api/justify reports
+    init_justifications_table(cur)
+
+
+def _listing_indexes(cur):
+    """
+    Indexes for the list endpoints' keyset scans. Slug lookups are already
+    covered by the UNIQUE constraints on slug.
+    """
+    # The keyset comparison needs non-NULL sort keys
+    for table, column in (('podcast_episodes', 'created_at'), ('projects', 'created_at'), ('images', 'uploaded_at')):
+        cur.execute(f"UPDATE {table} SET {column} = 'epoch' WHERE {column} IS NULL")
+        cur.execute(f'ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL')
+
+    # Public list: WHERE published = TRUE ORDER BY order_index DESC, created_at DESC, id DESC
+    cur.execute('''
+        CREATE INDEX IF NOT EXISTS idx_podcast_episodes_published_keyset
+        ON podcast_episodes (order_index DESC, created_at DESC, id DESC) WHERE published = TRUE
+    ''')
+    # Admin list (published_only=false)
+    cur.execute('''
+        CREATE INDEX IF NOT EXISTS idx_podcast_episodes_keyset
+        ON podcast_episodes (order_index DESC, created_at DESC, id DESC)
+    ''')
+
+    cur.execute('''
+        CREATE INDEX IF NOT EXISTS idx_projects_published_keyset
+        ON projects (order_index DESC, created_at DESC, id DESC) WHERE published = TRUE
+    ''')
+    cur.execute('''
+        CREATE INDEX IF NOT EXISTS idx_projects_keyset
+        ON projects (order_index DESC, created_at DESC, id DESC)
+    ''')
+    # ?type= filter: equality column first, then the sort key
+    cur.execute('''
+        CREATE INDEX IF NOT EXISTS idx_projects_type_keyset
+        ON projects (type, order_index DESC, created_at DESC, id DESC)
+    ''')
+
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_images_keyset ON images (uploaded_at DESC, id DESC)')
+
+    # Dashboard "recent items" queries (ORDER BY created_at DESC LIMIT 5)
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_podcast_episodes_created_at ON podcast_episodes (created_at DESC)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_projects_created_at ON projects (created_at DESC)')
+
+
+MIGRATIONS = [
+    (1, 'Baseline schema', _baseline),
+    (2, 'Listing indexes and NOT NULL sort keys', _listing_indexes),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(cur):
+    """Applied schema version (0 for a database that predates schema_version)"""
+    cur.execute("SELECT to_regclass('schema_version') IS NOT NULL")
+    if not cur.fetchone()[0]:
+        return 0
+    cur.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version')
+    return cur.fetchone()[0]
+
+
+def migrate():
+    """Apply pending migrations; returns the list of versions applied"""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            version = current_version(cur)
+            conn.commit()
+            if version >= LATEST_VERSION:
+                return []
+
+            applied = []
+            for number, description, apply in MIGRATIONS:
+                if number <= version:
+                    continue
+
+                started = time.perf_counter()
+                cur.execute('SELECT pg_advisory_xact_lock(%s)', (MIGRATION_LOCK_ID,))
+                cur.execute('''
+                    CREATE TABLE IF NOT EXISTS schema_version (
+                        version INTEGER PRIMARY KEY,
+                        description TEXT NOT NULL,
+                        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+
+                # Another worker may have applied it while we waited for the lock
+                if current_version(cur) >= number:
+                    conn.commit()
+                    continue
+
+                apply(cur)
+                cur.execute(
+                    'INSERT INTO schema_version (version, description) VALUES (%s, %s)',
+                    (number, description)
+                )
+                conn.commit()
+
+                applied.append(number)
+                print(f"✓ Applied migration {number}: {description} ({(time.perf_counter() - started) * 1000:.0f}ms)")
+
+            return applied
+
+
+def migration_status():
+    """(version, description, applied_at or None) for every known migration"""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            applied = {}
+            if current_version(cur) > 0:
+                cur.execute('SELECT version, applied_at FROM schema_version')
+                applied = dict(cur.fetchall())
+            return [(number, description, applied.get(number)) for number, description, _ in MIGRATIONS]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--status':
+        for number, description, applied_at in migration_status():
+            print(f"{number:>4}  {'applied ' + applied_at.isoformat() if applied_at else 'pending':<34}  {description}")
+    else:
+        applied = migrate()
+        print(f"✓ Schema at version {LATEST_VERSION}" + ('' if applied else ' (nothing to do)'))
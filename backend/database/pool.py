@@ -0,0 +1,137 @@
+"""
+Shared PostgreSQL connection pool
+One process-wide pool used by server.py and every route blueprint
+"""
+
+import os
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.environ.get('DATABASE_URL')
+
+if DATABASE_URL and DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+# Pool sizing (override in .env)
+POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 1))
+POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 10))
+POOL_MAX_IDLE = float(os.environ.get('DB_POOL_MAX_IDLE', 300))        # seconds before an idle connection is closed
+POOL_MAX_LIFETIME = float(os.environ.get('DB_POOL_MAX_LIFETIME', 3600))
+POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))           # seconds to wait for a free connection
+POOL_HEALTH_CHECK = os.environ.get('DB_POOL_HEALTH_CHECK', 'true').lower() == 'true'
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Checkout latency, measured around pool.connection()
+_checkout_lock = threading.Lock()
+_checkout_stats = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+
+
+def get_pool():
+    """Get the process-wide connection pool, creating it on first use"""
+    global _pool
+
+    if _pool is not None:
+        return _pool
+
+    if not DATABASE_URL:
+        raise ValueError("DATABASE_URL environment variable not set")
+
+    with _pool_lock:
+        if _pool is None:
+            # Imported here so importing the app doesn't load psycopg
+            from psycopg_pool import ConnectionPool
+
+            _pool = ConnectionPool(
+                DATABASE_URL,
+                min_size=POOL_MIN_SIZE,
+                max_size=POOL_MAX_SIZE,
+                max_idle=POOL_MAX_IDLE,
+                max_lifetime=POOL_MAX_LIFETIME,
+                timeout=POOL_TIMEOUT,
+                check=ConnectionPool.check_connection if POOL_HEALTH_CHECK else None,
+                name='personal-website',
+                open=True
+            )
+            atexit.register(close_pool)
+
+    return _pool
+
+
+@contextmanager
+def get_db_connection():
+    """
+    Borrow a connection from the pool
+
+    Usage:
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                ...
+
+    The transaction is committed when the block exits cleanly and rolled
+    back on exceptions, then the connection goes back to the pool.
+    """
+    pool = get_pool()
+    start = time.perf_counter()
+
+    with pool.connection() as conn:
+        _record_checkout((time.perf_counter() - start) * 1000)
+        yield conn
+
+
+def _record_checkout(elapsed_ms):
+    with _checkout_lock:
+        _checkout_stats['count'] += 1
+        _checkout_stats['total_ms'] += elapsed_ms
+        if elapsed_ms > _checkout_stats['max_ms']:
+            _checkout_stats['max_ms'] = elapsed_ms
+
+
+def get_pool_stats():
+    """Get pool usage stats for sizing under load"""
+    if _pool is None:
+        return {'initialized': False}
+
+    stats = _pool.get_stats()
+    pool_size = stats.get('pool_size', 0)
+    pool_available = stats.get('pool_available', 0)
+
+    with _checkout_lock:
+        checkouts = _checkout_stats['count']
+        total_ms = _checkout_stats['total_ms']
+        max_ms = _checkout_stats['max_ms']
+
+    return {
+        'initialized': True,
+        'min_size': _pool.min_size,
+        'max_size': _pool.max_size,
+        'size': pool_size,
+        'available': pool_available,
+        'in_use': pool_size - pool_available,
+        'waiting': stats.get('requests_waiting', 0),
+        'requests': stats.get('requests_num', 0),
+        'requests_queued': stats.get('requests_queued', 0),
+        'requests_errors': stats.get('requests_errors', 0),
+        'connections_lost': stats.get('connections_lost', 0),
+        'checkout': {
+            'count': checkouts,
+            'avg_ms': round(total_ms / checkouts, 3) if checkouts else 0.0,
+            'max_ms': round(max_ms, 3)
+        }
+    }
+
+
+def close_pool():
+    """Close the pool and all its connections"""
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,68 @@
+"""
+Bulk reorder for the admin lists
+A drag-and-drop sends every moved row at once; they're written with one
+UPDATE ... FROM unnest() joined on id, so the batch is a single statement
+and a single round trip however many rows it has.
+"""
+
+# Tables with an order_index column that can be reordered
+REORDERABLE_TABLES = ('podcast_episodes', 'projects')
+
+
+class MissingRowsError(LookupError):
+    """Some ids in a reorder batch don't exist; nothing was written"""
+
+    def __init__(self, ids):
+        super().__init__(f"Not found: {', '.join(str(i) for i in ids)}")
+        self.ids = ids
+
+
+def parse_reorder_items(items):
+    """
+    [{id, order_index}, ...] as parallel (ids, order_indexes) lists;
+    raises ValueError on a malformed item or a repeated id
+    """
+    if not isinstance(items, list):
+        raise ValueError('Expected a list of {id, order_index}')
+
+    ids, order_indexes = [], []
+    for item in items:
+        if not isinstance(item, dict):
+            raise ValueError('Expected a list of {id, order_index}')
+        id_, order_index = item.get('id'), item.get('order_index')
+        # bool is an int subclass, but never a valid id or position
+        if not all(isinstance(v, int) and not isinstance(v, bool) for v in (id_, order_index)):
+            raise ValueError('id and order_index must be integers')
+        ids.append(id_)
+        order_indexes.append(order_index)
+
+    if len(set(ids)) != len(ids):
+        raise ValueError('Each id may appear only once')
+    return ids, order_indexes
+
+
+def reorder_rows(cur, table, ids, order_indexes, returning=()):
+    """
+    Set order_index for every id in one statement; returns (id, *returning)
+    for each updated row. Raises MissingRowsError if any id doesn't exist -
+    the caller should roll back, since the other rows were already updated.
+    """
+    if table not in REORDERABLE_TABLES:
+        raise ValueError(f'Cannot reorder {table}')
+    if not ids:
+        return []
+
+    columns = ''.join(f', t.{column}' for column in returning)
+    cur.execute(f'''
+        UPDATE {table} AS t
+        SET order_index = v.order_index, updated_at = CURRENT_TIMESTAMP
+        FROM unnest(%s::integer[], %s::integer[]) AS v(id, order_index)
+        WHERE t.id = v.id
+        RETURNING t.id{columns}
+    ''', (ids, order_indexes))
+    rows = cur.fetchall()
+
+    if len(rows) != len(ids):
+        found = {row[0] for row in rows}
+        raise MissingRowsError([i for i in ids if i not in found])
+    return rows
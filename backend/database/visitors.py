@@ -0,0 +1,124 @@
+"""
+Sharded visitor counter
+Spreads increments over VISITOR_COUNT_SHARDS rows so concurrent writers
+don't all queue on one row lock; the total is the sum of the shards.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.pool import get_db_connection
+
+VISITOR_COUNT_SHARDS = int(os.environ.get('VISITOR_COUNT_SHARDS', 16))
+VISITOR_TOTAL_CACHE_TTL = float(os.environ.get('VISITOR_TOTAL_CACHE_TTL', 2))  # seconds
+MAX_VISITOR_TOTAL = 2 ** 63 - 1  # shard counts are BIGINT
+
+_total_lock = threading.Lock()
+_total_cache = {'value': None, 'read_at': 0.0}
+
+
+def init_visitor_shards(cur):
+    """
+    Create the shard table and migrate the legacy single-row count into it
+
+    Idempotent: the legacy count is only copied while shard 0 doesn't
+    exist yet.
+    """
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS visitor_count_shards (
+            shard INTEGER PRIMARY KEY,
+            count BIGINT NOT NULL DEFAULT 0
+        )
+    ''')
+
+    # One-time migration from the old visitor_count table (id = 1)
+    cur.execute('''
+        INSERT INTO visitor_count_shards (shard, count)
+        SELECT 0, count FROM visitor_count WHERE id = 1
+        ON CONFLICT (shard) DO NOTHING
+    ''')
+
+    add_missing_visitor_shards(cur)
+
+
+def add_missing_visitor_shards(cur):
+    """Create shard rows up to VISITOR_COUNT_SHARDS (it may have been raised since the last boot)"""
+    cur.execute('SELECT COUNT(*) FROM visitor_count_shards WHERE shard < %s', (VISITOR_COUNT_SHARDS,))
+    if cur.fetchone()[0] >= VISITOR_COUNT_SHARDS:
+        return
+
+    cur.execute('''
+        INSERT INTO visitor_count_shards (shard, count)
+        SELECT shard, 0 FROM generate_series(0, %s - 1) AS shard
+        ON CONFLICT (shard) DO NOTHING
+    ''', (VISITOR_COUNT_SHARDS,))
+
+
+def _remember_total(total):
+    with _total_lock:
+        _total_cache['value'] = total
+        _total_cache['read_at'] = time.monotonic()
+
+
+def sum_visitor_shards(cur):
+    """Sum every shard using an existing cursor (uncached)"""
+    cur.execute('SELECT COALESCE(SUM(count), 0) FROM visitor_count_shards')
+    total = int(cur.fetchone()[0])
+    _remember_total(total)
+    return total
+
+
+def read_visitor_total():
+    """Get the visitor total, cached for VISITOR_TOTAL_CACHE_TTL seconds (raises on error)"""
+    with _total_lock:
+        if _total_cache['value'] is not None and time.monotonic() - _total_cache['read_at'] < VISITOR_TOTAL_CACHE_TTL:
+            return _total_cache['value']
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            return sum_visitor_shards(cur)
+
+
+def add_visits(n=1):
+    """Add n visits to a random shard and return the new total (raises on error)"""
+    shard = random.randrange(VISITOR_COUNT_SHARDS)
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            # Upsert so a missing shard row (VISITOR_COUNT_SHARDS raised
+            # without a restart) is created rather than the visit dropped.
+            # The SELECT runs on the statement's snapshot, i.e. before the
+            # write, so add n back to get the total including this write
+            cur.execute('''
+                WITH bumped AS (
+                    INSERT INTO visitor_count_shards AS s (shard, count)
+                    VALUES (%s, %s)
+                    ON CONFLICT (shard) DO UPDATE SET count = s.count + EXCLUDED.count
+                    RETURNING shard
+                )
+                SELECT COALESCE(SUM(count), 0) + %s FROM visitor_count_shards
+            ''', (shard, n, n))
+            total = int(cur.fetchone()[0])
+            conn.commit()
+
+    _remember_total(total)
+    return total
+
+
+def set_visitor_total(total):
+    """Set the visitor total: shard 0 holds it and every other shard is zeroed"""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute('''
+                UPDATE visitor_count_shards
+                SET count = CASE WHEN shard = 0 THEN %s ELSE 0 END
+            ''', (total,))
+            conn.commit()
+
+    _remember_total(total)
+    return total
@@ -9,7 +9,13 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.schema import get_db_connection
+from database.pool import get_pool_stats
+from database.visitors import sum_visitor_shards
 from utils.auth import require_admin_token
+from utils.cache import content_cache
+from utils.aurelius_cache import aurelius_cache
+from utils.justify_cache import justify_cache, purge_justifications
+from utils.static_files import static_cache
 
 analytics_bp = Blueprint('analytics', __name__)
 
@@ -21,10 +27,8 @@ def get_analytics_overview():
     try:
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # Get visitor count
-                cur.execute('SELECT count FROM visitor_count WHERE id = 1')
-                visitor_row = cur.fetchone()
-                visitor_count = visitor_row[0] if visitor_row else 0
+                # Get visitor count (sum of the counter shards)
+                visitor_count = sum_visitor_shards(cur)
                 
                 # Get podcast count
                 cur.execute('SELECT COUNT(*) FROM podcast_episodes WHERE published = TRUE')
@@ -102,9 +106,7 @@ def get_visitor_trends():
     try:
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute('SELECT count FROM visitor_count WHERE id = 1')
-                row = cur.fetchone()
-                count = row[0] if row else 0
+                count = sum_visitor_shards(cur)
                 
                 return jsonify({
                     'current_count': count,
@@ -114,3 +116,50 @@ def get_visitor_trends():
     except Exception as e:
         print(f"Error getting visitor trends: {e}")
         return jsonify({'error': str(e)}), 500
+
+
+@analytics_bp.route('/api/admin/analytics/pool', methods=['GET'])
+@require_admin_token
+def get_pool_analytics():
+    """Get database connection pool stats (in-use, waiting, checkout latency)"""
+    try:
+        return jsonify({'pool': get_pool_stats()})
+    
+    except Exception as e:
+        print(f"Error getting pool stats: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@analytics_bp.route('/api/admin/analytics/cache', methods=['GET'])
+@require_admin_token
+def get_cache_analytics():
+    """Get content, AureliusGPT, justification and static file cache counters (hit ratio, bytes saved)"""
+    try:
+        return jsonify({
+            'cache': content_cache.stats(),
+            'aurelius_cache': aurelius_cache.stats(),
+            'justify_cache': justify_cache.stats(),
+            'static_cache': static_cache.stats()
+        })
+    
+    except Exception as e:
+        print(f"Error getting cache stats: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@analytics_bp.route('/api/admin/analytics/cache/justify', methods=['DELETE'])
+@require_admin_token
+def purge_justify_cache():
+    """Purge cached /api/justify reports (optionally only one model's: ?model=gpt-4o)"""
+    try:
+        model = request.args.get('model')
+        deleted = purge_justifications(model)
+        
+        return jsonify({
+            'message': 'Justification cache purged',
+            'deleted': deleted
+        })
+    
+    except Exception as e:
+        print(f"Error purging justification cache: {e}")
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,106 @@
+"""
+Bulk content export/import API routes
+"""
+
+from flask import Blueprint, request, jsonify, Response
+from werkzeug.exceptions import RequestEntityTooLarge
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.schema import get_db_connection
+from database.bulk import BULK_TABLES, parse_tables, export_ndjson, export_csv, import_stream
+from utils.auth import require_admin_token
+from utils.cache import content_cache
+
+data_bp = Blueprint('data', __name__)
+
+EXPORT_MIMETYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+@data_bp.route('/api/admin/export', methods=['GET'])
+@require_admin_token
+def export_content():
+    """
+    Stream site content out of the database with COPY
+    
+    ?format=ndjson (default) exports every table, or those in ?tables=,
+    one {"table", "row"} object per line. ?format=csv exports the one
+    table named in ?tables=. Either can be POSTed back to /api/admin/import.
+    """
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_MIMETYPES:
+        return jsonify({'error': "format must be 'ndjson' or 'csv'"}), 400
+    try:
+        tables = parse_tables(request.args.get('tables'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if fmt == 'csv' and len(tables) != 1:
+        return jsonify({'error': f"CSV exports one table: ?tables= one of {', '.join(BULK_TABLES)}"}), 400
+    
+    export = export_csv if fmt == 'csv' else export_ndjson
+    
+    def generate():
+        try:
+            with get_db_connection() as conn:
+                with conn.cursor() as cur:
+                    # Every table from the same snapshot
+                    cur.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY')
+                    for name in tables:
+                        yield from export(cur, name)
+        except Exception as e:
+            # Headers are already sent; the client sees a truncated body
+            print(f"Error exporting content: {e}")
+            raise
+    
+    filename = f"content.{fmt}" if fmt == 'ndjson' else f"{tables[0]}.csv"
+    return Response(
+        generate(),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
+@data_bp.route('/api/admin/import', methods=['POST'])
+@require_admin_token
+def import_content():
+    """
+    Load an export back in, upserting on each table's natural key (slug
+    for episodes and projects)
+    
+    The body is streamed into Postgres with COPY and merged in one
+    transaction: either every row is imported or none is. ?format= is
+    ndjson (default, or csv for a text/csv body); CSV also needs ?table=.
+    """
+    fmt = request.args.get('format') or ('csv' if request.mimetype == 'text/csv' else 'ndjson')
+    
+    try:
+        started = time.perf_counter()
+        
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                try:
+                    counts = import_stream(cur, fmt, request.stream, request.args.get('table'))
+                except ValueError as e:
+                    conn.rollback()
+                    return jsonify({'error': str(e)}), 400
+                
+                conn.commit()
+        
+        # Any cached list or lookup may have changed
+        content_cache.clear()
+        
+        return jsonify({
+            'success': True,
+            'tables': counts,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+        })
+    
+    except RequestEntityTooLarge:
+        return jsonify({'error': f"Import too large (max {request.max_content_length // (1024 * 1024)}MB)"}), 413
+    
+    except Exception as e:
+        print(f"Error importing content: {e}")
+        return jsonify({'error': str(e)}), 500
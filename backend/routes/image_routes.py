@@ -2,16 +2,24 @@
 Image upload and management API routes
 """
 
-from flask import Blueprint, request, jsonify, send_from_directory
+from flask import Blueprint, request, jsonify, abort
+import mimetypes
 import sys
 import os
-import uuid
+import stat
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.formparser import parse_form_data
+from werkzeug.security import safe_join
 from werkzeug.utils import secure_filename
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.schema import get_db_connection
 from utils.auth import require_admin_token
+from utils.uploads import hashing_stream_factory, content_etag
+from utils.http_cache import send_ranged_file
+from utils.pagination import parse_limit, parse_fields, decode_cursor, keyset_condition, serialize_row, split_page
+from utils.derivatives import schedule_derivatives, pick_derivative, build_srcset, remove_derivatives
 
 image_bp = Blueprint('image', __name__)
 
@@ -19,9 +27,20 @@ image_bp = Blueprint('image', __name__)
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'uploads')
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp', 'svg'}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_FORM_OVERHEAD = 64 * 1024      # multipart headers and the alt_text field
 
-# Ensure upload folder exists
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+DERIVATIVE_FOLDER = os.path.join(UPLOAD_FOLDER, 'derivatives')
+
+# Fields the image list can be projected to (?fields=), in output order
+IMAGE_FIELDS = ('id', 'filename', 'original_name', 'url', 'alt_text', 'uploaded_at', 'content_hash', 'size')
+IMAGE_SORT_KEY = ('uploaded_at', 'id')
+IMAGE_SORT_CASTS = ('timestamp', 'integer')
+
+# Stored names never change content (new ones are the SHA-256), so
+# browsers and CDNs can keep them forever
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# ?w= answered with the original while its derivatives may still be coming
+PENDING_DERIVATIVE_CACHE_CONTROL = 'public, max-age=300'
 
 
 def allowed_file(filename):
@@ -29,31 +48,72 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def record_derivatives(source, variants):
+    """Store the dimensions and sizes of a finished derivative job"""
+    if not variants:
+        return
+    
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.executemany('''
+                INSERT INTO image_derivatives (source, format, width, height, size, filename)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (source, format, width) DO UPDATE
+                SET height = EXCLUDED.height, size = EXCLUDED.size, filename = EXCLUDED.filename
+            ''', [
+                (source, v['format'], v['width'], v['height'], v['size'], v['filename'])
+                for v in variants
+            ])
+            conn.commit()
+
+
+def queue_derivatives(filename):
+    """Generate derivatives of an uploaded file in the background (doesn't wait)"""
+    return schedule_derivatives(
+        os.path.join(UPLOAD_FOLDER, filename),
+        DERIVATIVE_FOLDER,
+        lambda variants: record_derivatives(filename, variants)
+    )
+
+
 @image_bp.route('/api/images', methods=['GET'])
 @require_admin_token
 def get_all_images():
-    """Get all uploaded images"""
+    """
+    List uploaded images, newest first
+    
+    Keyset-paginated with ?limit= and ?cursor= (the previous page's
+    next_cursor); ?fields= picks the returned fields.
+    """
     try:
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            fields = parse_fields(request.args.get('fields'), IMAGE_FIELDS)
+            after = decode_cursor(request.args.get('cursor'), IMAGE_SORT_CASTS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute('''
-                    SELECT id, filename, original_name, url, alt_text, uploaded_at
-                    FROM images
-                    ORDER BY uploaded_at DESC
-                ''')
+                query = f"SELECT {', '.join(fields + IMAGE_SORT_KEY)} FROM images"
+                params = []
                 
-                images = []
-                for row in cur.fetchall():
-                    images.append({
-                        'id': row[0],
-                        'filename': row[1],
-                        'original_name': row[2],
-                        'url': row[3],
-                        'alt_text': row[4],
-                        'uploaded_at': row[5].isoformat() if row[5] else None
-                    })
+                if after is not None:
+                    query += ' WHERE ' + keyset_condition(IMAGE_SORT_KEY, IMAGE_SORT_CASTS)
+                    params.extend(after)
+                
+                query += ' ORDER BY uploaded_at DESC, id DESC LIMIT %s'
+                params.append(limit + 1)
+                
+                cur.execute(query, params)
                 
-                return jsonify({'images': images})
+                width = len(fields)
+                rows, next_cursor = split_page(cur.fetchall(), limit, lambda row: row[width:])
+                
+                return jsonify({
+                    'images': [serialize_row(fields, row[:width]) for row in rows],
+                    'next_cursor': next_cursor
+                })
     
     except Exception as e:
         print(f"Error getting images: {e}")
@@ -63,13 +123,38 @@ def get_all_images():
 @image_bp.route('/api/admin/images/upload', methods=['POST'])
 @require_admin_token
 def upload_image():
-    """Upload a new image"""
+    """
+    Upload a new image
+    
+    The file is streamed to a temp file while being hashed and rejected
+    with 413 as soon as it passes MAX_FILE_SIZE. Blobs are stored under
+    their SHA-256, so re-uploading an existing image only adds a row.
+    """
+    too_large = jsonify({'error': f'File too large (max {MAX_FILE_SIZE // (1024 * 1024)}MB)'}), 413
+    
+    # Reject declared oversize bodies before reading any of them
+    if request.content_length is not None and request.content_length > MAX_FILE_SIZE + MAX_FORM_OVERHEAD:
+        return too_large
+    
+    # Created on first upload rather than at import
+    os.makedirs(DERIVATIVE_FOLDER, exist_ok=True)
+    
+    uploads = []
     try:
+        try:
+            _, form, files = parse_form_data(
+                request.environ,
+                stream_factory=hashing_stream_factory(UPLOAD_FOLDER, MAX_FILE_SIZE, uploads),
+                max_content_length=MAX_FILE_SIZE + MAX_FORM_OVERHEAD
+            )
+        except RequestEntityTooLarge:
+            return too_large
+        
         # Check if file is in request
-        if 'file' not in request.files:
+        if 'file' not in files:
             return jsonify({'error': 'No file provided'}), 400
         
-        file = request.files['file']
+        file = files['file']
         
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
@@ -77,32 +162,61 @@ def upload_image():
         if not allowed_file(file.filename):
             return jsonify({'error': 'File type not allowed'}), 400
         
-        # Generate unique filename
+        upload = file.stream
+        content_hash = upload.hexdigest()
+        
         original_filename = secure_filename(file.filename)
         extension = original_filename.rsplit('.', 1)[1].lower()
-        unique_filename = f"{uuid.uuid4().hex}.{extension}"
-        
-        # Save file
-        filepath = os.path.join(UPLOAD_FOLDER, unique_filename)
-        file.save(filepath)
-        
-        # Generate URL
-        file_url = f"/uploads/{unique_filename}"
         
         # Get alt text from form data
-        alt_text = request.form.get('alt_text', '')
+        alt_text = form.get('alt_text', '')
         
-        # Save to database
         with get_db_connection() as conn:
             with conn.cursor() as cur:
+                # Serialize with other uploads/deletes of the same content
+                cur.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', (content_hash,))
+                
+                # Reuse the existing blob for identical content
                 cur.execute('''
-                    INSERT INTO images (filename, original_name, url, alt_text)
-                    VALUES (%s, %s, %s, %s)
-                    RETURNING id, filename, url
-                ''', (unique_filename, original_filename, file_url, alt_text))
+                    SELECT filename FROM images
+                    WHERE content_hash = %s
+                    ORDER BY id
+                    LIMIT 1
+                ''', (content_hash,))
+                existing = cur.fetchone()
                 
-                row = cur.fetchone()
-                conn.commit()
+                stored_path = None
+                if existing and os.path.exists(os.path.join(UPLOAD_FOLDER, existing[0])):
+                    stored_filename = existing[0]
+                    deduplicated = True
+                else:
+                    stored_filename = f"{content_hash}.{extension}"
+                    if upload.store(os.path.join(UPLOAD_FOLDER, stored_filename)):
+                        stored_path = os.path.join(UPLOAD_FOLDER, stored_filename)
+                    deduplicated = False
+                
+                # Generate URL
+                file_url = f"/uploads/{stored_filename}"
+                
+                try:
+                    cur.execute('''
+                        INSERT INTO images (filename, original_name, url, alt_text, content_hash, size)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                        RETURNING id, filename, url
+                    ''', (stored_filename, original_filename, file_url, alt_text, content_hash, upload.size))
+                    
+                    row = cur.fetchone()
+                    conn.commit()
+                except Exception:
+                    # Don't leave a blob without a row; the advisory lock
+                    # keeps other uploads of this content off it meanwhile
+                    if stored_path:
+                        os.remove(stored_path)
+                    raise
+                
+                # Resized WebP/AVIF copies are made in the background
+                if not deduplicated:
+                    queue_derivatives(stored_filename)
                 
                 return jsonify({
                     'success': True,
@@ -110,39 +224,57 @@ def upload_image():
                     'image': {
                         'id': row[0],
                         'filename': row[1],
-                        'url': row[2]
+                        'url': row[2],
+                        'content_hash': content_hash,
+                        'size': upload.size,
+                        'deduplicated': deduplicated
                     }
                 }), 201
     
     except Exception as e:
         print(f"Error uploading image: {e}")
         return jsonify({'error': str(e)}), 500
+    
+    finally:
+        for upload in uploads:
+            upload.discard()
 
 
 @image_bp.route('/api/admin/images/<int:image_id>', methods=['DELETE'])
 @require_admin_token
 def delete_image(image_id):
-    """Delete an image"""
+    """Delete an image (its blob goes once no other row points at it)"""
     try:
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # Get filename before deleting
-                cur.execute('SELECT filename FROM images WHERE id = %s', (image_id,))
+                # Delete from database
+                cur.execute('''
+                    DELETE FROM images WHERE id = %s
+                    RETURNING filename, content_hash
+                ''', (image_id,))
                 row = cur.fetchone()
                 
                 if not row:
                     return jsonify({'error': 'Image not found'}), 404
                 
-                filename = row[0]
+                filename, content_hash = row
                 
-                # Delete from database
-                cur.execute('DELETE FROM images WHERE id = %s', (image_id,))
-                conn.commit()
+                if content_hash:
+                    # Don't race an upload that is about to reuse this blob
+                    cur.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', (content_hash,))
+                
+                cur.execute('SELECT EXISTS (SELECT 1 FROM images WHERE filename = %s)', (filename,))
+                still_used = cur.fetchone()[0]
                 
                 # Delete file from filesystem
                 filepath = os.path.join(UPLOAD_FOLDER, filename)
-                if os.path.exists(filepath):
-                    os.remove(filepath)
+                if not still_used:
+                    if os.path.exists(filepath):
+                        os.remove(filepath)
+                    cur.execute('DELETE FROM image_derivatives WHERE source = %s', (filename,))
+                    remove_derivatives(DERIVATIVE_FOLDER, filename.rsplit('.', 1)[0])
+                
+                conn.commit()
                 
                 return jsonify({
                     'success': True,
@@ -154,7 +286,123 @@ def delete_image(image_id):
         return jsonify({'error': str(e)}), 500
 
 
+@image_bp.route('/api/images/<int:image_id>/srcset', methods=['GET'])
+def get_image_srcset(image_id):
+    """Get an image's derivatives as srcset strings per format (for <picture> sources)"""
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute('SELECT filename, url, alt_text FROM images WHERE id = %s', (image_id,))
+                image = cur.fetchone()
+                
+                if not image:
+                    return jsonify({'error': 'Image not found'}), 404
+                
+                cur.execute('''
+                    SELECT format, width, height, size, filename
+                    FROM image_derivatives
+                    WHERE source = %s
+                    ORDER BY width, format
+                ''', (image[0],))
+                
+                variants = []
+                for row in cur.fetchall():
+                    variants.append({
+                        'format': row[0],
+                        'width': row[1],
+                        'height': row[2],
+                        'size': row[3],
+                        'url': f"/uploads/derivatives/{row[4]}",
+                        'filename': row[4]
+                    })
+                
+                return jsonify({
+                    'src': image[1],
+                    'alt': image[2],
+                    'srcset': build_srcset(variants, '/uploads/derivatives'),
+                    'variants': variants
+                })
+    
+    except Exception as e:
+        print(f"Error getting image srcset: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@image_bp.route('/api/admin/images/<int:image_id>/derivatives', methods=['POST'])
+@require_admin_token
+def regenerate_derivatives(image_id):
+    """Queue derivative generation for an existing image (e.g. uploaded before derivatives existed)"""
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute('SELECT filename FROM images WHERE id = %s', (image_id,))
+                row = cur.fetchone()
+        
+        if not row:
+            return jsonify({'error': 'Image not found'}), 404
+        
+        if not queue_derivatives(row[0]):
+            return jsonify({'error': 'Derivatives are disabled or unsupported for this image'}), 400
+        
+        return jsonify({
+            'success': True,
+            'message': 'Derivative generation queued'
+        }), 202
+    
+    except Exception as e:
+        print(f"Error queueing image derivatives: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+def send_stored_file(directory, filename, mimetype=None, cache_control=IMMUTABLE_CACHE_CONTROL):
+    """
+    Send an upload or derivative with a content-hash ETag, 304s and byte
+    ranges (single or multiple), or 404
+    """
+    path = safe_join(directory, filename)
+    try:
+        st = os.stat(path) if path else None
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        abort(404)
+    
+    return send_ranged_file(
+        path,
+        st,
+        content_etag(path, st),
+        mimetype or mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+        cache_control
+    )
+
+
 @image_bp.route('/uploads/<filename>')
 def serve_upload(filename):
-    """Serve uploaded files"""
-    return send_from_directory(UPLOAD_FOLDER, filename)
+    """
+    Serve uploaded files
+    
+    With ?w=<css px width>, clients that accept AVIF/WebP get the smallest
+    derivative at least that wide instead of the original (when one exists).
+    """
+    width = request.args.get('w', type=int)
+    if width:
+        variant = pick_derivative(
+            DERIVATIVE_FOLDER,
+            filename.rsplit('.', 1)[0],
+            width,
+            request.headers.get('Accept', '')
+        )
+        if variant:
+            response = send_stored_file(DERIVATIVE_FOLDER, variant[0], mimetype=variant[1])
+        else:
+            response = send_stored_file(UPLOAD_FOLDER, filename, cache_control=PENDING_DERIVATIVE_CACHE_CONTROL)
+        response.vary.add('Accept')
+        return response
+    
+    return send_stored_file(UPLOAD_FOLDER, filename)
+
+
+@image_bp.route('/uploads/derivatives/<filename>')
+def serve_derivative(filename):
+    """Serve resized image derivatives"""
+    return send_stored_file(DERIVATIVE_FOLDER, filename)
@@ -10,48 +10,100 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.schema import get_db_connection
+from database.reorder import parse_reorder_items, reorder_rows, MissingRowsError
 from utils.auth import require_admin_token
+from utils.cache import content_cache
+from utils.http_cache import make_etag, conditional_json
+from utils.pagination import parse_limit, parse_fields, decode_cursor, keyset_condition, serialize_row, split_page
 
 podcast_bp = Blueprint('podcast', __name__)
 
+# Fields list responses can be projected to (?fields=), in output order
+EPISODE_FIELDS = ('id', 'title', 'description', 'youtube_url', 'slug', 'notes', 'order_index', 'published', 'created_at')
+EPISODE_SORT_KEY = ('order_index', 'created_at', 'id')
+EPISODE_SORT_CASTS = ('integer', 'timestamp', 'integer')
+
+
+def invalidate_episode_cache(slugs, published_states=(True,)):
+    """
+    Drop the cached reads affected by an episode write
+    
+    Unfiltered lists always change; published-only lists only change if the
+    episode was or is published. Slug lookups are dropped for every slug the
+    episode had before or after the write.
+    """
+    touches_published = any(state is not False for state in published_states)
+    slugs = {slug for slug in slugs if slug}
+    
+    def affected(key):
+        if key[0] == 'episodes':
+            return touches_published or not key[1]
+        return key[0] == 'episode' and key[1] in slugs
+    
+    content_cache.invalidate_where(affected)
+
 
 @podcast_bp.route('/api/podcast/episodes', methods=['GET'])
 def get_all_episodes():
-    """Get all podcast episodes (with optional published filter)"""
+    """
+    List podcast episodes (with optional published filter), highest order first
+    
+    Keyset-paginated: ?limit= (default LIST_PAGE_SIZE) and ?cursor= taken
+    from the previous page's next_cursor. ?fields=id,title,slug returns
+    only those fields, e.g. to leave notes out of list views.
+    """
     try:
         published_only = request.args.get('published_only', 'true').lower() == 'true'
         
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            fields = parse_fields(request.args.get('fields'), EPISODE_FIELDS)
+            cursor = request.args.get('cursor') or None
+            after = decode_cursor(cursor, EPISODE_SORT_CASTS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        cache_key = ('episodes', published_only, fields, cursor, limit)
+        cache_version = content_cache.version
+        cached = content_cache.get(cache_key)
+        if cached is not None:
+            return conditional_json(*cached)
+        
         with get_db_connection() as conn:
             with conn.cursor() as cur:
+                # Projected fields, then the sort key (for the cursor) and updated_at
+                query = f"SELECT {', '.join(fields + EPISODE_SORT_KEY)}, updated_at FROM podcast_episodes WHERE TRUE"
+                params = []
+                
                 if published_only:
-                    cur.execute('''
-                        SELECT id, title, description, youtube_url, slug, notes, order_index, published, created_at
-                        FROM podcast_episodes
-                        WHERE published = TRUE
-                        ORDER BY order_index DESC, created_at DESC
-                    ''')
-                else:
-                    cur.execute('''
-                        SELECT id, title, description, youtube_url, slug, notes, order_index, published, created_at
-                        FROM podcast_episodes
-                        ORDER BY order_index DESC, created_at DESC
-                    ''')
-                
-                episodes = []
-                for row in cur.fetchall():
-                    episodes.append({
-                        'id': row[0],
-                        'title': row[1],
-                        'description': row[2],
-                        'youtube_url': row[3],
-                        'slug': row[4],
-                        'notes': row[5],
-                        'order_index': row[6],
-                        'published': row[7],
-                        'created_at': row[8].isoformat() if row[8] else None
-                    })
-                
-                return jsonify({'episodes': episodes})
+                    query += ' AND published = TRUE'
+                
+                if after is not None:
+                    query += ' AND ' + keyset_condition(EPISODE_SORT_KEY, EPISODE_SORT_CASTS)
+                    params.extend(after)
+                
+                query += ' ORDER BY order_index DESC, created_at DESC, id DESC LIMIT %s'
+                params.append(limit + 1)
+                
+                cur.execute(query, params)
+                
+                width = len(fields)
+                rows, next_cursor = split_page(cur.fetchall(), limit, lambda row: row[width:width + 3])
+                
+                episodes = [serialize_row(fields, row[:width]) for row in rows]
+                
+                # Validators: any write bumps updated_at or changes which rows are on the page
+                last_modified = max((row[-1] for row in rows if row[-1]), default=None)
+                etag = make_etag(
+                    'episodes', published_only, ','.join(fields), cursor, limit, next_cursor,
+                    ','.join(str(row[width + 2]) for row in rows),
+                    last_modified.isoformat() if last_modified else None
+                )
+                
+                cached = ({'episodes': episodes, 'next_cursor': next_cursor}, etag, last_modified)
+                content_cache.set(cache_key, cached, version=cache_version)
+                
+                return conditional_json(*cached)
     
     except Exception as e:
         print(f"Error getting episodes: {e}")
@@ -62,10 +114,16 @@ def get_all_episodes():
 def get_episode_by_slug(slug):
     """Get a single episode by slug"""
     try:
+        cache_key = ('episode', slug)
+        cache_version = content_cache.version
+        cached = content_cache.get(cache_key)
+        if cached is not None:
+            return conditional_json(*cached)
+        
         with get_db_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute('''
-                    SELECT id, title, description, youtube_url, slug, notes, order_index, published, created_at
+                    SELECT id, title, description, youtube_url, slug, notes, order_index, published, created_at, updated_at
                     FROM podcast_episodes
                     WHERE slug = %s
                 ''', (slug,))
@@ -86,7 +144,12 @@ def get_episode_by_slug(slug):
                     'created_at': row[8].isoformat() if row[8] else None
                 }
                 
-                return jsonify({'episode': episode})
+                etag = make_etag('episode', slug, row[0], row[9].isoformat() if row[9] else None)
+                
+                cached = ({'episode': episode}, etag, row[9])
+                content_cache.set(cache_key, cached, version=cache_version)
+                
+                return conditional_json(*cached)
     
     except Exception as e:
         print(f"Error getting episode: {e}")
@@ -111,7 +174,7 @@ def create_episode():
                 cur.execute('''
                     INSERT INTO podcast_episodes (title, description, youtube_url, slug, notes, order_index, published)
                     VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id, title, slug
+                    RETURNING id, title, slug, published
                 ''', (
                     data['title'],
                     data['description'],
@@ -125,6 +188,8 @@ def create_episode():
                 row = cur.fetchone()
                 conn.commit()
                 
+                invalidate_episode_cache([row[2]], [row[3]])
+                
                 return jsonify({
                     'success': True,
                     'message': 'Episode created successfully',
@@ -165,14 +230,20 @@ def update_episode(episode_id):
                 update_fields.append('updated_at = CURRENT_TIMESTAMP')
                 values.append(episode_id)
                 
+                # Read the pre-update slug/published state in the same statement
+                # so the right cache keys can be invalidated
                 query = f'''
+                    WITH old AS (
+                        SELECT slug, published FROM podcast_episodes WHERE id = %s
+                    )
                     UPDATE podcast_episodes
                     SET {', '.join(update_fields)}
                     WHERE id = %s
-                    RETURNING id, title, slug
+                    RETURNING id, title, slug, published,
+                        (SELECT slug FROM old), (SELECT published FROM old)
                 '''
                 
-                cur.execute(query, values)
+                cur.execute(query, [episode_id] + values)
                 row = cur.fetchone()
                 
                 if not row:
@@ -180,6 +251,8 @@ def update_episode(episode_id):
                 
                 conn.commit()
                 
+                invalidate_episode_cache([row[2], row[4]], [row[3], row[5]])
+                
                 return jsonify({
                     'success': True,
                     'message': 'Episode updated successfully',
@@ -202,7 +275,7 @@ def delete_episode(episode_id):
     try:
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute('DELETE FROM podcast_episodes WHERE id = %s RETURNING id', (episode_id,))
+                cur.execute('DELETE FROM podcast_episodes WHERE id = %s RETURNING id, slug, published', (episode_id,))
                 row = cur.fetchone()
                 
                 if not row:
@@ -210,6 +283,8 @@ def delete_episode(episode_id):
                 
                 conn.commit()
                 
+                invalidate_episode_cache([row[1]], [row[2]])
+                
                 return jsonify({
                     'success': True,
                     'message': 'Episode deleted successfully'
@@ -223,24 +298,38 @@ def delete_episode(episode_id):
 @podcast_bp.route('/api/admin/podcast/reorder', methods=['POST'])
 @require_admin_token
 def reorder_episodes():
-    """Reorder podcast episodes"""
+    """
+    Reorder podcast episodes
+    
+    Body: {"episodes": [{"id", "order_index"}, ...]}. Every episode is
+    updated in one statement and one transaction; if any id doesn't exist
+    nothing is written.
+    """
     try:
-        data = request.json
-        episode_orders = data.get('episodes', [])  # List of {id, order_index}
+        data = request.json or {}
+        try:
+            ids, order_indexes = parse_reorder_items(data.get('episodes', []))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                for item in episode_orders:
-                    cur.execute(
-                        'UPDATE podcast_episodes SET order_index = %s WHERE id = %s',
-                        (item['order_index'], item['id'])
-                    )
+                try:
+                    rows = reorder_rows(cur, 'podcast_episodes', ids, order_indexes, ('slug', 'published'))
+                except MissingRowsError as e:
+                    conn.rollback()
+                    return jsonify({'error': 'Episodes not found', 'missing': e.ids}), 404
                 
                 conn.commit()
                 
+                # Once for the whole batch
+                if rows:
+                    invalidate_episode_cache([row[1] for row in rows], [row[2] for row in rows])
+                
                 return jsonify({
                     'success': True,
-                    'message': 'Episodes reordered successfully'
+                    'message': 'Episodes reordered successfully',
+                    'updated': len(rows)
                 })
     
     except Exception as e:
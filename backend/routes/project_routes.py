@@ -9,21 +9,77 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.schema import get_db_connection
+from database.reorder import parse_reorder_items, reorder_rows, MissingRowsError
 from utils.auth import require_admin_token
+from utils.cache import content_cache
+from utils.http_cache import make_etag, conditional_json
+from utils.pagination import parse_limit, parse_fields, decode_cursor, keyset_condition, serialize_row, split_page
 
 project_bp = Blueprint('project', __name__)
 
+# Fields list responses can be projected to (?fields=), in output order
+PROJECT_FIELDS = (
+    'id', 'type', 'company', 'role', 'period', 'description', 'details', 'tags', 'slug',
+    'contact_email', 'contact_subject', 'order_index', 'published'
+)
+PROJECT_SORT_KEY = ('order_index', 'created_at', 'id')
+PROJECT_SORT_CASTS = ('integer', 'timestamp', 'integer')
+
+
+def invalidate_project_cache(slugs, types, published_states=(True,)):
+    """
+    Drop the cached reads affected by a project write
+    
+    A list is affected if it is unfiltered by type or filtered by one of the
+    project's types (before or after the write), and - for published-only
+    lists - if the project was or is published.
+    """
+    touches_published = any(state is not False for state in published_states)
+    slugs = {slug for slug in slugs if slug}
+    types = set(types)
+    
+    def affected(key):
+        if key[0] == 'projects':
+            published_only, project_type = key[1], key[2]
+            if published_only and not touches_published:
+                return False
+            return project_type is None or project_type in types
+        return key[0] == 'project' and key[1] in slugs
+    
+    content_cache.invalidate_where(affected)
+
 
 @project_bp.route('/api/projects', methods=['GET'])
 def get_all_projects():
-    """Get all projects (with optional type and published filters)"""
+    """
+    List projects (with optional type and published filters), highest order first
+    
+    Keyset-paginated: ?limit= (default LIST_PAGE_SIZE) and ?cursor= taken
+    from the previous page's next_cursor. ?fields=slug,company,role returns
+    only those fields, e.g. to leave details out of list views.
+    """
     try:
         project_type = request.args.get('type')  # 'internship', 'project', etc.
         published_only = request.args.get('published_only', 'true').lower() == 'true'
         
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            fields = parse_fields(request.args.get('fields'), PROJECT_FIELDS)
+            cursor = request.args.get('cursor') or None
+            after = decode_cursor(cursor, PROJECT_SORT_CASTS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        cache_key = ('projects', published_only, project_type or None, fields, cursor, limit)
+        cache_version = content_cache.version
+        cached = content_cache.get(cache_key)
+        if cached is not None:
+            return conditional_json(*cached)
+        
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                query = 'SELECT id, type, company, role, period, description, details, tags, slug, contact_email, contact_subject, order_index, published FROM projects WHERE 1=1'
+                # Projected fields, then the sort key (for the cursor) and updated_at
+                query = f"SELECT {', '.join(fields + PROJECT_SORT_KEY)}, updated_at FROM projects WHERE TRUE"
                 params = []
                 
                 if published_only:
@@ -33,29 +89,32 @@ def get_all_projects():
                     query += ' AND type = %s'
                     params.append(project_type)
                 
-                query += ' ORDER BY order_index DESC, created_at DESC'
+                if after is not None:
+                    query += ' AND ' + keyset_condition(PROJECT_SORT_KEY, PROJECT_SORT_CASTS)
+                    params.extend(after)
+                
+                query += ' ORDER BY order_index DESC, created_at DESC, id DESC LIMIT %s'
+                params.append(limit + 1)
                 
                 cur.execute(query, params)
                 
-                projects = []
-                for row in cur.fetchall():
-                    projects.append({
-                        'id': row[0],
-                        'type': row[1],
-                        'company': row[2],
-                        'role': row[3],
-                        'period': row[4],
-                        'description': row[5],
-                        'details': row[6],
-                        'tags': row[7],
-                        'slug': row[8],
-                        'contact_email': row[9],
-                        'contact_subject': row[10],
-                        'order_index': row[11],
-                        'published': row[12]
-                    })
-                
-                return jsonify({'projects': projects})
+                width = len(fields)
+                rows, next_cursor = split_page(cur.fetchall(), limit, lambda row: row[width:width + 3])
+                
+                projects = [serialize_row(fields, row[:width]) for row in rows]
+                
+                # Validators: any write bumps updated_at or changes which rows are on the page
+                last_modified = max((row[-1] for row in rows if row[-1]), default=None)
+                etag = make_etag(
+                    'projects', published_only, project_type, ','.join(fields), cursor, limit, next_cursor,
+                    ','.join(str(row[width + 2]) for row in rows),
+                    last_modified.isoformat() if last_modified else None
+                )
+                
+                cached = ({'projects': projects, 'next_cursor': next_cursor}, etag, last_modified)
+                content_cache.set(cache_key, cached, version=cache_version)
+                
+                return conditional_json(*cached)
     
     except Exception as e:
         print(f"Error getting projects: {e}")
@@ -66,10 +125,16 @@ def get_all_projects():
 def get_project_by_slug(slug):
     """Get a single project by slug"""
     try:
+        cache_key = ('project', slug)
+        cache_version = content_cache.version
+        cached = content_cache.get(cache_key)
+        if cached is not None:
+            return conditional_json(*cached)
+        
         with get_db_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute('''
-                    SELECT id, type, company, role, period, description, details, tags, slug, contact_email, contact_subject, order_index, published
+                    SELECT id, type, company, role, period, description, details, tags, slug, contact_email, contact_subject, order_index, published, updated_at
                     FROM projects
                     WHERE slug = %s
                 ''', (slug,))
@@ -94,7 +159,12 @@ def get_project_by_slug(slug):
                     'published': row[12]
                 }
                 
-                return jsonify({'project': project})
+                etag = make_etag('project', slug, row[0], row[13].isoformat() if row[13] else None)
+                
+                cached = ({'project': project}, etag, row[13])
+                content_cache.set(cache_key, cached, version=cache_version)
+                
+                return conditional_json(*cached)
     
     except Exception as e:
         print(f"Error getting project: {e}")
@@ -119,7 +189,7 @@ def create_project():
                 cur.execute('''
                     INSERT INTO projects (type, company, role, period, description, details, tags, slug, contact_email, contact_subject, order_index, published)
                     VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id, company, slug
+                    RETURNING id, company, slug, type, published
                 ''', (
                     data['type'],
                     data['company'],
@@ -138,6 +208,8 @@ def create_project():
                 row = cur.fetchone()
                 conn.commit()
                 
+                invalidate_project_cache([row[2]], [row[3]], [row[4]])
+                
                 return jsonify({
                     'success': True,
                     'message': 'Project created successfully',
@@ -177,14 +249,20 @@ def update_project(project_id):
                 update_fields.append('updated_at = CURRENT_TIMESTAMP')
                 values.append(project_id)
                 
+                # Read the pre-update slug/type/published state in the same
+                # statement so the right cache keys can be invalidated
                 query = f'''
+                    WITH old AS (
+                        SELECT slug, type, published FROM projects WHERE id = %s
+                    )
                     UPDATE projects
                     SET {', '.join(update_fields)}
                     WHERE id = %s
-                    RETURNING id, company, slug
+                    RETURNING id, company, slug, type, published,
+                        (SELECT slug FROM old), (SELECT type FROM old), (SELECT published FROM old)
                 '''
                 
-                cur.execute(query, values)
+                cur.execute(query, [project_id] + values)
                 row = cur.fetchone()
                 
                 if not row:
@@ -192,6 +270,8 @@ def update_project(project_id):
                 
                 conn.commit()
                 
+                invalidate_project_cache([row[2], row[5]], [row[3], row[6]], [row[4], row[7]])
+                
                 return jsonify({
                     'success': True,
                     'message': 'Project updated successfully',
@@ -214,7 +294,7 @@ def delete_project(project_id):
     try:
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute('DELETE FROM projects WHERE id = %s RETURNING id', (project_id,))
+                cur.execute('DELETE FROM projects WHERE id = %s RETURNING id, slug, type, published', (project_id,))
                 row = cur.fetchone()
                 
                 if not row:
@@ -222,6 +302,8 @@ def delete_project(project_id):
                 
                 conn.commit()
                 
+                invalidate_project_cache([row[1]], [row[2]], [row[3]])
+                
                 return jsonify({
                     'success': True,
                     'message': 'Project deleted successfully'
@@ -230,3 +312,47 @@ def delete_project(project_id):
     except Exception as e:
         print(f"Error deleting project: {e}")
         return jsonify({'error': str(e)}), 500
+
+
+@project_bp.route('/api/admin/projects/reorder', methods=['POST'])
+@require_admin_token
+def reorder_projects():
+    """
+    Reorder projects
+    
+    Body: {"projects": [{"id", "order_index"}, ...]}. Every project is
+    updated in one statement and one transaction; if any id doesn't exist
+    nothing is written.
+    """
+    try:
+        data = request.json or {}
+        try:
+            ids, order_indexes = parse_reorder_items(data.get('projects', []))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                try:
+                    rows = reorder_rows(cur, 'projects', ids, order_indexes, ('slug', 'type', 'published'))
+                except MissingRowsError as e:
+                    conn.rollback()
+                    return jsonify({'error': 'Projects not found', 'missing': e.ids}), 404
+                
+                conn.commit()
+                
+                # Once for the whole batch
+                if rows:
+                    invalidate_project_cache(
+                        [row[1] for row in rows], [row[2] for row in rows], [row[3] for row in rows]
+                    )
+                
+                return jsonify({
+                    'success': True,
+                    'message': 'Projects reordered successfully',
+                    'updated': len(rows)
+                })
+    
+    except Exception as e:
+        print(f"Error reordering projects: {e}")
+        return jsonify({'error': str(e)}), 500
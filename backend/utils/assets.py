@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Fingerprinted, precompressed static assets
+Copies each site asset to dist/<name>.<hash>.<ext> with .gz (and .br when
+brotli is installed) siblings for text files, and writes dist/manifest.json
+mapping the original URL to the fingerprinted one. server.py runs the build
+at startup and rewrites the references in index.html from the manifest.
+
+Run by hand with:
+    python backend/utils/assets.py
+"""
+
+import glob
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DIST_DIR = os.path.join(ROOT_DIR, 'dist')
+MANIFEST_FILE = os.path.join(DIST_DIR, 'manifest.json')
+
+# Globs relative to the site root
+ASSET_PATTERNS = ['styles.css', 'js/**/*.js', '*.jpg', '*.png', '*.svg']
+COMPRESSIBLE_EXTENSIONS = {'css', 'js', 'svg'}
+
+_manifest_lock = threading.Lock()
+_manifest_state = {'signature': None, 'manifest': {}}
+
+
+def asset_sources():
+    """Site-relative paths of every asset, sorted"""
+    paths = set()
+    for pattern in ASSET_PATTERNS:
+        for path in glob.glob(os.path.join(ROOT_DIR, pattern), recursive=True):
+            if os.path.isfile(path):
+                paths.add(os.path.relpath(path, ROOT_DIR).replace(os.sep, '/'))
+    return sorted(paths)
+
+
+def sources_signature(sources=None):
+    """Cheap change detector: (path, mtime, size) of every asset"""
+    signature = []
+    for path in sources if sources is not None else asset_sources():
+        stat = os.stat(os.path.join(ROOT_DIR, path))
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def fingerprinted_name(path, content):
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    stem, dot, extension = path.rpartition('.')
+    return f"{stem}.{digest}.{extension}" if dot else f"{path}.{digest}"
+
+
+def _write_once(path, make_data):
+    # Content-addressed: an existing file already has these bytes, so
+    # make_data() (e.g. compression) only runs for new content
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(make_data())
+    os.replace(tmp_path, path)
+
+
+def read_manifest():
+    """The manifest last written to dist/, or {} if there isn't one"""
+    try:
+        with open(MANIFEST_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def manifest_files(manifest):
+    """dist/-relative names of every file written for a manifest's assets"""
+    names = set()
+    for fingerprinted in manifest.values():
+        name = fingerprinted[len('/dist/'):]
+        names.update((name, f"{name}.gz", f"{name}.br"))
+    return names
+
+
+def prune_dist(keep):
+    """Delete files in dist/ other than the manifest and keep; returns how many"""
+    removed = 0
+    for path in glob.glob(os.path.join(DIST_DIR, '**', '*'), recursive=True):
+        name = os.path.relpath(path, DIST_DIR).replace(os.sep, '/')
+        # Skip other processes' in-progress writes
+        if not os.path.isfile(path) or path == MANIFEST_FILE or '.tmp' in name or name in keep:
+            continue
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def build_assets():
+    """
+    Fingerprint and precompress every asset; returns the manifest
+    {'/styles.css': '/dist/styles.1a2b3c4d5e6f.css', ...}
+
+    Files from before the previous build are pruned; the previous build's
+    are kept for pages rendered (or workers still running) before it.
+    """
+    previous = read_manifest()
+    sources = asset_sources()
+    manifest = {}
+
+    for path in sources:
+        with open(os.path.join(ROOT_DIR, path), 'rb') as f:
+            content = f.read()
+
+        name = fingerprinted_name(path, content)
+        target = os.path.join(DIST_DIR, name)
+        _write_once(target, lambda: content)
+
+        if path.rsplit('.', 1)[-1].lower() in COMPRESSIBLE_EXTENSIONS:
+            _write_once(f"{target}.gz", lambda: gzip.compress(content, compresslevel=9, mtime=0))
+            if brotli is not None:
+                _write_once(f"{target}.br", lambda: brotli.compress(content, quality=11))
+
+        manifest[f"/{path}"] = f"/dist/{name}"
+
+    os.makedirs(DIST_DIR, exist_ok=True)
+    tmp_path = f"{MANIFEST_FILE}.tmp{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_FILE)
+
+    if previous != manifest:
+        prune_dist(manifest_files(manifest) | manifest_files(previous))
+
+    with _manifest_lock:
+        _manifest_state['manifest'] = manifest
+        _manifest_state['signature'] = sources_signature(sources)
+
+    return manifest
+
+
+def get_manifest(check_sources=True):
+    """
+    Current manifest, rebuilt first if any asset changed on disk
+    (pass check_sources=False to skip the stat calls)
+    """
+    if check_sources:
+        signature = sources_signature()
+        with _manifest_lock:
+            stale = signature != _manifest_state['signature']
+        if stale:
+            return build_assets()
+
+    with _manifest_lock:
+        return _manifest_state['manifest']
+
+
+def rewrite_asset_urls(html, manifest):
+    """Point src/href attributes at fingerprinted URLs (root-relative or bare paths only)"""
+    for original, fingerprinted in manifest.items():
+        for prefix in ('/', ''):
+            for attribute in ('src', 'href'):
+                html = html.replace(
+                    f'{attribute}="{prefix}{original[1:]}"',
+                    f'{attribute}="{fingerprinted}"'
+                )
+    return html
+
+
+if __name__ == '__main__':
+    built = build_assets()
+    for original, fingerprinted in built.items():
+        print(f"✓ {original} -> {fingerprinted}")
+    print(f"✓ Wrote {MANIFEST_FILE}")
@@ -0,0 +1,72 @@
+"""
+Prompt-keyed response cache for AureliusGPT generations
+"""
+
+import hashlib
+import json
+import os
+
+from utils.cache import TTLCache
+
+AURELIUS_CACHE_MAX_ENTRIES = int(os.environ.get('AURELIUS_CACHE_MAX_ENTRIES', 256))  # 0 disables the cache
+AURELIUS_CACHE_MAX_BYTES = int(os.environ.get('AURELIUS_CACHE_MAX_BYTES', 8 * 1024 * 1024))
+AURELIUS_CACHE_TTL = float(os.environ.get('AURELIUS_CACHE_TTL', 3600))
+# Sampled generations differ run to run, so they're only cached on opt-in
+AURELIUS_CACHE_SAMPLED = os.environ.get('AURELIUS_CACHE_SAMPLED', 'false').lower() == 'true'
+
+SAMPLING_PARAMETERS = ('temperature', 'top_k', 'top_p', 'typical_p')
+
+# Entries are (body bytes, content type)
+aurelius_cache = TTLCache(
+    max_entries=AURELIUS_CACHE_MAX_ENTRIES,
+    ttl=AURELIUS_CACHE_TTL,
+    max_bytes=AURELIUS_CACHE_MAX_BYTES,
+    sizeof=lambda entry: len(entry[0])
+)
+
+
+def is_sampled(parameters):
+    """Whether generation parameters ask for non-deterministic sampling"""
+    if parameters.get('seed') is not None:
+        return False
+    if 'do_sample' in parameters:
+        return bool(parameters['do_sample'])
+    return any(parameters.get(name) is not None for name in SAMPLING_PARAMETERS)
+
+
+def _canonical_hash(data):
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def aurelius_request_hash(body):
+    """
+    Canonical hash of the request JSON (inputs plus generation parameters),
+    so key order and whitespace don't matter; raw bytes if it isn't JSON
+    """
+    try:
+        return _canonical_hash(json.loads(body))
+    except ValueError:
+        return hashlib.sha256(body).hexdigest()
+
+
+def aurelius_cache_key(body):
+    """Cache key for a request, or None if the request shouldn't be cached"""
+    if AURELIUS_CACHE_MAX_ENTRIES <= 0:
+        return None
+
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    parameters = data.get('parameters') or {}
+    if not isinstance(parameters, dict):
+        return None
+    if is_sampled(parameters) and not AURELIUS_CACHE_SAMPLED:
+        return None
+
+    return _canonical_hash(data)
@@ -7,6 +7,30 @@ from functools import wraps
 from flask import request, jsonify
 
 
+def check_admin_token(headers):
+    """
+    None if headers carry the admin token, otherwise the (error message,
+    status) to answer with
+    """
+    admin_token = os.environ.get('ADMIN_TOKEN')
+    
+    if not admin_token:
+        return 'Admin endpoint not configured', 500
+    
+    # Check for token in X-Admin-Token header
+    provided_token = headers.get('X-Admin-Token')
+    
+    # Also support Authorization: Bearer <token>
+    auth_header = headers.get('Authorization')
+    if auth_header and auth_header.startswith('Bearer '):
+        provided_token = auth_header.replace('Bearer ', '')
+    
+    if not provided_token or provided_token != admin_token:
+        return 'Unauthorized', 401
+    
+    return None
+
+
 def require_admin_token(f):
     """
     Decorator to protect admin endpoints with token authentication
@@ -18,21 +42,10 @@ def require_admin_token(f):
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        admin_token = os.environ.get('ADMIN_TOKEN')
-        
-        if not admin_token:
-            return jsonify({'error': 'Admin endpoint not configured'}), 500
-        
-        # Check for token in X-Admin-Token header
-        provided_token = request.headers.get('X-Admin-Token')
-        
-        # Also support Authorization: Bearer <token>
-        auth_header = request.headers.get('Authorization')
-        if auth_header and auth_header.startswith('Bearer '):
-            provided_token = auth_header.replace('Bearer ', '')
-        
-        if not provided_token or provided_token != admin_token:
-            return jsonify({'error': 'Unauthorized'}), 401
+        failure = check_admin_token(request.headers)
+        if failure:
+            error, status = failure
+            return jsonify({'error': error}), status
         
         return f(*args, **kwargs)
     
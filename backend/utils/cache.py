@@ -0,0 +1,144 @@
+"""
+In-process read-through cache for public content endpoints
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Size-bounded LRU cache with a per-entry TTL and hit/miss counters
+
+    Bounded by entry count and, if sizeof is given, by total bytes too
+    (sizeof(value) -> bytes). Values bigger than max_bytes aren't stored.
+
+    Usage:
+        version = cache.version
+        value = cache.get(key)
+        if value is None:
+            value = load()
+            cache.set(key, value, version=version)
+
+    Passing the version read before loading makes set() a no-op if an
+    invalidation happened in between, so a slow reader can't put stale
+    data back after a write.
+    """
+
+    def __init__(self, max_entries=512, ttl=300, max_bytes=None, sizeof=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries = OrderedDict()  # key -> (expires_at, value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.bytes_served = 0  # sum of sizes returned from hits
+
+    @property
+    def version(self):
+        return self._version
+
+    def get(self, key):
+        """Get a cached value, or None on miss/expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value, size = entry
+            if expires_at < time.monotonic():
+                self._drop(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.bytes_served += size
+            return value
+
+    def set(self, key, value, version=None):
+        """Store a value, evicting the least recently used entries past the bounds"""
+        if self.max_entries <= 0:
+            return
+
+        size = self.sizeof(value) if self.sizeof else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *keys):
+        """Drop specific keys"""
+        with self._lock:
+            self._version += 1
+            for key in keys:
+                if key in self._entries:
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def invalidate_where(self, predicate):
+        """Drop every key for which predicate(key) is true"""
+        with self._lock:
+            self._version += 1
+            for key in [k for k in self._entries if predicate(k)]:
+                self._drop(key)
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._version += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'bytes_served': self.bytes_served
+            }
+
+    def _drop(self, key):
+        # Caller holds the lock
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+
+# Shared cache for podcast/project reads. Admin writes invalidate the
+# affected keys; the TTL bounds staleness across multiple workers.
+content_cache = TTLCache(
+    max_entries=int(os.environ.get('CONTENT_CACHE_MAX_ENTRIES', 512)),
+    ttl=float(os.environ.get('CONTENT_CACHE_TTL', 300))
+)
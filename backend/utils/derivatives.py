@@ -0,0 +1,169 @@
+"""
+Responsive image derivatives
+Uploaded images are resized to a few widths and re-encoded as WebP (and
+AVIF where Pillow supports it) in a background process pool. Derivatives
+are named after the original's file stem (its SHA-256 for new uploads), as
+uploads/derivatives/<stem>-<width>w.<format>, so requests for the original
+can find them without asking the database.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+DERIVATIVE_WIDTHS = sorted(
+    int(w) for w in os.environ.get('IMAGE_DERIVATIVE_WIDTHS', '320,640,1024,1600').split(',') if w.strip()
+)
+DERIVATIVE_WORKERS = int(os.environ.get('IMAGE_DERIVATIVE_WORKERS', 2))  # 0 disables derivatives
+DERIVATIVE_QUALITY = {'avif': 50, 'webp': 80}
+
+# Raster formats worth resizing (SVG is already resolution independent)
+SOURCE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+
+def available_formats():
+    """Derivative formats this Pillow build can encode, best first"""
+    # Pillow is imported on first use so it stays off the startup path
+    try:
+        from PIL import features
+    except ImportError:
+        return []
+    return [fmt for fmt in ('avif', 'webp') if features.check(fmt)]
+
+
+def derivative_filename(stem, width, fmt):
+    return f"{stem}-{width}w.{fmt}"
+
+
+def generate_derivatives(source_path, output_dir, stem, widths, formats):
+    """
+    Resize one image to each width below its own and encode it in each format.
+    Runs in a worker process; returns one dict per file written.
+    """
+    from PIL import Image, ImageOps
+
+    os.makedirs(output_dir, exist_ok=True)
+    variants = []
+
+    with Image.open(source_path) as original:
+        # Animated images would lose every frame but the first
+        if getattr(original, 'is_animated', False):
+            return variants
+
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'RGBA'):
+            has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        for width in widths:
+            if width >= image.width:
+                break
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS)
+
+            for fmt in formats:
+                filename = derivative_filename(stem, width, fmt)
+                path = os.path.join(output_dir, filename)
+                tmp_path = f"{path}.tmp"
+                resized.save(tmp_path, format=fmt.upper(), quality=DERIVATIVE_QUALITY[fmt])
+                os.replace(tmp_path, path)
+                variants.append({
+                    'format': fmt,
+                    'width': width,
+                    'height': height,
+                    'size': os.path.getsize(path),
+                    'filename': filename
+                })
+
+    return variants
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor, _executor_pid
+
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            # Never fork the server itself: a lock held by another thread
+            # (the pool, logging, an upstream client) at fork time would stay
+            # locked in the child. Forkserver workers come from a clean
+            # single-threaded process; spawn is the fallback elsewhere.
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _executor = ProcessPoolExecutor(
+                max_workers=DERIVATIVE_WORKERS,
+                mp_context=multiprocessing.get_context(method)
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def schedule_derivatives(source_path, output_dir, on_done):
+    """
+    Queue derivative generation without waiting for it; on_done(variants)
+    is called from a background thread once they're written.
+    Returns False if derivatives are disabled or unsupported for this file.
+    """
+    formats = available_formats()
+    stem, _, extension = os.path.basename(source_path).rpartition('.')
+    if DERIVATIVE_WORKERS <= 0 or not formats or extension.lower() not in SOURCE_EXTENSIONS:
+        return False
+
+    future = _get_executor().submit(
+        generate_derivatives, source_path, output_dir, stem, DERIVATIVE_WIDTHS, formats
+    )
+
+    def done(f):
+        try:
+            on_done(f.result())
+        except Exception as e:
+            print(f"Error generating image derivatives for {source_path}: {e}")
+
+    future.add_done_callback(done)
+    return True
+
+
+def pick_derivative(output_dir, stem, width, accept):
+    """
+    Best existing derivative for a requested width and Accept header: the
+    smallest one at least that wide, in the best format the client accepts.
+    Returns (filename, mime type), or None to serve the original.
+    """
+    for fmt in ('avif', 'webp'):
+        if MIME_TYPES[fmt] not in accept:
+            continue
+
+        for candidate in DERIVATIVE_WIDTHS:
+            if candidate < width:
+                continue
+            filename = derivative_filename(stem, candidate, fmt)
+            if os.path.exists(os.path.join(output_dir, filename)):
+                return filename, MIME_TYPES[fmt]
+
+    return None
+
+
+def build_srcset(variants, url_prefix):
+    """srcset strings per MIME type from derivative rows, e.g. {'image/webp': 'a-320w.webp 320w, ...'}"""
+    srcset = {}
+    for variant in sorted(variants, key=lambda v: v['width']):
+        mime = MIME_TYPES[variant['format']]
+        entry = f"{url_prefix}/{variant['filename']} {variant['width']}w"
+        srcset[mime] = f"{srcset[mime]}, {entry}" if mime in srcset else entry
+    return srcset
+
+
+def remove_derivatives(output_dir, stem):
+    """Delete every derivative file of one original"""
+    for fmt in MIME_TYPES:
+        for width in DERIVATIVE_WIDTHS:
+            try:
+                os.remove(os.path.join(output_dir, derivative_filename(stem, width, fmt)))
+            except FileNotFoundError:
+                pass
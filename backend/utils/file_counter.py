@@ -0,0 +1,125 @@
+"""
+Memory-mapped, lock-coordinated counter file for running without a database
+
+The file has a fixed 16-byte layout:
+    bytes 0-3   magic b'VCNT'
+    bytes 4-7   layout version (uint32, little endian)
+    bytes 8-15  count (uint64, little endian)
+
+Every worker maps the same file. Increments take a POSIX record lock on the
+count so concurrent processes can't lose updates, and write straight into
+the shared mapping, so the value survives a worker crash. Reads come from
+the mapping without any locking or parsing.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+MAGIC = b'VCNT'
+LAYOUT_VERSION = 1
+HEADER = struct.Struct('<4sI')
+COUNT = struct.Struct('<Q')
+COUNT_OFFSET = HEADER.size
+MAX_COUNT = 2 ** (8 * COUNT.size) - 1  # largest count the file can hold
+FILE_SIZE = HEADER.size + COUNT.size
+
+
+class FileCounter:
+    """
+    Cross-process counter backed by a small memory-mapped file
+
+    Args:
+        path: counter file, created if missing
+        legacy_json_path: optional visitor_count.json to seed a new file from
+        durable: fsync the mapping after every write (slower, survives power loss)
+    """
+
+    def __init__(self, path, legacy_json_path=None, durable=False):
+        self.path = str(path)
+        self.durable = durable
+        self._thread_lock = threading.Lock()  # record locks don't exclude threads of one process
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._lock(fd)
+            try:
+                if os.fstat(fd).st_size < FILE_SIZE:
+                    self._initialize(fd, self._read_legacy(legacy_json_path))
+                self._map = mmap.mmap(fd, FILE_SIZE)
+            finally:
+                self._unlock(fd)
+        except Exception:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+        magic, version = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            raise ValueError(f"{self.path} is not a version {LAYOUT_VERSION} counter file")
+
+    def value(self):
+        """Current count, read from the mapping (aligned 8-byte read, no lock)"""
+        return COUNT.unpack_from(self._map, COUNT_OFFSET)[0]
+
+    def add(self, n=1):
+        """Atomically add n and return the new count"""
+        with self._thread_lock:
+            self._lock(self._fd)
+            try:
+                count = COUNT.unpack_from(self._map, COUNT_OFFSET)[0] + n
+                COUNT.pack_into(self._map, COUNT_OFFSET, count)
+                if self.durable:
+                    self._map.flush()
+            finally:
+                self._unlock(self._fd)
+        return count
+
+    def set(self, count):
+        """Overwrite the count"""
+        with self._thread_lock:
+            self._lock(self._fd)
+            try:
+                COUNT.pack_into(self._map, COUNT_OFFSET, count)
+                if self.durable:
+                    self._map.flush()
+            finally:
+                self._unlock(self._fd)
+        return count
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+    @staticmethod
+    def _lock(fd):
+        if fcntl is not None:
+            fcntl.lockf(fd, fcntl.LOCK_EX, COUNT.size, COUNT_OFFSET)
+
+    @staticmethod
+    def _unlock(fd):
+        if fcntl is not None:
+            fcntl.lockf(fd, fcntl.LOCK_UN, COUNT.size, COUNT_OFFSET)
+
+    @staticmethod
+    def _read_legacy(legacy_json_path):
+        if not legacy_json_path or not os.path.exists(legacy_json_path):
+            return 0
+        try:
+            with open(legacy_json_path, 'r') as f:
+                return int(json.load(f).get('count', 0))
+        except (ValueError, OSError, AttributeError):
+            return 0
+
+    @staticmethod
+    def _initialize(fd, count):
+        # Write the whole layout with one pwrite, then make it durable
+        os.pwrite(fd, HEADER.pack(MAGIC, LAYOUT_VERSION) + COUNT.pack(count), 0)
+        os.fsync(fd)
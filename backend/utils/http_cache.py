@@ -0,0 +1,214 @@
+"""
+HTTP validator helpers (ETag / Last-Modified / 304) for JSON endpoints,
+and byte-range responses for files
+"""
+
+import hashlib
+import secrets
+from datetime import datetime, timezone
+from flask import request, jsonify, send_file, Response
+from werkzeug.datastructures import ContentRange
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+
+
+def make_etag(*parts):
+    """Build a strong ETag value from the parts that identify a response"""
+    raw = '|'.join('' if part is None else str(part) for part in parts)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+
+def _as_utc(timestamp):
+    """TIMESTAMP columns come back naive; the database clock is UTC"""
+    if timestamp is None:
+        return None
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.replace(microsecond=0)
+
+
+def is_not_modified(etag, last_modified=None):
+    """
+    Check the request's validators against the current ones
+
+    If-None-Match wins when present; If-Modified-Since is only consulted
+    without it, as per RFC 9110.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+
+    last_modified = _as_utc(last_modified)
+    if last_modified and request.if_modified_since:
+        return last_modified <= request.if_modified_since
+
+    return False
+
+
+def conditional_json(payload, etag, last_modified=None):
+    """
+    Return payload as JSON with validators, or an empty 304 if the client's
+    copy is current (the payload is never serialized in that case)
+    """
+    if is_not_modified(etag, last_modified):
+        response = Response(status=304)
+    else:
+        response = jsonify(payload)
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _as_utc(last_modified)
+
+    # Let clients keep the body but always revalidate
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+# Byte ranges for files. send_file already handles If-None-Match, If-Range
+# and single ranges, but answers any multi-range request with a 416
+# (werkzeug's parser also rejects out-of-order or overlapping ranges).
+MAX_RANGES = 16  # more than this and the whole file is sent instead
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+def parse_byte_ranges(header):
+    """
+    Parse "bytes=0-99,200-,-50" into [(0, 100), (200, None), (-50, None)]
+    (end exclusive, negative begin for suffix ranges), in request order.
+    Returns None if the header isn't a valid bytes range.
+    """
+    units, _, specs = (header or '').partition('=')
+    if units.strip().lower() != 'bytes':
+        return None
+
+    ranges = []
+    for spec in specs.split(','):
+        first, dash, last = spec.strip().partition('-')
+        if not dash or not (first + last).isdigit():
+            return None
+        if not first:
+            if int(last) == 0:
+                return None
+            ranges.append((-int(last), None))
+        elif not last:
+            ranges.append((int(first), None))
+        elif int(first) <= int(last):
+            ranges.append((int(first), int(last) + 1))
+        else:
+            return None
+    return ranges
+
+
+def satisfiable_ranges(ranges, size):
+    """
+    (start, stop) spans of parsed ranges that fall inside the file,
+    sorted, with overlapping or adjacent spans merged
+    """
+    spans = []
+    for begin, end in ranges:
+        if begin < 0:
+            # Suffix range: the last -begin bytes
+            start, stop = max(size + begin, 0), size
+        else:
+            start, stop = begin, size if end is None else min(end, size)
+        if start < stop:
+            spans.append((start, stop))
+
+    merged = []
+    for start, stop in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def _if_range_matches(etag, last_modified):
+    """Whether a Range request may be answered partially (no If-Range, or it still matches)"""
+    if_range = request.if_range
+    if if_range.etag:
+        return if_range.etag == etag
+    if if_range.date:
+        return last_modified <= if_range.date
+    return 'If-Range' not in request.headers
+
+
+def _iter_spans(f, parts):
+    """Yield multipart delimiters (bytes) and file spans ((start, stop)) in order"""
+    for part in parts:
+        if isinstance(part, bytes):
+            yield part
+            continue
+
+        start, stop = part
+        f.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            chunk = f.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _partial_response(path, spans, size, mimetype):
+    """206 for one span, or multipart/byteranges for several"""
+    if len(spans) == 1:
+        (start, stop), = spans
+        parts = [(start, stop)]
+        content_type = mimetype
+        content_range = ContentRange('bytes', start, stop, size)
+        length = stop - start
+    else:
+        boundary = secrets.token_hex(16)
+        parts = []
+        length = 0
+        for start, stop in spans:
+            delimiter = (
+                ('\r\n' if parts else '') +
+                f"--{boundary}\r\n"
+                f"Content-Type: {mimetype}\r\n"
+                f"Content-Range: bytes {start}-{stop - 1}/{size}\r\n\r\n"
+            ).encode('latin-1')
+            parts += [delimiter, (start, stop)]
+            length += len(delimiter) + stop - start
+        closing = f"\r\n--{boundary}--\r\n".encode('latin-1')
+        parts.append(closing)
+        length += len(closing)
+        content_type = f'multipart/byteranges; boundary={boundary}'
+        content_range = None
+
+    f = open(path, 'rb')
+    response = Response(_iter_spans(f, parts), status=206, content_type=content_type)
+    response.call_on_close(f.close)
+    response.content_length = length
+    response.content_range = content_range
+    return response
+
+
+def send_ranged_file(path, st, etag, mimetype, cache_control):
+    """
+    Send a file (st is its os.stat result) with a strong ETag, answering
+    304s and single or multi-range requests
+    """
+    last_modified = datetime.fromtimestamp(int(st.st_mtime), timezone.utc)
+    ranges = parse_byte_ranges(request.headers.get('Range'))
+    multi_range = ranges is not None and len(ranges) > 1
+
+    if not multi_range:
+        response = send_file(path, mimetype=mimetype, etag=etag, last_modified=last_modified, conditional=True)
+    elif is_not_modified(etag, last_modified):
+        response = Response(status=304)
+    else:
+        spans = satisfiable_ranges(ranges, st.st_size)
+        if not spans:
+            raise RequestedRangeNotSatisfiable(length=st.st_size)
+
+        if _if_range_matches(etag, last_modified) and len(spans) <= MAX_RANGES:
+            response = _partial_response(path, spans, st.st_size, mimetype)
+        else:
+            response = send_file(path, mimetype=mimetype, conditional=False)
+
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.accept_ranges = 'bytes'
+    response.headers['Cache-Control'] = cache_control
+    return response
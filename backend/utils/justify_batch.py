@@ -0,0 +1,98 @@
+"""
+Helpers for bulk Stoic Validator evaluation (/api/justify/batch)
+"""
+
+import json
+import os
+import re
+import statistics
+from collections import OrderedDict
+
+from utils.justify_cache import justify_cache_key
+
+JUSTIFY_BATCH_MAX_PAIRS = int(os.environ.get('JUSTIFY_BATCH_MAX_PAIRS', 200))
+JUSTIFY_BATCH_CONCURRENCY = int(os.environ.get('JUSTIFY_BATCH_CONCURRENCY', 4))  # OpenAI calls in flight per batch
+
+# "72/100", "72 out of 100", then looser "Score: 72" forms
+_SCORE_OUT_OF_100 = re.compile(r'\b(\d{1,3})\s*(?:/|out of)\s*100\b', re.IGNORECASE)
+_SCORE_LABEL = re.compile(r'score\W{0,10}(?:of\s+)?(\d{1,3})\b', re.IGNORECASE)
+
+
+def parse_batch_pairs(data):
+    """
+    Validate a batch body: {"pairs": [{"user_prompt": ..., "model_response": ...}, ...]}
+    Returns a list of (user_prompt, model_response); raises ValueError
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('pairs'), list):
+        raise ValueError('Body must be {"pairs": [{"user_prompt": ..., "model_response": ...}, ...]}')
+
+    pairs = data['pairs']
+    if not pairs:
+        raise ValueError('No pairs given')
+    if len(pairs) > JUSTIFY_BATCH_MAX_PAIRS:
+        raise ValueError(f'Too many pairs (max {JUSTIFY_BATCH_MAX_PAIRS})')
+
+    parsed = []
+    for index, pair in enumerate(pairs):
+        if not isinstance(pair, dict) or not pair.get('user_prompt') or not pair.get('model_response'):
+            raise ValueError(f'Pair {index} is missing user_prompt or model_response')
+        parsed.append((pair['user_prompt'], pair['model_response']))
+    return parsed
+
+
+def group_pairs(pairs):
+    """
+    Dedupe identical pairs: cache key -> (user_prompt, model_response, [indices]),
+    in first-seen order
+    """
+    groups = OrderedDict()
+    for index, (user_prompt, model_response) in enumerate(pairs):
+        key = justify_cache_key(user_prompt, model_response)
+        if key not in groups:
+            groups[key] = (user_prompt, model_response, [])
+        groups[key][2].append(index)
+    return groups
+
+
+def parse_score(justification):
+    """Pull the 0-100 score out of a report, or None if it doesn't state one"""
+    if not justification:
+        return None
+    match = _SCORE_OUT_OF_100.search(justification) or _SCORE_LABEL.search(justification)
+    if match is None:
+        return None
+    score = int(match.group(1))
+    return score if 0 <= score <= 100 else None
+
+
+def summarize_batch(results, unique_pairs, elapsed_ms):
+    """Summary line for a finished batch; results are the per-pair result dicts"""
+    scores = [r['score'] for r in results if r.get('score') is not None]
+
+    histogram = OrderedDict((f'{low}-{low + 9 if low < 90 else 100}', 0) for low in range(0, 100, 10))
+    for score in scores:
+        low = min(score // 10, 9) * 10
+        histogram[f'{low}-{low + 9 if low < 90 else 100}'] += 1
+
+    return {
+        'summary': {
+            'pairs': len(results),
+            'unique_pairs': unique_pairs,
+            'cached': sum(1 for r in results if r.get('cached')),
+            'errors': sum(1 for r in results if 'error' in r),
+            'unscored': sum(1 for r in results if 'error' not in r and r.get('score') is None),
+            'scores': {
+                'count': len(scores),
+                'min': min(scores) if scores else None,
+                'max': max(scores) if scores else None,
+                'mean': round(statistics.mean(scores), 2) if scores else None,
+                'median': statistics.median(scores) if scores else None,
+                'histogram': histogram
+            },
+            'total_ms': round(elapsed_ms, 1)
+        }
+    }
+
+
+def ndjson_line(payload):
+    return json.dumps(payload) + '\n'
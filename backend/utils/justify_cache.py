@@ -0,0 +1,87 @@
+"""
+Two-level cache for Stoic Validator (/api/justify) reports
+An in-memory LRU in front of the justifications table (when DATABASE_URL
+is set); the table keeps reports across restarts and workers.
+"""
+
+import hashlib
+import json
+import os
+
+from utils.cache import TTLCache
+from utils.upstream import JUSTIFY_MODEL, JUSTIFY_SYSTEM_PROMPT
+
+JUSTIFY_CACHE_MAX_ENTRIES = int(os.environ.get('JUSTIFY_CACHE_MAX_ENTRIES', 1024))  # 0 disables the memory LRU
+JUSTIFY_CACHE_TTL = float(os.environ.get('JUSTIFY_CACHE_TTL', 86400))
+# Store reports in the database too (needs DATABASE_URL)
+JUSTIFY_CACHE_PERSIST = (
+    os.environ.get('DATABASE_URL') is not None
+    and os.environ.get('JUSTIFY_CACHE_PERSIST', 'true').lower() == 'true'
+)
+
+justify_cache = TTLCache(
+    max_entries=JUSTIFY_CACHE_MAX_ENTRIES,
+    ttl=JUSTIFY_CACHE_TTL,
+    max_bytes=int(os.environ.get('JUSTIFY_CACHE_MAX_BYTES', 4 * 1024 * 1024)),
+    sizeof=lambda justification: len(justification.encode('utf-8'))
+)
+
+
+def justify_cache_key(user_prompt, model_response, model=JUSTIFY_MODEL, system_prompt=JUSTIFY_SYSTEM_PROMPT):
+    """
+    Hash of everything that determines a report, so changing the judge
+    model or its prompt never serves an old report
+    """
+    canonical = json.dumps([system_prompt, user_prompt, model_response, model], ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def load_stored_justification(key):
+    """Look a report up in the database, filling the memory LRU on a hit"""
+    if not JUSTIFY_CACHE_PERSIST:
+        return None
+
+    from database.justifications import select_justification
+
+    try:
+        justification = select_justification(key)
+    except Exception as e:
+        print(f"Error reading stored justification: {e}")
+        return None
+
+    if justification is not None:
+        justify_cache.set(key, justification)
+    return justification
+
+
+def get_justification(key):
+    """Get a cached report (memory, then database), or None"""
+    justification = justify_cache.get(key)
+    if justification is not None:
+        return justification
+    return load_stored_justification(key)
+
+
+def save_justification(key, justification, model=JUSTIFY_MODEL):
+    """Remember a fresh report in memory and, if enabled, in the database"""
+    justify_cache.set(key, justification)
+    if not JUSTIFY_CACHE_PERSIST:
+        return
+
+    from database.justifications import insert_justification
+
+    try:
+        insert_justification(key, model, justification)
+    except Exception as e:
+        print(f"Error storing justification: {e}")
+
+
+def purge_justifications(model=None):
+    """Drop cached reports from memory and the database; returns rows deleted"""
+    justify_cache.clear()
+    if not JUSTIFY_CACHE_PERSIST:
+        return 0
+
+    from database.justifications import delete_justifications
+
+    return delete_justifications(model)
@@ -0,0 +1,108 @@
+"""
+Keyset pagination and field projection for the list endpoints
+Pages are fetched with WHERE (sort keys) < (cursor) instead of OFFSET, so
+every page costs the same index range scan however deep it is. The
+cursor is the sort key of the last row, base64url-encoded JSON.
+"""
+
+import base64
+import binascii
+import json
+import os
+from datetime import datetime
+
+LIST_PAGE_SIZE = int(os.environ.get('LIST_PAGE_SIZE', 50))      # default ?limit=
+LIST_MAX_PAGE_SIZE = int(os.environ.get('LIST_MAX_PAGE_SIZE', 200))
+
+
+def parse_limit(value):
+    """?limit= as an int in 1..LIST_MAX_PAGE_SIZE; raises ValueError"""
+    if value is None or value == '':
+        return LIST_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if not 1 <= limit <= LIST_MAX_PAGE_SIZE:
+        raise ValueError(f'limit must be between 1 and {LIST_MAX_PAGE_SIZE}')
+    return limit
+
+
+def parse_fields(value, allowed):
+    """
+    ?fields=a,b as a tuple in the order of allowed (all of them if not
+    given); raises ValueError on unknown fields
+    """
+    if not value:
+        return tuple(allowed)
+
+    requested = {field.strip() for field in value.split(',') if field.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))} (allowed: {', '.join(allowed)})")
+    return tuple(field for field in allowed if field in requested)
+
+
+def encode_cursor(values):
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+# Range of a Postgres integer column
+INTEGER_MIN, INTEGER_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+def _cursor_value(value, cast):
+    """One cursor value checked against its SQL cast; raises ValueError"""
+    if cast == 'integer':
+        # bool is an int subclass, but never a valid sort key
+        if isinstance(value, int) and not isinstance(value, bool) and INTEGER_MIN <= value <= INTEGER_MAX:
+            return value
+    elif cast == 'timestamp':
+        if isinstance(value, str):
+            return datetime.fromisoformat(value)
+    raise ValueError('Invalid cursor')
+
+
+def decode_cursor(cursor, casts):
+    """
+    Sort key values from a cursor, or None if there isn't one; each value
+    must fit its cast ('integer' or 'timestamp'). Raises ValueError.
+    """
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(casts):
+            raise ValueError('Invalid cursor')
+        return [_cursor_value(value, cast) for value, cast in zip(values, casts)]
+    except (binascii.Error, ValueError):
+        raise ValueError('Invalid cursor')
+
+
+def keyset_condition(columns, casts):
+    """
+    SQL for "row comes after the cursor" in a DESC ordering on columns,
+    e.g. (order_index, created_at, id) < (%s::integer, %s::timestamp, %s::integer)
+    """
+    placeholders = ', '.join(f'%s::{cast}' for cast in casts)
+    return f"({', '.join(columns)}) < ({placeholders})"
+
+
+def serialize_row(fields, values):
+    """Dict of the projected fields, with timestamps as ISO strings"""
+    return {
+        field: value.isoformat() if isinstance(value, datetime) else value
+        for field, value in zip(fields, values)
+    }
+
+
+def split_page(rows, limit, key_of):
+    """
+    Rows were fetched with LIMIT limit + 1; returns the page and the cursor
+    for the next one (None on the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(key_of(page[-1]))
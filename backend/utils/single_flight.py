@@ -0,0 +1,150 @@
+"""
+Single-flight coalescing of identical in-flight calls
+"""
+
+import asyncio
+import threading
+
+
+class SingleFlightTimeout(TimeoutError):
+    """Raised to a waiter whose in-flight call didn't finish in time"""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Lets concurrent callers with the same key share one execution
+
+    The first caller for a key becomes the leader and does the work; callers
+    arriving while it runs wait for its result (or its exception). Waiters
+    give up after wait_timeout seconds so one slow call can't pin every
+    worker thread.
+
+    Usage:
+        result = flight.do(key, fn)
+
+    or, when the leader produces its result incrementally (e.g. streaming):
+        call, is_leader = flight.begin(key)
+        if not is_leader:
+            return flight.wait(call)
+        ...
+        flight.finish(key, call, result=result)   # or error=exc
+    """
+
+    def __init__(self, wait_timeout=30.0):
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def begin(self, key):
+        """Join the in-flight call for key, or start one. Returns (call, is_leader)"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = _Call()
+            self._calls[key] = call
+            return call, True
+
+    def finish(self, key, call, result=None, error=None):
+        """Publish the leader's result (or error) to every waiter"""
+        if call.done.is_set():
+            return
+        call.result = result
+        call.error = error
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.done.set()
+
+    def wait(self, call):
+        """Wait for the leader; re-raises the leader's error"""
+        if not call.done.wait(self.wait_timeout):
+            raise SingleFlightTimeout(f"Timed out after {self.wait_timeout}s waiting for an identical request")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do(self, key, fn):
+        """Run fn() once for all concurrent callers with this key"""
+        call, is_leader = self.begin(key)
+        if not is_leader:
+            return self.wait(call)
+
+        try:
+            result = fn()
+        except Exception as e:
+            self.finish(key, call, error=e)
+            raise
+
+        self.finish(key, call, result=result)
+        return result
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of SingleFlight, for the ASGI path (one event loop)
+
+    Usage:
+        result = await flight.do(key, coroutine_fn)
+
+    or begin()/finish()/wait() as with SingleFlight.
+    """
+
+    def __init__(self, wait_timeout=30.0):
+        self.wait_timeout = wait_timeout
+        self._calls = {}
+
+    def begin(self, key):
+        """Join the in-flight call for key, or start one. Returns (future, is_leader)"""
+        future = self._calls.get(key)
+        if future is not None:
+            return future, False
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark errors as retrieved even if nobody ended up waiting
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = future
+        return future, True
+
+    def finish(self, key, future, result=None, error=None):
+        """Publish the leader's result (or error) to every waiter"""
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def wait(self, future):
+        """Wait for the leader; re-raises the leader's error"""
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.wait_timeout)
+        except asyncio.TimeoutError:
+            raise SingleFlightTimeout(f"Timed out after {self.wait_timeout}s waiting for an identical request")
+
+    async def do(self, key, coroutine_fn):
+        """Await coroutine_fn() once for all concurrent callers with this key"""
+        future, is_leader = self.begin(key)
+        if not is_leader:
+            return await self.wait(future)
+
+        try:
+            result = await coroutine_fn()
+        except asyncio.CancelledError:
+            self.finish(key, future, error=ConnectionError('Leader request was cancelled'))
+            raise
+        except Exception as e:
+            self.finish(key, future, error=e)
+            raise
+
+        self.finish(key, future, result=result)
+        return result
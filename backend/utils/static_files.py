@@ -0,0 +1,127 @@
+"""
+In-memory cache of small, hot static files
+Files at or under STATIC_CACHE_MAX_FILE_BYTES are read into memory once
+they've been requested STATIC_CACHE_MIN_HITS times and are then served
+from those bytes; each request only costs a stat() to check the entry is
+still current (entries are keyed by path, mtime and size). Larger or
+colder files are left to send_file, which streams them through the
+server's wsgi.file_wrapper (sendfile under gunicorn).
+"""
+
+import os
+import stat
+import threading
+import zlib
+from collections import Counter
+
+from utils.cache import TTLCache
+
+STATIC_CACHE_MAX_FILE_BYTES = int(os.environ.get('STATIC_CACHE_MAX_FILE_BYTES', 256 * 1024))
+STATIC_CACHE_MAX_BYTES = int(os.environ.get('STATIC_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+STATIC_CACHE_MAX_ENTRIES = int(os.environ.get('STATIC_CACHE_MAX_ENTRIES', 512))  # 0 disables the cache
+STATIC_CACHE_MIN_HITS = int(os.environ.get('STATIC_CACHE_MIN_HITS', 2))  # requests before a file is cached
+STATIC_CACHE_TTL = float(os.environ.get('STATIC_CACHE_TTL', 3600))
+
+
+class CachedFile:
+    __slots__ = ('body', 'mtime', 'size', 'etag')
+
+    def __init__(self, body, st, etag):
+        self.body = body
+        self.mtime = st.st_mtime
+        self.size = st.st_size
+        self.etag = etag
+
+
+def file_etag(path, st):
+    """Same form as werkzeug's send_file ETag, so both paths agree"""
+    check = zlib.adler32(path.encode()) & 0xFFFFFFFF
+    return f"{st.st_mtime}-{st.st_size}-{check}"
+
+
+class StaticFileCache:
+    """
+    Size-bounded LRU of file contents plus per-path request counts
+
+    Usage:
+        st, cached = static_cache.lookup(path)   # raises FileNotFoundError
+        if cached is None:
+            stream path
+        else:
+            send cached.body
+    """
+
+    def __init__(self, max_file_bytes=STATIC_CACHE_MAX_FILE_BYTES, max_bytes=STATIC_CACHE_MAX_BYTES,
+                 max_entries=STATIC_CACHE_MAX_ENTRIES, min_hits=STATIC_CACHE_MIN_HITS, ttl=STATIC_CACHE_TTL):
+        self.max_file_bytes = max_file_bytes
+        self.min_hits = min_hits
+        # An edited file gets a new key and the old entry ages out, so the
+        # TTL only bounds how long a cold file holds memory
+        self.files = TTLCache(
+            max_entries=max_entries,
+            ttl=ttl,
+            max_bytes=max_bytes,
+            sizeof=lambda f: f.size
+        )
+        self._requests = Counter()
+        self._lock = threading.Lock()
+        self.streamed = 0
+
+    def lookup(self, path):
+        """
+        stat path and return (stat_result, CachedFile or None); None means
+        the caller should stream it from disk. Raises FileNotFoundError for
+        anything that isn't a regular file.
+        """
+        st = os.stat(path)
+        if not stat.S_ISREG(st.st_mode):
+            raise FileNotFoundError(path)
+
+        with self._lock:
+            self._requests[path] += 1
+            requests = self._requests[path]
+
+        if st.st_size > self.max_file_bytes or self.files.max_entries <= 0:
+            self.streamed += 1
+            return st, None
+
+        key = (path, st.st_mtime_ns, st.st_size)
+        cached = self.files.get(key)
+        if cached is not None:
+            return st, cached
+
+        if requests < self.min_hits:
+            self.streamed += 1
+            return st, None
+
+        with open(path, 'rb') as f:
+            body = f.read()
+
+        # Changed between the stat and the read: let send_file deal with it
+        if len(body) != st.st_size:
+            self.streamed += 1
+            return st, None
+
+        cached = CachedFile(body, st, file_etag(path, st))
+        self.files.set(key, cached)
+        return st, cached
+
+    def clear(self):
+        self.files.clear()
+        with self._lock:
+            self._requests.clear()
+
+    def stats(self, top=20):
+        with self._lock:
+            hottest = self._requests.most_common(top)
+        stats = self.files.stats()
+        stats.update({
+            'max_file_bytes': self.max_file_bytes,
+            'min_hits': self.min_hits,
+            'streamed': self.streamed,
+            'hottest': [{'path': path, 'requests': count} for path, count in hottest]
+        })
+        return stats
+
+
+static_cache = StaticFileCache()
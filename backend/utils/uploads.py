@@ -0,0 +1,115 @@
+"""
+Streaming, content-addressed image uploads
+The multipart parser writes each uploaded file straight into a temp file
+that hashes (SHA-256) and counts it on the way in, so the size limit is
+enforced while the body is still being read.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from utils.cache import TTLCache
+
+
+class HashingUpload:
+    """
+    Temp file for one uploaded file; tracks its SHA-256 and size as chunks
+    are written and raises RequestEntityTooLarge once max_size is exceeded
+    """
+
+    def __init__(self, directory, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        fd, self.path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+        self._file = os.fdopen(fd, 'w+b')
+
+    def write(self, chunk):
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise RequestEntityTooLarge(f'File exceeds {self.max_size} bytes')
+        self._sha256.update(chunk)
+        return self._file.write(chunk)
+
+    # File-like methods the form parser / FileStorage use
+    def read(self, size=-1):
+        return self._file.read(size)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def hexdigest(self):
+        return self._sha256.hexdigest()
+
+    def store(self, path):
+        """
+        Move the upload to path, unless an identical blob is already there.
+        Returns True if it was written
+        """
+        self._file.close()
+        if os.path.exists(path):
+            return False
+        os.replace(self.path, path)
+        return True
+
+    def discard(self):
+        """Remove the temp file (no-op once stored)"""
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def hashing_stream_factory(directory, max_size, created):
+    """
+    stream_factory for werkzeug's form parser: every file part becomes a
+    HashingUpload in directory, appended to created so the caller can
+    clean them up
+    """
+    def factory(total_content_length, content_type, filename, content_length=None):
+        upload = HashingUpload(directory, max_size)
+        created.append(upload)
+        return upload
+
+    return factory
+
+
+SHA256_HEX = re.compile(r'[0-9a-f]{64}')
+
+# Hashes of files not named by their hash (pre-dedup uploads, derivatives)
+_file_hashes = TTLCache(max_entries=4096, ttl=86400)
+
+
+def content_etag(path, st):
+    """
+    Strong ETag for a stored file: its SHA-256, which is the file stem for
+    content-addressed uploads and otherwise hashed once per (mtime, size)
+    """
+    stem = os.path.basename(path).rsplit('.', 1)[0]
+    if SHA256_HEX.fullmatch(stem):
+        return stem
+
+    key = (path, st.st_mtime_ns, st.st_size)
+    digest = _file_hashes.get(key)
+    if digest is None:
+        sha256 = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha256.update(chunk)
+        digest = sha256.hexdigest()
+        _file_hashes.set(key, digest)
+    return digest
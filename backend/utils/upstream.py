@@ -0,0 +1,129 @@
+"""
+Pooled HTTP clients for the upstream model APIs
+requests and openai are imported when their client is first needed, so
+importing the server doesn't pay for them (openai alone is ~0.6s).
+"""
+
+import os
+import json
+import threading
+
+# Hugging Face endpoint client settings (override in .env)
+HF_CONNECT_TIMEOUT = float(os.environ.get('HF_CONNECT_TIMEOUT', 5))   # seconds
+HF_READ_TIMEOUT = float(os.environ.get('HF_READ_TIMEOUT', 120))       # seconds between bytes
+HF_POOL_SIZE = int(os.environ.get('HF_POOL_SIZE', 10))                # keep-alive connections
+
+# Stoic Validator (/api/justify) prompt, shared by the WSGI and ASGI paths
+JUSTIFY_MODEL = "gpt-4o"
+JUSTIFY_SYSTEM_PROMPT = "Your responsibility is to justify the output of a toy (845k param) model fitted on Meditations by Marcus Aurelius. Please read the user's prompt, the model's response, and give the model a score out of 100 of prediction given it's status as a toy model. Generate a short report of its accuracy, identifying potential semantic, linguistic, and Stoic-meaning based connections in the generation."
+
+_session = None
+_session_lock = threading.Lock()
+_openai_client = None
+_openai_lock = threading.Lock()
+
+
+def get_hf_session():
+    """Get the process-wide keep-alive session for the Hugging Face endpoint"""
+    global _session
+
+    if _session is not None:
+        return _session
+
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HF_POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+
+    return _session
+
+
+def get_openai_client():
+    """
+    Get the process-wide OpenAI client, whose keep-alive pool is shared by
+    every /api/justify call (raises without OPENAI_API_KEY)
+    """
+    global _openai_client
+
+    if _openai_client is not None:
+        return _openai_client
+
+    with _openai_lock:
+        if _openai_client is None:
+            from openai import OpenAI
+
+            _openai_client = OpenAI()
+
+    return _openai_client
+
+
+def post_to_hf(api_url, api_token, body, stream=False):
+    """
+    POST a raw JSON body to the Hugging Face endpoint over the pooled session
+
+    With stream=True the response body is left unread so it can be relayed
+    chunk by chunk; the caller must close the response.
+    """
+    headers = {
+        "Authorization": f"Bearer {api_token}",
+        "Content-Type": "application/json"
+    }
+
+    return get_hf_session().post(
+        api_url,
+        headers=headers,
+        data=body,
+        stream=stream,
+        timeout=(HF_CONNECT_TIMEOUT, HF_READ_TIMEOUT)
+    )
+
+
+def build_justify_messages(user_prompt, model_response):
+    """Chat messages asking the judge model to score a generation"""
+    text = f"User prompt: {user_prompt}\n\nModel response: {model_response}"
+    return [
+        {"role": "system", "content": JUSTIFY_SYSTEM_PROMPT},
+        {"role": "user", "content": text}
+    ]
+
+
+def sse_event(data, event=None):
+    """Format one Server-Sent Event with a JSON payload"""
+    message = f"data: {json.dumps(data)}\n\n"
+    if event:
+        message = f"event: {event}\n" + message
+    return message
+
+
+def tee_chunks(chunks, on_complete, on_abort=None):
+    """
+    Pass chunks through while collecting them; call on_complete(body) once
+    the stream finishes, or on_abort(exc) if it fails or the client leaves
+    """
+    collected = []
+    try:
+        for chunk in chunks:
+            collected.append(chunk)
+            yield chunk
+    except BaseException as e:
+        if on_abort is not None:
+            on_abort(e)
+        raise
+
+    on_complete(b''.join(collected))
+
+
+def relay_chunks(response):
+    """Yield upstream body chunks as they arrive, closing the response when done"""
+    try:
+        for chunk in response.iter_content(chunk_size=None):
+            if chunk:
+                yield chunk
+    finally:
+        response.close()
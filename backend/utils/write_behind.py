@@ -0,0 +1,141 @@
+"""
+Write-behind counter: batches increments in memory and flushes them as one write
+"""
+
+import os
+import atexit
+import threading
+import time
+
+
+class WriteBehindCounter:
+    """
+    Per-process counter that accumulates increments and persists them in batches
+
+    Args:
+        flush: callable(n) that adds n to the stored count and returns the new total
+        read: callable() that returns the stored total
+        flush_interval_ms: flush at least this often while increments are pending
+        max_pending: flush early once this many increments are pending
+
+    Increments that haven't been flushed are lost if the process dies, so the
+    loss window is bounded by flush_interval_ms and max_pending. A failed
+    flush keeps its increments pending for the next attempt.
+    """
+
+    def __init__(self, flush, read, flush_interval_ms=1000, max_pending=100):
+        self._flush = flush
+        self._read = read
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_pending = max_pending
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = 0
+        self._base = None          # last total seen in storage
+        self._base_read_at = 0.0
+        self._thread = None
+        self._pid = None
+        self._stopped = False
+
+        self.flushes = 0
+        self.flush_errors = 0
+
+        atexit.register(self.stop)
+
+    def increment(self, n=1):
+        """Record n hits and return the approximate live count"""
+        self._ensure_started()
+
+        with self._lock:
+            self._pending += n
+            pending = self._pending
+
+        if pending >= self.max_pending:
+            self._wake.set()
+
+        return self.value()
+
+    def value(self):
+        """Approximate live count: last stored total plus this process's pending hits"""
+        if self._base is None or time.monotonic() - self._base_read_at >= self.flush_interval:
+            self._refresh_base()
+
+        with self._lock:
+            return (self._base or 0) + self._pending
+
+    def set_base(self, total):
+        """Record a total written directly to storage (e.g. an admin reset)"""
+        with self._lock:
+            self._base = total
+            self._base_read_at = time.monotonic()
+
+    def flush(self):
+        """Persist pending increments in a single write"""
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = 0
+
+            if not pending:
+                return
+
+            try:
+                total = self._flush(pending)
+            except Exception as e:
+                with self._lock:
+                    self._pending += pending
+                self.flush_errors += 1
+                print(f"Error flushing visitor count: {e}")
+                return
+
+            self.flushes += 1
+            # The returned total already includes this process's flushed hits
+            self.set_base(total)
+
+    def stop(self):
+        """Stop the background thread and flush whatever is pending"""
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            pending = self._pending
+        return {
+            'pending': pending,
+            'flushes': self.flushes,
+            'flush_errors': self.flush_errors,
+            'flush_interval_ms': int(self.flush_interval * 1000),
+            'max_pending': self.max_pending
+        }
+
+    def _refresh_base(self):
+        try:
+            self.set_base(self._read())
+        except Exception as e:
+            print(f"Error reading visitor count: {e}")
+
+    def _ensure_started(self):
+        # Started lazily (and restarted after fork) so each worker has its own flusher
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            if self._pid != os.getpid():
+                # Pending hits copied from the parent belong to the parent
+                self._pending = 0
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='write-behind-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
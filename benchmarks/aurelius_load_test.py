@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+AureliusGPT Load Test
+Fires many concurrent /api/aurelius chats at the app against a fake,
+deliberately slow Hugging Face endpoint, and compares the async path
+(asgi:app) with every request going through the Flask worker threads
+(asgi:flask_asgi). /api/health is probed during the run to show whether
+slow generations starve the other routes.
+
+Usage:
+    python benchmarks/aurelius_load_test.py [--concurrency 200] [--requests 1000] [--delay 1.0]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def fake_upstream(reader, writer, delay):
+    """Minimal keep-alive HTTP/1.1 endpoint that answers every POST after `delay` seconds"""
+    try:
+        while True:
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = 0
+            for line in head.split(b'\r\n'):
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            body = await reader.readexactly(length)
+            await asyncio.sleep(delay)
+
+            prompt = json.loads(body or b'{}').get('inputs', '')
+            out = json.dumps([{'generated_text': f'Aurelius: {prompt}'}]).encode()
+            writer.write(
+                b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                + f'Content-Length: {len(out)}\r\n\r\n'.encode() + out
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def request(port, method, path, payload=None):
+    """
+    One HTTP/1.1 request on a fresh connection; returns the status code.
+    (A raw client, so the load generator isn't the bottleneck at high concurrency.)
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        body = json.dumps(payload).encode() if payload is not None else b''
+        writer.write(
+            f'{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n'
+            f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n'.encode() + body
+        )
+        await writer.drain()
+        response = await reader.read()
+        return int(response.split(b' ', 2)[1])
+    finally:
+        writer.close()
+
+
+async def wait_until_up(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if await request(port, 'GET', '/api/health') == 200:
+                return
+        except (OSError, IndexError, ValueError):
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+async def run_load(port, concurrency, total):
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    latencies = []
+    errors = 0
+    health = []
+    running = True
+
+    async def chat_worker():
+        nonlocal errors
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            status = await request(port, 'POST', '/api/aurelius', {
+                'inputs': f'What is virtue? #{i}',
+                'parameters': {'max_new_tokens': 50}
+            })
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    async def health_probe():
+        while running:
+            start = time.perf_counter()
+            await request(port, 'GET', '/api/health')
+            health.append(time.perf_counter() - start)
+            await asyncio.sleep(0.1)
+
+    probe = asyncio.ensure_future(health_probe())
+    began = time.perf_counter()
+    await asyncio.gather(*(chat_worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - began
+    running = False
+    await probe
+
+    return elapsed, latencies, errors, health
+
+
+def percentile(values, pct):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def benchmark(target, upstream_url, args):
+    port = free_port()
+    env = dict(
+        os.environ,
+        HF_API_URL=upstream_url,
+        HF_API_TOKEN='load-test',
+        AURELIUS_CACHE_MAX_ENTRIES='0',
+        UPSTREAM_COALESCE='false',
+        WSGI_THREADS=str(args.wsgi_threads)
+    )
+    env.pop('DATABASE_URL', None)
+
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', target, '--port', str(port), '--log-level', 'warning', '--no-access-log'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL
+    )
+    try:
+        await wait_until_up(port)
+        elapsed, latencies, errors, health = await run_load(port, args.concurrency, args.requests)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"  {target:<16} {len(latencies) / elapsed:>8.1f} chats/s   "
+          f"p50 {percentile(latencies, 50):6.2f}s  p95 {percentile(latencies, 95):6.2f}s   "
+          f"errors {errors:>4}   /api/health p95 {percentile(health, 95) * 1000:8.1f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--delay', type=float, default=1.0, help='fake upstream latency (seconds)')
+    parser.add_argument('--wsgi-threads', type=int, default=16)
+    args = parser.parse_args()
+
+    upstream = await asyncio.start_server(
+        lambda r, w: fake_upstream(r, w, args.delay), '127.0.0.1', 0, backlog=4096
+    )
+    upstream_url = f'http://127.0.0.1:{upstream.sockets[0].getsockname()[1]}/'
+
+    print(f"{args.requests} chats, {args.concurrency} concurrent, upstream latency {args.delay}s, "
+          f"{args.wsgi_threads} WSGI threads\n")
+
+    async with upstream:
+        await benchmark('asgi:flask_asgi', upstream_url, args)
+        await benchmark('asgi:app', upstream_url, args)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Bulk Import Benchmark
+Loads N synthetic episodes and projects the old way (one INSERT per row,
+as create_episode/create_project and migrate_data.py did) and through the
+COPY import, then re-imports the same data (which should write nothing)
+and times a full export. Everything runs in one transaction that is rolled
+back, so it's safe against a development database.
+
+Usage:
+    DATABASE_URL=... python benchmarks/bulk_import_bench.py [--rows 10000]
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from database.pool import get_db_connection
+from database.migrations import migrate
+from database.bulk import BULK_TABLES, export_ndjson, import_stream
+
+
+def synthetic_rows(rows):
+    episodes = [{
+        'title': f'Bench episode {n}', 'description': 'Description', 'youtube_url': 'https://youtu.be/x',
+        'slug': f'bench-import-episode-{n}', 'notes': 'notes ' * 50, 'order_index': n % 100, 'published': True
+    } for n in range(rows)]
+    projects = [{
+        'type': 'project', 'company': f'Company {n}', 'role': 'Role', 'period': '2024', 'description': 'Description',
+        'details': 'details ' * 50, 'tags': ['a', 'b'], 'slug': f'bench-import-project-{n}', 'published': True
+    } for n in range(rows)]
+    return episodes, projects
+
+
+def row_by_row(cur, episodes, projects):
+    for episode in episodes:
+        cur.execute('SELECT id FROM podcast_episodes WHERE slug = %s', (episode['slug'],))
+        if cur.fetchone():
+            continue
+        cur.execute('''
+            INSERT INTO podcast_episodes (title, description, youtube_url, slug, notes, order_index, published)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ''', tuple(episode[c] for c in ('title', 'description', 'youtube_url', 'slug', 'notes', 'order_index', 'published')))
+    for project in projects:
+        cur.execute('SELECT id FROM projects WHERE slug = %s', (project['slug'],))
+        if cur.fetchone():
+            continue
+        cur.execute('''
+            INSERT INTO projects (type, company, role, period, description, details, tags, slug, published)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ''', tuple(project[c] for c in ('type', 'company', 'role', 'period', 'description', 'details', 'tags', 'slug', 'published')))
+
+
+def timed(label, fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    print(f"  {label:<28} {(time.perf_counter() - started) * 1000:9.1f}ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000, help='synthetic episodes and projects each')
+    args = parser.parse_args()
+
+    migrate()
+    episodes, projects = synthetic_rows(args.rows)
+    ndjson = ''.join(
+        json.dumps({'table': name, 'row': row}) + '\n'
+        for name, rows in (('podcasts', episodes), ('projects', projects)) for row in rows
+    ).encode('utf-8')
+
+    print(f"{args.rows} episodes + {args.rows} projects ({len(ndjson) / 1e6:.1f}MB of NDJSON)\n")
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute('SAVEPOINT bench')
+                timed('row by row', row_by_row, cur, episodes, projects)
+                cur.execute('ROLLBACK TO SAVEPOINT bench')
+
+                counts = timed('COPY import', import_stream, cur, 'ndjson', io.BytesIO(ndjson))
+                print(f"    {counts}")
+                counts = timed('COPY re-import (no-op)', import_stream, cur, 'ndjson', io.BytesIO(ndjson))
+                print(f"    {counts}")
+
+                exported = timed('export (all tables)', lambda: b''.join(
+                    chunk for name in BULK_TABLES for chunk in export_ndjson(cur, name)
+                ))
+                print(f"    {len(exported) / 1e6:.1f}MB")
+            finally:
+                conn.rollback()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Listing Query Plans
+Prints EXPLAIN ANALYZE for the list and slug queries the API runs, first
+without the indexes from migration 2 ("before") and then with them
+("after"). Everything runs in one transaction that is rolled back: the
+synthetic rows, the dropped indexes and the ANALYZE all disappear.
+
+Point it at a development database: dropping an index holds an exclusive
+lock on its table until the rollback. Use a freshly created (or vacuumed)
+one for numbers worth comparing: the rolled-back rows of earlier runs stay
+behind as dead tuples and inflate the "before" buffer counts.
+
+Usage:
+    DATABASE_URL=... python benchmarks/explain_listing_queries.py [--rows 20000] [--output plans.txt]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from database.pool import get_db_connection
+from database.migrations import migrate
+
+# Created by migration 2 (_listing_indexes)
+LISTING_INDEXES = [
+    'idx_podcast_episodes_published_keyset', 'idx_podcast_episodes_keyset',
+    'idx_projects_published_keyset', 'idx_projects_keyset', 'idx_projects_type_keyset',
+    'idx_images_keyset', 'idx_podcast_episodes_created_at', 'idx_projects_created_at'
+]
+
+# (label, SQL, params) - the shapes the routes build for a 50-row page
+QUERIES = [
+    ('episodes, public, first page', '''
+        SELECT id, title, description, youtube_url, slug, notes, order_index, published, created_at,
+               order_index, created_at, id, updated_at
+        FROM podcast_episodes WHERE TRUE AND published = TRUE
+        ORDER BY order_index DESC, created_at DESC, id DESC LIMIT 51
+    ''', ()),
+    ('episodes, public, deep page', '''
+        SELECT id, title, slug, order_index, created_at, id, updated_at
+        FROM podcast_episodes WHERE TRUE AND published = TRUE
+        AND (order_index, created_at, id) < (%s::integer, now()::timestamp, %s::integer)
+        ORDER BY order_index DESC, created_at DESC, id DESC LIMIT 51
+    ''', (10, 1000000)),
+    ('episodes, admin, first page', '''
+        SELECT id, title, slug, order_index, created_at, id, updated_at
+        FROM podcast_episodes WHERE TRUE
+        ORDER BY order_index DESC, created_at DESC, id DESC LIMIT 51
+    ''', ()),
+    ('episode by slug', 'SELECT id, title FROM podcast_episodes WHERE slug = %s', ('bench-episode-500',)),
+    ('projects, public, first page', '''
+        SELECT id, type, company, role, order_index, created_at, id, updated_at
+        FROM projects WHERE TRUE AND published = TRUE
+        ORDER BY order_index DESC, created_at DESC, id DESC LIMIT 51
+    ''', ()),
+    ('projects, by type', '''
+        SELECT id, type, company, role, order_index, created_at, id, updated_at
+        FROM projects WHERE TRUE AND type = %s
+        ORDER BY order_index DESC, created_at DESC, id DESC LIMIT 51
+    ''', ('internship',)),
+    ('project by slug', 'SELECT id, company FROM projects WHERE slug = %s', ('bench-project-500',)),
+    ('images, first page', '''
+        SELECT id, filename, url, uploaded_at, id FROM images
+        ORDER BY uploaded_at DESC, id DESC LIMIT 51
+    ''', ()),
+    ('dashboard, recent episodes', 'SELECT title, created_at FROM podcast_episodes ORDER BY created_at DESC LIMIT 5', ()),
+]
+
+
+def seed(cur, rows):
+    """Synthetic rows so the planner has a reason to use an index"""
+    cur.execute('''
+        INSERT INTO podcast_episodes (title, description, youtube_url, slug, notes, order_index, published)
+        SELECT 'Episode ' || n, 'Description', 'https://youtu.be/x', 'bench-episode-' || n,
+               repeat('notes ', 200), n %% 100, n %% 10 <> 0
+        FROM generate_series(1, %s) AS n
+    ''', (rows,))
+    cur.execute('''
+        INSERT INTO projects (type, company, role, period, description, details, tags, slug, order_index, published)
+        SELECT CASE WHEN n %% 3 = 0 THEN 'internship' ELSE 'project' END, 'Company ' || n, 'Role', '2024',
+               'Description', repeat('details ', 200), ARRAY['tag'], 'bench-project-' || n, n %% 100, n %% 10 <> 0
+        FROM generate_series(1, %s) AS n
+    ''', (rows,))
+    cur.execute('''
+        INSERT INTO images (filename, original_name, url, alt_text, uploaded_at)
+        SELECT 'bench-' || n || '.png', 'bench.png', '/uploads/bench-' || n || '.png', NULL,
+               now() - n * interval '1 minute'
+        FROM generate_series(1, %s) AS n
+    ''', (rows,))
+    cur.execute('ANALYZE podcast_episodes, projects, images')
+
+
+def explain_all(cur):
+    sections = []
+    for label, sql, params in QUERIES:
+        cur.execute('EXPLAIN (ANALYZE, BUFFERS, COSTS OFF, TIMING OFF, SUMMARY ON) ' + sql, params)
+        plan = '\n'.join('    ' + row[0] for row in cur.fetchall())
+        sections.append(f"-- {label}\n{plan}")
+    return '\n\n'.join(sections)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000, help='synthetic rows per table')
+    parser.add_argument('--output', help='also write the plans to this file')
+    args = parser.parse_args()
+
+    migrate()
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            try:
+                seed(cur, args.rows)
+
+                cur.execute('SAVEPOINT before_indexes')
+                for index in LISTING_INDEXES:
+                    cur.execute(f'DROP INDEX IF EXISTS {index}')
+                before = explain_all(cur)
+                cur.execute('ROLLBACK TO SAVEPOINT before_indexes')
+
+                after = explain_all(cur)
+            finally:
+                conn.rollback()
+
+    report = (
+        f"{args.rows} synthetic rows per table\n\n"
+        f"==================== BEFORE (no listing indexes) ====================\n\n{before}\n\n"
+        f"==================== AFTER (migration 2) ====================\n\n{after}\n"
+    )
+    print(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report)
+        print(f"✓ Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
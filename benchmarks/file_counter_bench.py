@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+File Counter Benchmark
+Hammers the no-database visitor counter from many processes at once and
+checks that no increments are lost, comparing the memory-mapped
+FileCounter against the old read-json/write-json approach.
+
+Usage:
+    python benchmarks/file_counter_bench.py [--processes 16] [--increments 2000]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from utils.file_counter import FileCounter
+
+
+def json_worker(path, increments, start):
+    """The old server.py logic: read, parse, +1, rewrite, no locking"""
+    start.wait()
+    for _ in range(increments):
+        try:
+            with open(path, 'r') as f:
+                count = json.load(f).get('count', 0)
+        except (ValueError, OSError):
+            count = 0
+        with open(path, 'w') as f:
+            json.dump({'count': count + 1}, f)
+
+
+def mmap_worker(path, increments, start):
+    counter = FileCounter(path)
+    start.wait()
+    for _ in range(increments):
+        counter.add(1)
+    counter.close()
+
+
+def run(worker, path, processes, increments):
+    start = multiprocessing.Event()
+    procs = [
+        multiprocessing.Process(target=worker, args=(path, increments, start))
+        for _ in range(processes)
+    ]
+    for proc in procs:
+        proc.start()
+
+    began = time.perf_counter()
+    start.set()
+    for proc in procs:
+        proc.join()
+    elapsed = time.perf_counter() - began
+
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--processes', type=int, default=16)
+    parser.add_argument('--increments', type=int, default=2000)
+    args = parser.parse_args()
+
+    expected = args.processes * args.increments
+    print(f"{args.processes} processes x {args.increments} increments = {expected} expected\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'visitor_count.json')
+        with open(json_path, 'w') as f:
+            json.dump({'count': 0}, f)
+        elapsed = run(json_worker, json_path, args.processes, args.increments)
+        try:
+            with open(json_path) as f:
+                json_total = json.load(f).get('count', 0)
+        except ValueError:
+            json_total = 0
+        print(f"  json file : {json_total:>8} counted, {expected - json_total:>8} lost, "
+              f"{expected / elapsed:>10,.0f} increments/s")
+
+        mmap_path = os.path.join(tmp, 'visitor_count.bin')
+        FileCounter(mmap_path).close()
+        elapsed = run(mmap_worker, mmap_path, args.processes, args.increments)
+        counter = FileCounter(mmap_path)
+        mmap_total = counter.value()
+
+        read_start = time.perf_counter()
+        for _ in range(100000):
+            counter.value()
+        read_elapsed = time.perf_counter() - read_start
+        counter.close()
+
+        print(f"  mmap file : {mmap_total:>8} counted, {expected - mmap_total:>8} lost, "
+              f"{expected / elapsed:>10,.0f} increments/s")
+        print(f"  mmap reads: {100000 / read_elapsed:,.0f} reads/s")
+
+    if mmap_total != expected:
+        print("\n✗ FileCounter lost increments")
+        return 1
+
+    print("\n✓ FileCounter kept every increment")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Cold-start cost of the app: how long `import server` takes (from
+python -X importtime, with the slowest modules), which heavy packages get
+imported along with it, and the time from launching `python server.py`
+to the first 200 from /api/health and from /. Each figure is the median
+of --runs fresh processes.
+
+Exits 1 if a heavy package is imported at startup or the import takes
+longer than --max-import-ms, so it can guard against regressions in CI.
+
+Usage:
+    python benchmarks/startup_bench.py [--runs 5] [--max-import-ms 1000] [--skip-serve]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed by a few routes; importing any of them with the app is a regression
+HEAVY_MODULES = ('openai', 'PIL', 'psycopg', 'psycopg_pool', 'requests')
+
+
+def import_times():
+    """(total ms for server, {module: cumulative ms}) from one -X importtime run"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import server'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative) / 1000
+    return modules.get('server', 0.0), modules
+
+
+def loaded_heavy_modules():
+    script = f"import json, sys, server; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_200(url, deadline):
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f'No 200 from {url}')
+
+
+def time_to_first_200(paths, timeout=60):
+    """Seconds from spawning `python server.py` to a 200 on each path, in order"""
+    port = free_port()
+    env = dict(os.environ, PORT=str(port))
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, 'server.py'], cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        times = []
+        for path in paths:
+            wait_for_200(f'http://127.0.0.1:{port}{path}', started + timeout)
+            times.append(time.perf_counter() - started)
+        return times
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-import-ms', type=float, default=1000)
+    parser.add_argument('--top', type=int, default=10, help='slowest modules to list')
+    parser.add_argument('--skip-serve', action='store_true', help='only measure the import')
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    import_ms = statistics.median(total for total, _ in runs)
+    print(f"import server: {import_ms:.0f}ms (median of {args.runs})")
+
+    modules = runs[-1][1]
+    print("\nSlowest imports (cumulative, last run):")
+    for name, ms in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {ms:8.1f}ms  {name}")
+
+    if not args.skip_serve:
+        paths = ['/api/health', '/']
+        samples = [time_to_first_200(paths) for _ in range(args.runs)]
+        print()
+        for i, path in enumerate(paths):
+            print(f"first 200 from {path}: {statistics.median(s[i] for s in samples) * 1000:.0f}ms")
+
+    failures = []
+    heavy = loaded_heavy_modules()
+    if heavy:
+        failures.append(f"heavy modules imported at startup: {', '.join(heavy)}")
+    if import_ms > args.max_import_ms:
+        failures.append(f"import took {import_ms:.0f}ms (limit {args.max_import_ms:.0f}ms)")
+
+    print()
+    for failure in failures:
+        print(f"✗ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✓ Startup within budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Static File Benchmark
+Requests/sec for site files through the old serve_static logic (exists +
+isfile + send_from_directory on every request) and through the in-memory
+hot file cache, calling the WSGI app in-process so only the handler cost
+is measured.
+
+Usage:
+    python benchmarks/static_files_bench.py [--requests 5000] [--files favicon.png styles.css logo.jpg]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from flask import send_from_directory
+from werkzeug.test import create_environ, run_wsgi_app
+
+import server
+
+
+def old_serve_static(path):
+    """serve_static as it was before the hot file cache"""
+    if os.path.exists(path) and os.path.isfile(path):
+        return send_from_directory('.', path)
+    return server.send_index('/' + path.strip('/'))
+
+
+server.app.add_url_rule('/__before/<path:path>', 'bench_old_serve_static', old_serve_static)
+
+
+def bench(url, requests):
+    environ = create_environ(url, headers={'Accept-Encoding': 'identity'})
+    size = 0
+
+    began = time.perf_counter()
+    for _ in range(requests):
+        app_iter, status, headers = run_wsgi_app(server.app, dict(environ))
+        try:
+            for chunk in app_iter:
+                size += len(chunk)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+    elapsed = time.perf_counter() - began
+
+    assert status.startswith('200'), f"{url}: {status}"
+    return requests / elapsed, size // requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--files', nargs='+', default=['favicon.png', 'styles.css', 'logo.jpg'])
+    args = parser.parse_args()
+
+    print(f"{'file':<24} {'bytes':>9} {'before req/s':>13} {'after req/s':>12} {'speedup':>8}")
+    for path in args.files:
+        before, size = bench(f'/__before/{path}', args.requests)
+        after, _ = bench(f'/{path}', args.requests)
+        print(f"{path:<24} {size:>9} {before:>13.0f} {after:>12.0f} {after / before:>7.2f}x")
+
+    stats = server.static_cache.stats()
+    print(f"\nCache: {stats['entries']} files, {stats['bytes']} bytes, "
+          f"hit ratio {stats['hit_ratio']}, {stats['streamed']} streamed from disk")
+
+
+if __name__ == '__main__':
+    main()
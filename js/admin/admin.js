@@ -33,6 +33,19 @@ async function apiCall(endpoint, method = 'GET', body = null, isFormData = false
     return data;
 }
 
+// Fetch every page of a keyset-paginated list, e.g. apiCallAll('/api/images', 'images')
+async function apiCallAll(endpoint, key) {
+    const items = [];
+    let cursor = null;
+    do {
+        const separator = endpoint.includes('?') ? '&' : '?';
+        const page = await apiCall(cursor ? `${endpoint}${separator}cursor=${encodeURIComponent(cursor)}` : endpoint);
+        items.push(...page[key]);
+        cursor = page.next_cursor;
+    } while (cursor);
+    return { [key]: items };
+}
+
 // Authentication
 document.getElementById('authForm')?.addEventListener('submit', async (e) => {
     e.preventDefault();
@@ -137,7 +150,7 @@ async function loadDashboard() {
 // Podcasts
 async function loadPodcasts() {
     try {
-        const data = await apiCall('/api/podcast/episodes?published_only=false');
+        const data = await apiCallAll('/api/podcast/episodes?published_only=false', 'episodes');
         
         if (data.episodes.length === 0) {
             document.getElementById('podcastTableContent').innerHTML = `
@@ -274,7 +287,7 @@ document.getElementById('podcastForm')?.addEventListener('submit', async (e) =>
 // Projects
 async function loadProjects() {
     try {
-        const data = await apiCall('/api/projects?published_only=false');
+        const data = await apiCallAll('/api/projects?published_only=false', 'projects');
         
         if (data.projects.length === 0) {
             document.getElementById('projectTableContent').innerHTML = `
@@ -424,7 +437,7 @@ document.getElementById('projectForm')?.addEventListener('submit', async (e) =>
 // Images
 async function loadImages() {
     try {
-        const data = await apiCall('/api/images');
+        const data = await apiCallAll('/api/images', 'images');
         
         if (data.images.length === 0) {
             document.getElementById('imageTableContent').innerHTML = `
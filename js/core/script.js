@@ -1837,9 +1837,9 @@ async function sendAureliusMessageWithText(messageText, skipUserMessage = false)
         const validatorEnabled = document.getElementById('stoic-validator-toggle').checked;
         
         if (validatorEnabled) {
-            // Call justification API
+            // Stream the justification, rendering tokens as they arrive
             try {
-                const justificationResponse = await fetch("/api/justify", {
+                const justificationResponse = await fetch("/api/justify/stream", {
                     method: "POST",
                     headers: { 
                         "Content-Type": "application/json" 
@@ -1851,25 +1851,29 @@ async function sendAureliusMessageWithText(messageText, skipUserMessage = false)
                 });
                 
                 if (justificationResponse.ok) {
-                    const justData = await justificationResponse.json();
-                    const justification = justData.justification;
+                    let markdownEl = null;
                     
-                    // Parse markdown to HTML
-                    const markdownHTML = marked.parse(justification);
-                    
-                    // Add justification message
-                    const justificationEl = document.createElement('div');
-                    justificationEl.className = 'aurelius-message justification-message';
-                    justificationEl.innerHTML = `
-                        <div class="message-content">
-                            <div class="message-text">
-                                <span class="justification-prefix">> JUSTIFICATION: </span>
-                                <div class="markdown-content">${markdownHTML}</div>
-                            </div>
-                        </div>
-                    `;
-                    messagesContainer.appendChild(justificationEl);
-                    messagesContainer.scrollTop = messagesContainer.scrollHeight;
+                    await readJustificationStream(justificationResponse, (justification) => {
+                        if (!markdownEl) {
+                            // Add justification message on the first token
+                            const justificationEl = document.createElement('div');
+                            justificationEl.className = 'aurelius-message justification-message';
+                            justificationEl.innerHTML = `
+                                <div class="message-content">
+                                    <div class="message-text">
+                                        <span class="justification-prefix">> JUSTIFICATION: </span>
+                                        <div class="markdown-content"></div>
+                                    </div>
+                                </div>
+                            `;
+                            messagesContainer.appendChild(justificationEl);
+                            markdownEl = justificationEl.querySelector('.markdown-content');
+                        }
+                        
+                        // Parse markdown to HTML
+                        markdownEl.innerHTML = marked.parse(justification);
+                        messagesContainer.scrollTop = messagesContainer.scrollHeight;
+                    });
                 }
             } catch (error) {
                 console.error('Justification Error:', error);
@@ -1935,6 +1939,64 @@ function escapeHtml(text) {
     return div.innerHTML;
 }
 
+// Read a /api/justify/stream response (Server-Sent Events), calling
+// onUpdate with the text so far at most once per frame; resolves to the full text
+async function readJustificationStream(response, onUpdate) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let text = '';
+    let renderPending = false;
+    
+    const render = () => {
+        if (renderPending) return;
+        renderPending = true;
+        requestAnimationFrame(() => {
+            renderPending = false;
+            onUpdate(text);
+        });
+    };
+    
+    try {
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
+            
+            for (const rawEvent of events) {
+                let eventType = 'message';
+                let data = '';
+                for (const line of rawEvent.split('\n')) {
+                    if (line.startsWith('event:')) eventType = line.slice(6).trim();
+                    else if (line.startsWith('data:')) data += line.slice(5).trim();
+                }
+                if (!data) continue;
+                
+                const payload = JSON.parse(data);
+                if (eventType === 'error') {
+                    throw new Error(payload.error || 'Justification stream failed');
+                }
+                if (payload.delta) {
+                    text += payload.delta;
+                    render();
+                }
+                if (payload.done) {
+                    return text;
+                }
+            }
+        }
+    } finally {
+        // Render whatever arrived, even if the stream broke off
+        if (text) onUpdate(text);
+        reader.releaseLock();
+    }
+    
+    return text;
+}
+
 // Typewriter effect
 async function typewriterEffect(text, element, speed = 30) {
     element.textContent = '';
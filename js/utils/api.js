@@ -6,21 +6,88 @@
 class API {
     constructor(baseURL = '') {
         this.baseURL = baseURL;
+        // endpoint -> { etag, lastModified, data } from the last 200 response
+        this.validators = new Map();
+    }
+    
+    /**
+     * Look up saved validators for an endpoint (memory first, then localStorage)
+     */
+    getValidators(endpoint) {
+        if (this.validators.has(endpoint)) {
+            return this.validators.get(endpoint);
+        }
+        try {
+            const stored = localStorage.getItem('api-validators:' + endpoint);
+            if (stored) {
+                const entry = JSON.parse(stored);
+                this.validators.set(endpoint, entry);
+                return entry;
+            }
+        } catch (error) {
+            // Storage disabled or corrupt entry - just refetch
+        }
+        return null;
+    }
+    
+    saveValidators(endpoint, entry) {
+        this.validators.set(endpoint, entry);
+        try {
+            localStorage.setItem('api-validators:' + endpoint, JSON.stringify(entry));
+        } catch (error) {
+            // Quota exceeded or storage disabled - keep the in-memory copy
+        }
     }
     
     async get(endpoint) {
         try {
-            const response = await fetch(this.baseURL + endpoint);
+            // Send validators back so unchanged content comes back as an empty 304
+            const cached = this.getValidators(endpoint);
+            const headers = {};
+            if (cached && cached.etag) {
+                headers['If-None-Match'] = cached.etag;
+            } else if (cached && cached.lastModified) {
+                headers['If-Modified-Since'] = cached.lastModified;
+            }
+            
+            // no-store keeps the browser cache from turning our 304s into 200s
+            const response = await fetch(this.baseURL + endpoint, { headers, cache: 'no-store' });
+            if (response.status === 304 && cached) {
+                return cached.data;
+            }
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
-            return await response.json();
+            
+            const data = await response.json();
+            const etag = response.headers.get('ETag');
+            const lastModified = response.headers.get('Last-Modified');
+            if (etag || lastModified) {
+                this.saveValidators(endpoint, { etag, lastModified, data });
+            }
+            return data;
         } catch (error) {
             console.error('API GET error:', error);
             throw error;
         }
     }
     
+    /**
+     * GET every page of a keyset-paginated list endpoint and return
+     * { [key]: allItems }, following next_cursor until it runs out
+     */
+    async getAll(endpoint, key) {
+        const items = [];
+        let cursor = null;
+        do {
+            const separator = endpoint.includes('?') ? '&' : '?';
+            const page = await this.get(cursor ? `${endpoint}${separator}cursor=${encodeURIComponent(cursor)}` : endpoint);
+            items.push(...(page[key] || []));
+            cursor = page.next_cursor;
+        } while (cursor);
+        return { [key]: items };
+    }
+    
     async post(endpoint, data) {
         try {
             const response = await fetch(this.baseURL + endpoint, {
@@ -49,7 +116,7 @@ window.api = new API();
  */
 async function fetchPodcastEpisodes(fallbackData) {
     try {
-        const data = await window.api.get('/api/podcast/episodes');
+        const data = await window.api.getAll('/api/podcast/episodes', 'episodes');
         if (data && data.episodes && data.episodes.length > 0) {
             // Convert API format to frontend format
             return data.episodes.map(ep => ({
@@ -73,7 +140,7 @@ async function fetchPodcastEpisodes(fallbackData) {
  */
 async function fetchProjects(fallbackData) {
     try {
-        const data = await window.api.get('/api/projects');
+        const data = await window.api.getAll('/api/projects', 'projects');
         if (data && data.projects && data.projects.length > 0) {
             // Convert API format to frontend format
             const projectsMap = {};
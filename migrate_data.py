@@ -2,11 +2,21 @@
 """
 Data Migration Script
 Migrates hardcoded podcast episodes and internships from script.js to database
+
+Both tables are upserted on slug, each with a single INSERT ... ON CONFLICT
+over a JSON recordset, sent together in one pipelined round trip. Rows
+that already match are left alone, so re-running it on a populated
+database writes nothing.
+
+Usage:
+    python migrate_data.py [--dry-run] [--insert-only]
 """
 
+import argparse
+import json
 import os
 import sys
-import re
+import time
 from dotenv import load_dotenv
 
 # Add backend to path
@@ -15,6 +25,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 load_dotenv()
 
 from backend.database.schema import get_db_connection
+from backend.database.bulk import BULK_TABLES, upsert_sql, diff_sql
 
 
 # Podcast data from script.js
@@ -197,100 +208,90 @@ INTERNSHIPS = {
 }
 
 
-def migrate_podcasts():
-    """Migrate podcast episodes to database"""
-    print("\n🎙️  Migrating podcast episodes...")
-    
-    try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                migrated = 0
-                skipped = 0
-                
-                for idx, episode in enumerate(PODCAST_EPISODES):
-                    # Check if episode already exists
-                    cur.execute('SELECT id FROM podcast_episodes WHERE slug = %s', (episode['slug'],))
-                    if cur.fetchone():
-                        print(f"  ⏭️  Skipped (exists): {episode['title']}")
-                        skipped += 1
-                        continue
-                    
-                    # Insert episode
-                    cur.execute('''
-                        INSERT INTO podcast_episodes (title, description, youtube_url, slug, notes, order_index, published)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    ''', (
-                        episode['title'],
-                        episode['desc'],
-                        episode['url'],
-                        episode['slug'],
-                        episode['notes'],
-                        len(PODCAST_EPISODES) - idx,  # Reverse order for newest first
-                        True
-                    ))
-                    
-                    print(f"  ✓ Migrated: {episode['title']}")
-                    migrated += 1
-                
-                conn.commit()
-                print(f"\n✓ Podcast migration complete: {migrated} migrated, {skipped} skipped")
-                
-    except Exception as e:
-        print(f"\n✗ Error migrating podcasts: {e}")
-        raise
+def podcast_rows():
+    """PODCAST_EPISODES as podcast_episodes rows"""
+    return [{
+        'title': episode['title'],
+        'description': episode['desc'],
+        'youtube_url': episode['url'],
+        'slug': episode['slug'],
+        'notes': episode['notes'],
+        'order_index': len(PODCAST_EPISODES) - idx,  # Reverse order for newest first
+        'published': True
+    } for idx, episode in enumerate(PODCAST_EPISODES)]
 
 
-def migrate_internships():
-    """Migrate internships/projects to database"""
-    print("\n💼 Migrating internships...")
-    
-    try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                migrated = 0
-                skipped = 0
-                
-                for slug, data in INTERNSHIPS.items():
-                    # Check if project already exists
-                    cur.execute('SELECT id FROM projects WHERE slug = %s', (slug,))
-                    if cur.fetchone():
-                        print(f"  ⏭️  Skipped (exists): {data['company']}")
-                        skipped += 1
-                        continue
-                    
-                    # Insert project
-                    cur.execute('''
-                        INSERT INTO projects (type, company, role, period, description, details, tags, slug, contact_email, contact_subject, published)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ''', (
-                        'internship',
-                        data['company'],
-                        data['role'],
-                        data['period'],
-                        data['description'],
-                        data['details'],
-                        data['tags'],
-                        slug,
-                        data['contact']['email'],
-                        data['contact']['subject'],
-                        True
-                    ))
-                    
-                    print(f"  ✓ Migrated: {data['company']}")
-                    migrated += 1
-                
+def internship_rows():
+    """INTERNSHIPS as projects rows (order_index is left to the admin panel)"""
+    return [{
+        'type': 'internship',
+        'company': data['company'],
+        'role': data['role'],
+        'period': data['period'],
+        'description': data['description'],
+        'details': data['details'],
+        'tags': data['tags'],
+        'slug': slug,
+        'contact_email': data['contact']['email'],
+        'contact_subject': data['contact']['subject'],
+        'published': True
+    } for slug, data in INTERNSHIPS.items()]
+
+
+def recordset(name):
+    """A batch's rows as one jsonb parameter, expanded server-side with the table's row type"""
+    return f"jsonb_populate_recordset(NULL::{BULK_TABLES[name]['table']}, %s::jsonb)"
+
+
+def run_batches(batches, dry_run=False, insert_only=False):
+    """
+    Send every batch's upsert (or, for a dry run, diff) query and the
+    commit in one pipeline; returns the rows each query returned and the
+    seconds the exchange took
+    """
+    with get_db_connection() as conn:
+        started = time.perf_counter()
+        cursors = [conn.cursor() for _ in batches]
+        with conn.pipeline():
+            for cur, (name, _, rows) in zip(cursors, batches):
+                columns = tuple(rows[0])
+                if dry_run:
+                    cur.execute(diff_sql(name, recordset(name), columns), (json.dumps(rows),))
+                else:
+                    cur.execute(upsert_sql(name, recordset(name), columns, update=not insert_only), (json.dumps(rows),))
+            if not dry_run:
                 conn.commit()
-                print(f"\n✓ Internship migration complete: {migrated} migrated, {skipped} skipped")
-                
-    except Exception as e:
-        print(f"\n✗ Error migrating internships: {e}")
-        raise
+        results = [cur.fetchall() for cur in cursors]
+        return results, time.perf_counter() - started
+
+
+def print_diff(label, rows, results):
+    """Dry run: what an upsert would insert or overwrite"""
+    new = [row for row in results if row[1]]
+    changed = [row for row in results if not row[1]]
+    print(f"\n{label}: {len(new)} new, {len(changed)} changed, {len(rows) - len(results)} unchanged")
+    for row in new:
+        print(f"  + {row[0]}")
+    for row in changed:
+        print(f"  ~ {row[0]} ({', '.join(row[2])})")
+
+
+def print_counts(label, rows, results, insert_only=False):
+    inserted = results.count((True,))
+    updated = results.count((False,))
+    unchanged = len(rows) - inserted - updated
+    print(f"\n{label}: {inserted} inserted, {updated} updated, {unchanged} " + ('skipped (exist)' if insert_only else 'unchanged'))
 
 
 def main():
     """Run all migrations"""
+    parser = argparse.ArgumentParser(description='Migrate hardcoded podcasts and internships to the database')
+    parser.add_argument('--dry-run', action='store_true', help='show what would change without writing')
+    parser.add_argument('--insert-only', action='store_true', help="add missing rows but don't overwrite existing ones")
+    args = parser.parse_args()
+    
     print("=" * 60)
-    print("🚀 Data Migration Script")
+    print("🚀 Data Migration Script" + (" (dry run)" if args.dry_run else ""))
     print("=" * 60)
     
     # Check if DATABASE_URL is set
@@ -299,13 +300,28 @@ def main():
         print("   Please set DATABASE_URL in your .env file")
         return 1
     
+    # (bulk table, label, rows)
+    batches = [
+        ('podcasts', '🎙️  Podcast episodes', podcast_rows()),
+        ('projects', '💼 Internships', internship_rows())
+    ]
+    
     try:
-        # Run migrations
-        migrate_podcasts()
-        migrate_internships()
+        started = time.perf_counter()
+        results, query_time = run_batches(batches, dry_run=args.dry_run, insert_only=args.insert_only)
+        elapsed = time.perf_counter() - started
+        
+        for (_, label, rows), result in zip(batches, results):
+            if args.dry_run:
+                print_diff(label, rows, result)
+            else:
+                print_counts(label, rows, result, insert_only=args.insert_only)
         
+        total_rows = sum(len(rows) for _, _, rows in batches)
         print("\n" + "=" * 60)
-        print("✓ All migrations completed successfully!")
+        print(f"⏱️  {total_rows} rows in {len(batches)} statements, one round trip: {query_time * 1000:.1f}ms "
+              f"({elapsed * 1000:.1f}ms including connecting)")
+        print("✓ Dry run complete, nothing written" if args.dry_run else "✓ All migrations completed successfully!")
         print("=" * 60)
         
         return 0
@@ -168,6 +168,98 @@ app.post('/api/justify', async (req, res) => {
   }
 });
 
+// Streaming Stoic justification: relays completion deltas as Server-Sent Events
+// (data: {"delta": ...} per token, then data: {"done": true}, or event: error)
+app.post('/api/justify/stream', async (req, res) => {
+  try {
+    const { user_prompt, model_response } = req.body;
+    
+    if (!user_prompt || !model_response) {
+      return res.status(400).json({ error: 'Missing user_prompt or model_response' });
+    }
+    
+    const openaiKey = process.env.OPENAI_API_KEY;
+    if (!openaiKey) {
+      return res.status(500).json({ error: 'OpenAI API key not configured' });
+    }
+    
+    const prompt = "Your responsibility is to justify the output of a toy (845k param) model fitted on Meditations by Marcus Aurelius. Please read the user's prompt, the model's response, and give the model a score out of 100 of prediction given it's status as a toy model. Generate a short report of its accuracy, identifying potential semantic, linguistic, and Stoic-meaning based connections in the generation.";
+    
+    const text = `User prompt: ${user_prompt}\n\nModel response: ${model_response}`;
+    
+    // Abort the upstream completion if the browser goes away
+    const controller = new AbortController();
+    res.on('close', () => controller.abort());
+    
+    const response = await fetch('https://api.openai.com/v1/chat/completions', {
+      method: 'POST',
+      headers: {
+        'Authorization': `Bearer ${openaiKey}`,
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify({
+        model: 'gpt-4o',
+        stream: true,
+        messages: [
+          { role: 'system', content: prompt },
+          { role: 'user', content: text }
+        ]
+      }),
+      signal: controller.signal
+    });
+    
+    if (!response.ok) {
+      const errorText = await response.text();
+      return res.status(response.status).json({
+        error: `OpenAI API Error: ${response.status}`,
+        details: errorText
+      });
+    }
+    
+    res.set({
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      'X-Accel-Buffering': 'no'
+    });
+    res.flushHeaders();
+    
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    try {
+      for await (const chunk of response.body) {
+        buffer += decoder.decode(chunk, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        
+        for (const line of lines) {
+          if (!line.startsWith('data:')) continue;
+          const data = line.slice(5).trim();
+          if (data === '[DONE]') continue;
+          
+          const delta = JSON.parse(data).choices?.[0]?.delta?.content;
+          if (delta) {
+            res.write(`data: ${JSON.stringify({ delta })}\n\n`);
+          }
+        }
+      }
+      res.write(`data: ${JSON.stringify({ done: true })}\n\n`);
+    } catch (error) {
+      if (!controller.signal.aborted) {
+        console.error('Error in justify_stream:', error);
+        res.write(`event: error\ndata: ${JSON.stringify({ error: error.message })}\n\n`);
+      }
+    }
+    res.end();
+  } catch (error) {
+    if (res.headersSent) {
+      return res.end();
+    }
+    console.error('Error in justify_stream:', error);
+    res.status(500).json({ error: error.message });
+  }
+});
+
 // Health check endpoint
 app.get('/api/health', (req, res) => {
   res.json({ status: 'ok', backend: 'node' });
@@ -1,33 +1,57 @@
 #!/usr/bin/env python3
 import os
-import requests
-import json
+import gzip
+import mimetypes
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_file, abort, Response, stream_with_context
+from werkzeug.security import safe_join
 from flask_cors import CORS
 from dotenv import load_dotenv
-from openai import OpenAI
 import sys
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 # Add backend directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 
+from utils.upstream import post_to_hf, relay_chunks, tee_chunks, sse_event, get_openai_client, JUSTIFY_MODEL, build_justify_messages
+from utils.aurelius_cache import aurelius_cache, aurelius_cache_key, aurelius_request_hash
+from utils.single_flight import SingleFlight, SingleFlightTimeout
+from utils.justify_cache import justify_cache_key, get_justification, save_justification
+from utils.assets import DIST_DIR, get_manifest, rewrite_asset_urls
+from utils.static_files import static_cache
+from utils.auth import require_admin_token
+from utils.justify_batch import (
+    JUSTIFY_BATCH_CONCURRENCY, parse_batch_pairs, group_pairs, parse_score, summarize_batch, ndjson_line
+)
+
 load_dotenv()
 
 app = Flask(__name__, static_folder='.')
 CORS(app)
 
+# Largest request body accepted (bulk imports are the biggest); larger ones get a 413
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_CONTENT_LENGTH', 64 * 1024 * 1024))
+
 # Import and register route blueprints
 try:
     from backend.routes.podcast_routes import podcast_bp
     from backend.routes.project_routes import project_bp
     from backend.routes.image_routes import image_bp
     from backend.routes.analytics_routes import analytics_bp
+    from backend.routes.data_routes import data_bp
     
     app.register_blueprint(podcast_bp)
     app.register_blueprint(project_bp)
     app.register_blueprint(image_bp)
     app.register_blueprint(analytics_bp)
+    app.register_blueprint(data_bp)
     
     print("✓ Route blueprints registered successfully")
 except Exception as e:
@@ -38,136 +62,209 @@ except Exception as e:
 DATABASE_URL = os.environ.get('DATABASE_URL')
 USE_DATABASE = DATABASE_URL is not None
 
-# Initialize database schema if using database
 if USE_DATABASE:
-    try:
-        from backend.database.schema import init_database
-        init_database()
-    except Exception as e:
-        print(f"Warning: Could not initialize database schema: {e}")
-
-if USE_DATABASE:
-    import psycopg
-    
-    # Fix for Render's postgres:// URLs (psycopg needs postgresql://)
-    if DATABASE_URL.startswith('postgres://'):
-        DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+    from database.visitors import read_visitor_total, add_visits, set_visitor_total, MAX_VISITOR_TOTAL as MAX_VISITOR_COUNT
     
-    def get_db_connection():
-        return psycopg.connect(DATABASE_URL)
-    
-    def init_db():
-        """Initialize database table if it doesn't exist"""
-        try:
-            with get_db_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute('''
-                        CREATE TABLE IF NOT EXISTS visitor_count (
-                            id INTEGER PRIMARY KEY DEFAULT 1,
-                            count INTEGER NOT NULL DEFAULT 0,
-                            CONSTRAINT single_row CHECK (id = 1)
-                        )
-                    ''')
-                    # Insert initial row if doesn't exist
-                    cur.execute('''
-                        INSERT INTO visitor_count (id, count)
-                        VALUES (1, 0)
-                        ON CONFLICT (id) DO NOTHING
-                    ''')
-                    conn.commit()
-        except Exception as e:
-            print(f"Database init error: {e}")
-    
-    # Initialize database on startup
-    init_db()
+    def read_visitor_count():
+        """Read the stored visitor count, summed over the counter shards (raises on error)"""
+        return read_visitor_total()
     
     def get_visitor_count():
         """Get current visitor count from database"""
         try:
-            with get_db_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute('SELECT count FROM visitor_count WHERE id = 1')
-                    result = cur.fetchone()
-                    return result[0] if result else 0
+            return read_visitor_count()
         except Exception as e:
             print(f"Error getting count: {e}")
             return 0
     
+    def add_visitor_count(n):
+        """Add n visits to a random counter shard and return the new total (raises on error)"""
+        return add_visits(n)
+    
     def increment_visitor_count():
         """Increment and save visitor count in database"""
         try:
-            with get_db_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute('''
-                        UPDATE visitor_count 
-                        SET count = count + 1 
-                        WHERE id = 1
-                        RETURNING count
-                    ''')
-                    result = cur.fetchone()
-                    conn.commit()
-                    return result[0] if result else 0
+            return add_visitor_count(1)
         except Exception as e:
             print(f"Error incrementing count: {e}")
             return 0
+    
+    # Write-behind mode: batch increments in memory and flush them as one
+    # UPDATE every VISITOR_FLUSH_INTERVAL_MS or VISITOR_FLUSH_MAX_PENDING hits,
+    # whichever comes first. That is also the most a crashed worker can lose.
+    VISITOR_WRITE_BEHIND = os.environ.get('VISITOR_WRITE_BEHIND', 'false').lower() == 'true'
+    
+    if VISITOR_WRITE_BEHIND:
+        from utils.write_behind import WriteBehindCounter
+        
+        visitor_batcher = WriteBehindCounter(
+            flush=add_visitor_count,
+            read=read_visitor_count,
+            flush_interval_ms=int(os.environ.get('VISITOR_FLUSH_INTERVAL_MS', 1000)),
+            max_pending=int(os.environ.get('VISITOR_FLUSH_MAX_PENDING', 100))
+        )
+        
+        def get_visitor_count():
+            """Get approximate live visitor count (stored total plus pending hits)"""
+            return visitor_batcher.value()
+        
+        def increment_visitor_count():
+            """Record a visit in memory; it is persisted by the next flush"""
+            return visitor_batcher.increment()
 
 else:
-    # Fallback to JSON file for local development
-    VISITOR_COUNT_FILE = Path('visitor_count.json')
+    # Fallback to a memory-mapped counter file for local development.
+    # Shared safely by all workers; seeded from the old visitor_count.json.
+    from utils.file_counter import FileCounter, MAX_COUNT as MAX_VISITOR_COUNT
+    
+    VISITOR_COUNT_FILE = Path(os.environ.get('VISITOR_COUNT_FILE', 'visitor_count.bin'))
+    LEGACY_VISITOR_COUNT_FILE = Path('visitor_count.json')
+    
+    file_counter = FileCounter(
+        VISITOR_COUNT_FILE,
+        legacy_json_path=LEGACY_VISITOR_COUNT_FILE,
+        durable=os.environ.get('VISITOR_COUNT_FSYNC', 'false').lower() == 'true'
+    )
     
     def get_visitor_count():
-        """Get current visitor count from file"""
-        if VISITOR_COUNT_FILE.exists():
-            try:
-                with open(VISITOR_COUNT_FILE, 'r') as f:
-                    data = json.load(f)
-                    return data.get('count', 0)
-            except:
-                return 0
-        return 0
+        """Get current visitor count from the counter file"""
+        return file_counter.value()
     
     def increment_visitor_count():
-        """Increment and save visitor count"""
-        count = get_visitor_count()
-        count += 1
-        
-        with open(VISITOR_COUNT_FILE, 'w') as f:
-            json.dump({'count': count}, f)
-        
-        return count
+        """Atomically increment the counter file"""
+        return file_counter.add(1)
+
+# Relay the upstream body to the browser chunk by chunk as it arrives
+# instead of buffering it (set AURELIUS_STREAM=false to buffer)
+AURELIUS_STREAM = os.environ.get('AURELIUS_STREAM', 'true').lower() == 'true'
+
+# Identical requests arriving while one is in flight share its upstream call.
+# Waiters give up after UPSTREAM_COALESCE_TIMEOUT seconds.
+UPSTREAM_COALESCE = os.environ.get('UPSTREAM_COALESCE', 'true').lower() == 'true'
+UPSTREAM_COALESCE_TIMEOUT = float(os.environ.get('UPSTREAM_COALESCE_TIMEOUT', 60))
+
+aurelius_flight = SingleFlight(wait_timeout=UPSTREAM_COALESCE_TIMEOUT)
+justify_flight = SingleFlight(wait_timeout=UPSTREAM_COALESCE_TIMEOUT)
+
+class UpstreamInterrupted(Exception):
+    """The coalesced leader's upstream stream ended early"""
+
+def aurelius_upstream_response(status_code, content, content_type):
+    """Build the browser response for a (status, body, content type) upstream result"""
+    if status_code != 200:
+        return jsonify({
+            'error': f"Upstream API Error: {status_code}", 
+            'details': content.decode('utf-8', errors='replace')
+        }), status_code
+    return Response(content, content_type=content_type)
 
 @app.route('/api/aurelius', methods=['POST'])
 def aurelius_chat():
+    # Imported on first use to keep it off the startup path
+    import requests
+    
+    flight_key = None
+    flight_call = None
+    
+    def settle(result=None, error=None):
+        # Hand the leader's outcome to any coalesced waiters
+        if flight_call is not None:
+            aurelius_flight.finish(flight_key, flight_call, result=result, error=error)
+    
     try:
-        data = request.json
+        # Forwarded as raw bytes - no JSON decode/encode round trip
+        body = request.get_data()
         api_url = os.environ.get("HF_API_URL")
         api_token = os.environ.get("HF_API_TOKEN")
 
         print(f"DEBUG: Received request for Aurelius. URL: {api_url}") # Debug log
-        # print(f"DEBUG: Input data: {data}") # Debug log
+        # print(f"DEBUG: Input data: {body}") # Debug log
 
         if not api_url or not api_token:
             return jsonify({'error': 'Server misconfigured: Missing HF_API_URL or HF_API_TOKEN'}), 500
 
-        headers = {
-            "Authorization": f"Bearer {api_token}",
-            "Content-Type": "application/json"
-        }
+        # Repeat prompts with deterministic parameters are answered from cache
+        cache_key = aurelius_cache_key(body)
+        if cache_key:
+            cached = aurelius_cache.get(cache_key)
+            if cached is not None:
+                response = Response(cached[0], content_type=cached[1])
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+        if UPSTREAM_COALESCE:
+            flight_key = aurelius_request_hash(body)
+            call, is_leader = aurelius_flight.begin(flight_key)
+            if not is_leader:
+                return aurelius_upstream_response(*aurelius_flight.wait(call))
+            flight_call = call
 
-        response = requests.post(api_url, headers=headers, json=data)
+        response = post_to_hf(api_url, api_token, body, stream=AURELIUS_STREAM)
         
         if response.status_code != 200:
-            return jsonify({
-                'error': f"Upstream API Error: {response.status_code}", 
-                'details': response.text
-            }), response.status_code
+            content = response.content
+            response.close()
+            settle(result=(response.status_code, content, None))
+            return aurelius_upstream_response(response.status_code, content, None)
+
+        content_type = response.headers.get('Content-Type', 'application/json')
+        
+        def on_complete(content):
+            if cache_key:
+                aurelius_cache.set(cache_key, (content, content_type))
+            settle(result=(200, content, content_type))
+        
+        if AURELIUS_STREAM:
+            chunks = tee_chunks(
+                relay_chunks(response),
+                on_complete,
+                on_abort=lambda e: settle(error=UpstreamInterrupted('Upstream response was interrupted'))
+            )
+            proxied = Response(stream_with_context(chunks), content_type=content_type)
+            
+            def on_close():
+                # Also runs if the server never iterates the body (client gone
+                # before the first chunk, error writing headers), when the
+                # generator's own cleanup doesn't: release upstream and the flight
+                response.close()
+                settle(error=UpstreamInterrupted('Upstream response was not relayed'))
+            
+            proxied.call_on_close(on_close)
+        else:
+            on_complete(response.content)
+            proxied = Response(response.content, content_type=content_type)
+        
+        if cache_key:
+            proxied.headers['X-Cache'] = 'MISS'
+        return proxied
 
-        return jsonify(response.json())
+    except (requests.exceptions.Timeout, SingleFlightTimeout) as e:
+        settle(error=e)
+        print(f"Timeout in aurelius_chat: {e}")
+        return jsonify({'error': 'Upstream API timed out'}), 504
 
     except Exception as e:
+        settle(error=e)
         print(f"Error in aurelius_chat: {e}")
         return jsonify({'error': str(e)}), 500
 
+def evaluate_justification(user_prompt, model_response, cache_key):
+    """Ask OpenAI for a report and cache it; concurrent identical pairs share one call"""
+    def evaluate():
+        response = get_openai_client().chat.completions.create(
+            model=JUSTIFY_MODEL,
+            messages=build_justify_messages(user_prompt, model_response)
+        )
+        
+        justification = response.choices[0].message.content
+        if justification:
+            save_justification(cache_key, justification)
+        return justification
+    
+    if UPSTREAM_COALESCE:
+        return justify_flight.do(cache_key, evaluate)
+    return evaluate()
+
 @app.route('/api/justify', methods=['POST'])
 def justify_response():
     try:
@@ -178,29 +275,205 @@ def justify_response():
         if not user_prompt or not model_response:
             return jsonify({'error': 'Missing user_prompt or model_response'}), 400
         
-        # Initialize OpenAI client
-        client = OpenAI()
+        # Repeat evaluations are answered from the cache without calling OpenAI
+        cache_key = justify_cache_key(user_prompt, model_response)
+        justification = get_justification(cache_key)
+        if justification is not None:
+            response = jsonify({'justification': justification})
+            response.headers['X-Cache'] = 'HIT'
+            return response
         
-        prompt = "Your responsibility is to justify the output of a toy (845k param) model fitted on Meditations by Marcus Aurelius. Please read the user's prompt, the model's response, and give the model a score out of 100 of prediction given it's status as a toy model. Generate a short report of its accuracy, identifying potential semantic, linguistic, and Stoic-meaning based connections in the generation."
+        justification = evaluate_justification(user_prompt, model_response, cache_key)
         
-        text = f"User prompt: {user_prompt}\n\nModel response: {model_response}"
+        response = jsonify({'justification': justification})
+        response.headers['X-Cache'] = 'MISS'
+        return response
+    
+    except SingleFlightTimeout as e:
+        print(f"Timeout in justify_response: {e}")
+        return jsonify({'error': str(e)}), 504
         
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": text}
-            ]
-        )
+    except Exception as e:
+        print(f"Error in justify_response: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/justify/stream', methods=['POST'])
+def justify_stream():
+    """
+    Same report as /api/justify, relayed as Server-Sent Events while it's
+    generated: data: {"delta": ...} per token, then data: {"done": true}
+    (or event: error). Cached reports arrive as a single delta.
+    """
+    try:
+        data = request.json
+        user_prompt = data.get('user_prompt', '')
+        model_response = data.get('model_response', '')
         
-        justification = response.choices[0].message.content
+        if not user_prompt or not model_response:
+            return jsonify({'error': 'Missing user_prompt or model_response'}), 400
+        
+        cache_key = justify_cache_key(user_prompt, model_response)
+        justification = get_justification(cache_key)
         
-        return jsonify({'justification': justification})
+        flight_call, is_leader = None, True
+        if justification is None and UPSTREAM_COALESCE:
+            flight_call, is_leader = justify_flight.begin(cache_key)
+        
+        def settle(result=None, error=None):
+            # Hand the leader's report (or failure) to coalesced requests
+            if flight_call is not None and is_leader:
+                justify_flight.finish(cache_key, flight_call, result=result, error=error)
+        
+        on_close = None
+        if justification is not None:
+            def events():
+                yield sse_event({'delta': justification})
+                yield sse_event({'done': True})
+            cache_status = 'HIT'
+        elif not is_leader:
+            # The same report is already being generated for another
+            # request: replay it in one delta once it's done
+            def events():
+                try:
+                    report = justify_flight.wait(flight_call)
+                except Exception as e:
+                    print(f"Error in justify_stream: {e}")
+                    yield sse_event({'error': str(e)}, event='error')
+                    return
+                if report:
+                    yield sse_event({'delta': report})
+                yield sse_event({'done': True})
+            cache_status = 'COALESCED'
+        else:
+            # Open the completion before responding so setup errors are a plain 500
+            try:
+                completion = get_openai_client().chat.completions.create(
+                    model=JUSTIFY_MODEL,
+                    messages=build_justify_messages(user_prompt, model_response),
+                    stream=True
+                )
+            except Exception as e:
+                settle(error=e)
+                raise
+            
+            def events():
+                parts = []
+                try:
+                    for chunk in completion:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            parts.append(delta)
+                            yield sse_event({'delta': delta})
+                except Exception as e:
+                    print(f"Error in justify_stream: {e}")
+                    settle(error=e)
+                    yield sse_event({'error': str(e)}, event='error')
+                    return
+                finally:
+                    # Also runs when the browser disconnects mid-report
+                    completion.close()
+                
+                justification = ''.join(parts)
+                if justification:
+                    save_justification(cache_key, justification)
+                settle(result=justification)
+                yield sse_event({'done': True})
+            
+            def on_close():
+                # Runs even if the body was never iterated or the browser
+                # left mid-report; a no-op once the flight has finished
+                completion.close()
+                settle(error=UpstreamInterrupted('Justification stream was interrupted'))
+            
+            cache_status = 'MISS'
         
+        response = Response(
+            stream_with_context(events()),
+            mimetype='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no',
+                'X-Cache': cache_status
+            }
+        )
+        if on_close is not None:
+            response.call_on_close(on_close)
+        return response
+    
     except Exception as e:
-        print(f"Error in justify_response: {e}")
+        print(f"Error in justify_stream: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/justify/batch', methods=['POST'])
+@require_admin_token
+def justify_batch():
+    """
+    Evaluate many pairs: {"pairs": [{"user_prompt": ..., "model_response": ...}, ...]}
+    
+    Admin only: one batch can start hundreds of OpenAI calls.
+    
+    Identical pairs are evaluated once and unique ones run on up to
+    JUSTIFY_BATCH_CONCURRENCY threads. Results stream back as NDJSON in
+    completion order, one {"index": ...} line per input pair, followed by
+    a {"summary": ...} line with the score distribution and total latency.
+    """
+    try:
+        pairs = parse_batch_pairs(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    groups = group_pairs(pairs)
+    
+    def run_pair(cache_key, user_prompt, model_response):
+        started = time.perf_counter()
+        justification = get_justification(cache_key)
+        cached = justification is not None
+        if not cached:
+            justification = evaluate_justification(user_prompt, model_response, cache_key)
+        return justification, cached, (time.perf_counter() - started) * 1000
+    
+    def results():
+        started = time.perf_counter()
+        finished = []
+        executor = ThreadPoolExecutor(max_workers=max(1, min(JUSTIFY_BATCH_CONCURRENCY, len(groups))))
+        
+        try:
+            futures = {
+                executor.submit(run_pair, cache_key, user_prompt, model_response): indices
+                for cache_key, (user_prompt, model_response, indices) in groups.items()
+            }
+            
+            for future in as_completed(futures):
+                try:
+                    justification, cached, latency_ms = future.result()
+                    result = {
+                        'justification': justification,
+                        'score': parse_score(justification),
+                        'cached': cached,
+                        'latency_ms': round(latency_ms, 1)
+                    }
+                except Exception as e:
+                    print(f"Error in justify_batch: {e}")
+                    result = {'error': str(e)}
+                
+                # Duplicates get the same result under their own index
+                for index in futures[future]:
+                    line = dict(index=index, **result)
+                    finished.append(line)
+                    yield ndjson_line(line)
+            
+            yield ndjson_line(summarize_batch(finished, len(groups), (time.perf_counter() - started) * 1000))
+        
+        finally:
+            # Client gone (or done): drop pairs that haven't started
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    return Response(
+        stream_with_context(results()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'ok', 'backend': 'python'})
@@ -253,19 +526,18 @@ def admin_set_visitor_count():
         if not isinstance(new_count, int) or new_count < 0:
             return jsonify({'error': 'Count must be a positive integer'}), 400
         
+        # Largest value the counter can store
+        if new_count > MAX_VISITOR_COUNT:
+            return jsonify({'error': f'Count must be at most {MAX_VISITOR_COUNT}'}), 400
+        
         # Update the count
         if USE_DATABASE:
-            with get_db_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute('UPDATE visitor_count SET count = %s WHERE id = 1 RETURNING count', (new_count,))
-                    result = cur.fetchone()
-                    conn.commit()
-                    updated_count = result[0] if result else new_count
+            updated_count = set_visitor_total(new_count)
+            if VISITOR_WRITE_BEHIND:
+                visitor_batcher.set_base(updated_count)
         else:
-            # Update JSON file
-            with open(VISITOR_COUNT_FILE, 'w') as f:
-                json.dump({'count': new_count}, f)
-            updated_count = new_count
+            # Update counter file
+            updated_count = file_counter.set(new_count)
         
         return jsonify({
             'success': True,
@@ -277,40 +549,40 @@ def admin_set_visitor_count():
         print(f"Error in admin_set_visitor_count: {e}")
         return jsonify({'error': str(e)}), 500
 
+OG_BASE_URL = "https://www.tarush.ai"
+
+OG_CONFIGS = {
+    '/aureliusgpt': {
+        'title': 'AureliusGPT — Small Language Models from First Principles',
+        'description': 'A family of SLMs pretrained from scratch on classical philosophy texts, built without shortcuts.',
+        'image': f'{OG_BASE_URL}/aurelius-thinking.jpg',
+        'url': f'{OG_BASE_URL}/aureliusgpt'
+    },
+    '/podcast': {
+        'title': 'Neural Bridge Podcast — Bridging Generations Through AI',
+        'description': 'Connecting younger generations to current professionals through fascinating discussions on AI.',
+        'image': f'{OG_BASE_URL}/logo.jpg',
+        'url': f'{OG_BASE_URL}/podcast'
+    },
+    '/vericare': {
+        'title': 'VeriCare AI — Patient Advocacy, Augmented with AI',
+        'description': 'The first fully AI patient advocacy engine, built to dispute, negotiate, and reduce medical bills.',
+        'image': f'{OG_BASE_URL}/favicon.png',
+        'url': f'{OG_BASE_URL}/vericare'
+    }
+}
+
+# Homepage tags, also used for every path without its own config
+DEFAULT_OG_CONFIG = {
+    'title': 'Tarush Gupta — Builder, Founder, Developer',
+    'description': 'Personal citadel showcasing my work in AI, startups, and research.',
+    'image': f'{OG_BASE_URL}/favicon.png',
+    'url': OG_BASE_URL
+}
+
 def get_og_tags(path):
     """Generate OG tags based on the requested path"""
-    base_url = "https://www.tarush.ai"
-    
-    og_configs = {
-        '/aureliusgpt': {
-            'title': 'AureliusGPT — Small Language Models from First Principles',
-            'description': 'A family of SLMs pretrained from scratch on classical philosophy texts, built without shortcuts.',
-            'image': f'{base_url}/aurelius-thinking.jpg',
-            'url': f'{base_url}/aureliusgpt'
-        },
-        '/podcast': {
-            'title': 'Neural Bridge Podcast — Bridging Generations Through AI',
-            'description': 'Connecting younger generations to current professionals through fascinating discussions on AI.',
-            'image': f'{base_url}/logo.jpg',
-            'url': f'{base_url}/podcast'
-        },
-        '/vericare': {
-            'title': 'VeriCare AI — Patient Advocacy, Augmented with AI',
-            'description': 'The first fully AI patient advocacy engine, built to dispute, negotiate, and reduce medical bills.',
-            'image': f'{base_url}/favicon.png',
-            'url': f'{base_url}/vericare'
-        }
-    }
-    
-    # Default to homepage
-    config = og_configs.get(path, {
-        'title': 'Tarush Gupta — Builder, Founder, Developer',
-        'description': 'Personal citadel showcasing my work in AI, startups, and research.',
-        'image': f'{base_url}/favicon.png',
-        'url': base_url
-    })
-    
-    return config
+    return OG_CONFIGS.get(path, DEFAULT_OG_CONFIG)
 
 def inject_og_tags(html_content, path):
     """Inject OG tags into HTML based on the path"""
@@ -342,28 +614,204 @@ def inject_og_tags(html_content, path):
     
     return html_content
 
+# Pre-rendered index.html variants: one per OG route plus the default,
+# rendered once and re-rendered only when index.html (or an asset it
+# references) changes on disk
+INDEX_FILE = Path(__file__).resolve().parent / 'index.html'
+INDEX_CHECK_INTERVAL = float(os.environ.get('INDEX_CHECK_INTERVAL', 2))  # seconds between mtime checks
+
+# Serve styles/scripts/images from fingerprinted, precompressed copies in dist/
+ASSET_FINGERPRINT = os.environ.get('ASSET_FINGERPRINT', 'true').lower() == 'true'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_index_lock = threading.Lock()
+_index_state = {'mtime': None, 'manifest': None, 'checked_at': 0.0, 'variants': {}}
+
+def render_index_variants(manifest=None):
+    """Render index.html for every OG route into ready-to-send (and precompressed) bytes"""
+    with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+        template = f.read()
+    
+    # Point the page at the fingerprinted assets
+    if manifest:
+        template = rewrite_asset_urls(template, manifest)
+    
+    variants = {}
+    for path in ['/'] + list(OG_CONFIGS):
+        body = inject_og_tags(template, path).encode('utf-8')
+        encoded = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            encoded['br'] = brotli.compress(body, quality=11)
+        variants[path] = encoded
+    
+    return variants
+
+def get_index_variant(path):
+    """Get the pre-rendered variant for a path, refreshing if index.html or the assets changed"""
+    now = time.monotonic()
+    
+    if now - _index_state['checked_at'] >= INDEX_CHECK_INTERVAL or not _index_state['variants']:
+        with _index_lock:
+            if now - _index_state['checked_at'] >= INDEX_CHECK_INTERVAL or not _index_state['variants']:
+                mtime = os.stat(INDEX_FILE).st_mtime_ns
+                manifest = None
+                if ASSET_FINGERPRINT:
+                    try:
+                        # Rebuilds dist/ first if any asset changed
+                        manifest = get_manifest()
+                    except Exception as e:
+                        # e.g. a read-only or full disk: serve the plain asset URLs
+                        print(f"Warning: Could not build fingerprinted assets: {e}")
+                if mtime != _index_state['mtime'] or manifest != _index_state['manifest'] or not _index_state['variants']:
+                    _index_state['variants'] = render_index_variants(manifest)
+                    _index_state['mtime'] = mtime
+                    _index_state['manifest'] = manifest
+                _index_state['checked_at'] = now
+    
+    variants = _index_state['variants']
+    return variants.get(path) or variants['/']
+
+def send_index(path):
+    """Send the pre-rendered index.html for a path, in the best encoding the client accepts"""
+    variant = get_index_variant(path)
+    
+    for encoding in ('br', 'gzip'):
+        if encoding in variant and request.accept_encodings[encoding]:
+            response = Response(variant[encoding], mimetype='text/html')
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = Response(variant['identity'], mimetype='text/html')
+    
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+CONDITIONAL_HEADERS = ('If-None-Match', 'If-Modified-Since', 'If-Match', 'If-Unmodified-Since', 'Range')
+
+def send_cached_file(path, mimetype=None):
+    """
+    Send a file from disk: small, frequently requested ones from the
+    in-memory static cache, the rest streamed by send_file (which uses the
+    server's wsgi.file_wrapper, i.e. sendfile under gunicorn).
+    Returns None if there's no such file.
+    """
+    try:
+        _, cached = static_cache.lookup(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    
+    mimetype = mimetype or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    
+    if cached is None:
+        return send_file(path, mimetype=mimetype)
+    
+    # Same headers send_file would set
+    response = Response(cached.body, mimetype=mimetype)
+    response.last_modified = cached.mtime
+    response.cache_control.no_cache = True
+    response.set_etag(cached.etag)
+    response.accept_ranges = 'bytes'
+    
+    # Most requests are unconditional; skip the header parsing for them
+    if not any(h in request.headers for h in CONDITIONAL_HEADERS):
+        return response
+    return response.make_conditional(request, accept_ranges=True, complete_length=cached.size)
+
+def send_asset(filename):
+    """
+    Send a fingerprinted asset from dist/, as its precompressed .br/.gz
+    sibling when the client accepts one; the URL changes with the content,
+    so it's cacheable forever
+    """
+    path = safe_join(DIST_DIR, filename)
+    if path is None or filename == 'manifest.json':
+        abort(404)
+    
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    
+    response = None
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings[encoding]:
+            response = send_cached_file(path + suffix, mimetype=mimetype)
+            if response is not None:
+                response.headers['Content-Encoding'] = encoding
+                break
+    
+    if response is None:
+        response = send_cached_file(path, mimetype=mimetype)
+        if response is None:
+            abort(404)
+    
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    response.vary.add('Accept-Encoding')
+    return response
+
+# Startup work (schema migrations, building dist/ and pre-rendering
+# index.html) runs on a background thread started by the first request in
+# each process, so importing the app stays fast. Only routes that query
+# the database wait for the schema to be up to date; pages, assets,
+# /api/health and the model endpoints are served straight away.
+DB_INIT_WAIT = float(os.environ.get('DB_INIT_WAIT', 30))  # seconds a request waits for migrations
+
+# Routes that read or write the database
+DB_BLUEPRINTS = {'podcast', 'project', 'image', 'analytics', 'data'}
+DB_ENDPOINTS = {'visitor_counter', 'admin_set_visitor_count'}
+
+_db_ready = threading.Event()
+_warm_up_lock = threading.Lock()
+_warm_up_state = {'pid': None}
+
+def warm_up():
+    """Migrate the schema, then build assets and pre-render index.html"""
+    if USE_DATABASE and not _db_ready.is_set():
+        try:
+            from database.schema import init_database
+            init_database()
+        except Exception as e:
+            print(f"Warning: Could not initialize database schema: {e}")
+    _db_ready.set()
+    
+    try:
+        get_index_variant('/')
+    except Exception as e:
+        print(f"Warning: Could not pre-render index.html: {e}")
+
+def start_warm_up():
+    """Start warm_up() once per process (forked workers start their own)"""
+    if _warm_up_state['pid'] == os.getpid():
+        return
+    with _warm_up_lock:
+        if _warm_up_state['pid'] != os.getpid():
+            _warm_up_state['pid'] = os.getpid()
+            threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
+
+@app.before_request
+def wait_for_warm_up():
+    start_warm_up()
+    needs_database = request.blueprint in DB_BLUEPRINTS or request.endpoint in DB_ENDPOINTS
+    if USE_DATABASE and needs_database and not _db_ready.wait(DB_INIT_WAIT):
+        return jsonify({'error': 'Database is still starting'}), 503
+
 @app.route('/')
 def serve_index():
-    with open('index.html', 'r', encoding='utf-8') as f:
-        html_content = f.read()
-    html_content = inject_og_tags(html_content, '/')
-    return html_content
+    return send_index('/')
+
+@app.route('/dist/<path:filename>')
+def serve_asset(filename):
+    return send_asset(filename)
 
 @app.route('/<path:path>')
 def serve_static(path):
-    # Check if file exists in the current directory
-    if os.path.exists(path) and os.path.isfile(path):
-        return send_from_directory('.', path)
-    
-    # For SPA routes, serve index.html with appropriate OG tags
-    with open('index.html', 'r', encoding='utf-8') as f:
-        html_content = f.read()
+    # Files in the site directory (one stat, served from memory once hot)
+    file_path = safe_join(app.root_path, path)
+    if file_path is not None:
+        response = send_cached_file(file_path)
+        if response is not None:
+            return response
     
-    # Normalize path for OG tag lookup
+    # For SPA routes, serve the pre-rendered index.html with matching OG tags
     normalized_path = '/' + path.strip('/')
-    html_content = inject_og_tags(html_content, normalized_path)
-    
-    return html_content
+    return send_index(normalized_path)
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5001))